@@ -151,7 +151,7 @@ def mypy(session: Session) -> None:
 def tests(session: Session) -> None:
     """Run the test suite."""
     session.install(".")
-    session.install("pytest", "pygments", "result")
+    session.install("pytest", "pygments", "result", "importtime-output-wrapper")
     if not session.posargs or (
         session.posargs and session.posargs[0] != "--no-coverage"
     ):
@@ -167,6 +167,15 @@ def tests(session: Session) -> None:
         session.run("pytest", *session.posargs[1:])
 
 
+@session(python=python_versions[0])
+def importtime(session: Session) -> None:
+    """Show where the time goes when importing gwproto."""
+    args = session.posargs or ["--format", "waterfall", "--time", "cumulative"]
+    session.install(".")
+    session.install("importtime-output-wrapper")
+    session.run("importtime-output-wrapper", "-m", "gwproto", *args)
+
+
 @session(python=python_versions[0])
 def coverage(session: Session) -> None:
     """Produce the coverage report."""
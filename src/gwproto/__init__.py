@@ -1,37 +1,104 @@
-from gwproto.data_classes.hardware_layout import HardwareLayout
-from gwproto.data_classes.sh_node import ShNode
-from gwproto.decoders import (
-    CacDecoder,
-    ComponentDecoder,
-    MessageDiscriminator,
-    MQTTCodec,
-    create_message_model,
-    pydantic_named_types,
-)
-from gwproto.default_decoders import (
-    default_cac_decoder,
-    default_component_decoder,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
 from gwproto.errors import SchemaError
 from gwproto.message import Header, Message, as_enum
-from gwproto.topic import DecodedMQTTTopic, MQTTTopic
+from gwproto.topic import DecodedMQTTTopic, MQTTTopic, TopicRouter
+
+if TYPE_CHECKING:
+    from gwproto import messages, property_format
+    from gwproto.data_classes.cac_pool import CacPool
+    from gwproto.data_classes.channel_resolver import ChannelResolver
+    from gwproto.data_classes.fleet import load_fleet
+    from gwproto.data_classes.hardware_layout import HardwareLayout
+    from gwproto.data_classes.layout_diff import LayoutDiff
+    from gwproto.data_classes.sh_node import ShNode
+    from gwproto.decoders import (
+        CacDecoder,
+        ComponentDecoder,
+        DecodedBatch,
+        MessageDecodeError,
+        MessageDiscriminator,
+        MQTTCodec,
+        create_message_model,
+        pydantic_named_types,
+    )
+    from gwproto.default_decoders import (
+        default_cac_decoder,
+        default_component_decoder,
+    )
+    from gwproto.streaming import StreamedReport
+
+# Everything below is imported on first access. Importing these eagerly
+# imports every named type and builds the default decoders, which
+# processes that only need Message or MQTTTopic should not pay for.
+_LAZY_IMPORTS: dict[str, str] = {
+    "CacDecoder": "gwproto.decoders",
+    "CacPool": "gwproto.data_classes.cac_pool",
+    "ChannelResolver": "gwproto.data_classes.channel_resolver",
+    "ComponentDecoder": "gwproto.decoders",
+    "DecodedBatch": "gwproto.decoders",
+    "HardwareLayout": "gwproto.data_classes.hardware_layout",
+    "LayoutDiff": "gwproto.data_classes.layout_diff",
+    "MQTTCodec": "gwproto.decoders",
+    "MessageDecodeError": "gwproto.decoders",
+    "MessageDiscriminator": "gwproto.decoders",
+    "ShNode": "gwproto.data_classes.sh_node",
+    "StreamedReport": "gwproto.streaming",
+    "create_message_model": "gwproto.decoders",
+    "data_classes": "gwproto.data_classes",
+    "decoders": "gwproto.decoders",
+    "default_cac_decoder": "gwproto.default_decoders",
+    "default_component_decoder": "gwproto.default_decoders",
+    "default_decoders": "gwproto.default_decoders",
+    "enums": "gwproto.enums",
+    "load_fleet": "gwproto.data_classes.fleet",
+    "messages": "gwproto.messages",
+    "named_types": "gwproto.named_types",
+    "property_format": "gwproto.property_format",
+    "pydantic_named_types": "gwproto.decoders",
+    "type_helpers": "gwproto.type_helpers",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(module_name)
+    value = module if module_name == f"{__name__}.{name}" else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     "CacDecoder",
+    "CacPool",
+    "ChannelResolver",
     "ComponentDecoder",
+    "DecodedBatch",
     "DecodedMQTTTopic",
     "HardwareLayout",
     "Header",
+    "LayoutDiff",
     "MQTTCodec",
     "MQTTTopic",
     "Message",
+    "MessageDecodeError",
     "MessageDiscriminator",
     "SchemaError",
     "ShNode",
+    "StreamedReport",
+    "TopicRouter",
     "as_enum",
     "create_message_model",
     "default_cac_decoder",
     "default_component_decoder",
+    "load_fleet",
     "messages",
     "property_format",
     "pydantic_named_types",
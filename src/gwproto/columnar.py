@@ -0,0 +1,151 @@
+"""Columnar, array-backed form of channel.readings.
+
+ColumnarChannelReadings holds ValueList and ScadaReadTimeUnixMsList as
+array('q') buffers instead of lists of Python ints. That is 8 bytes per
+reading rather than a boxed int plus a list slot. NumPy users can view the
+buffers without copying, e.g. numpy.frombuffer(readings.values, numpy.int64).
+"""
+
+from array import array
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from gwproto.named_types.channel_readings import ChannelReadings
+from gwproto.property_format import (
+    UTC_2000_01_01_TIMESTAMP,
+    UTC_3000_01_01_TIMESTAMP,
+    is_spaceheat_name,
+)
+
+MIN_UTC_MILLISECONDS = int(UTC_2000_01_01_TIMESTAMP * 1000)
+MAX_UTC_MILLISECONDS = int(UTC_3000_01_01_TIMESTAMP * 1000)
+
+
+class ColumnarChannelReadings:
+    """ChannelReadings with array('q') columns.
+
+    The constructor enforces the same constraints as ChannelReadings:
+    ChannelName must be a SpaceheatName, values must be integers (not bools),
+    timestamps must be UTCMilliseconds and both columns must have the same
+    length (Axiom 1). Timestamp bounds are checked with one min() and one
+    max() over the buffer rather than per item. Columns passed as
+    array('q') are used without copying.
+    """
+
+    __slots__ = ("channel_name", "times", "values")
+
+    channel_name: str
+    values: "array[int]"
+    times: "array[int]"
+
+    def __init__(
+        self,
+        channel_name: str,
+        values: Iterable[int],
+        times: Iterable[int],
+    ) -> None:
+        is_spaceheat_name(channel_name)
+        self.channel_name = channel_name
+        self.values = self._to_array(values, "ValueList", reject_bools=True)
+        # Bools in times need no separate check: they fail the bounds check.
+        self.times = self._to_array(times, "ScadaReadTimeUnixMsList")
+        if len(self.values) != len(self.times):
+            raise ValueError(
+                "Axiom 1 violated! ValueList and ScadaReadTimeUnixMsList must have "
+                f"the same length. Got {len(self.values)} and {len(self.times)}"
+            )
+        if self.times and (
+            min(self.times) < MIN_UTC_MILLISECONDS
+            or max(self.times) > MAX_UTC_MILLISECONDS
+        ):
+            raise ValueError(
+                f"ScadaReadTimeUnixMsList for {channel_name} has timestamps outside "
+                f"[{MIN_UTC_MILLISECONDS}, {MAX_UTC_MILLISECONDS}]"
+            )
+
+    @classmethod
+    def _to_array(
+        cls, items: Iterable[int], field_name: str, *, reject_bools: bool = False
+    ) -> "array[int]":
+        if isinstance(items, array):
+            if items.typecode == "q":
+                return items
+            items = items.tolist()
+        elif not isinstance(items, (list, tuple)):
+            items = list(items)
+        # array() rejects floats and strings but accepts bools, which
+        # StrictInt does not.
+        if reject_bools and bool in set(map(type, items)):
+            raise ValueError(f"{field_name} must contain integers, not bools")
+        try:
+            return array("q", items)
+        except (TypeError, OverflowError) as e:
+            raise ValueError(f"{field_name} must contain 64-bit integers: {e}") from e
+
+    @classmethod
+    def from_channel_readings(
+        cls, readings: ChannelReadings
+    ) -> "ColumnarChannelReadings":
+        return cls(
+            readings.ChannelName,
+            readings.ValueList,
+            readings.ScadaReadTimeUnixMsList,
+        )
+
+    @classmethod
+    def from_dict(cls, d: Mapping[str, Any]) -> "ColumnarChannelReadings":
+        """Validate d, in the JSON shape of ChannelReadings, without building
+        an intermediate ChannelReadings."""
+        type_name = d.get("TypeName", "channel.readings")
+        if type_name != "channel.readings":
+            raise ValueError(f"TypeName must be channel.readings. Got {type_name}")
+        return cls(d["ChannelName"], d["ValueList"], d["ScadaReadTimeUnixMsList"])
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the JSON shape of ChannelReadings."""
+        return {
+            "ChannelName": self.channel_name,
+            "ValueList": self.values.tolist(),
+            "ScadaReadTimeUnixMsList": self.times.tolist(),
+            "TypeName": "channel.readings",
+            "Version": "002",
+        }
+
+    def to_channel_readings(self) -> ChannelReadings:
+        # Already validated; skip a second validation pass.
+        return ChannelReadings.model_construct(
+            ChannelName=self.channel_name,
+            ValueList=self.values.tolist(),
+            ScadaReadTimeUnixMsList=self.times.tolist(),
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ColumnarChannelReadings):
+            return NotImplemented
+        return (
+            self.channel_name == other.channel_name
+            and self.values == other.values
+            and self.times == other.times
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"ColumnarChannelReadings(channel_name={self.channel_name!r}, "
+            f"values={self.values.tolist()!r}, times={self.times.tolist()!r})"
+        )
+
+
+def columnar_channel_readings(
+    report: Mapping[str, Any],
+) -> list[ColumnarChannelReadings]:
+    """Return the ChannelReadingList of report, a Report in its JSON shape, in
+    columnar form."""
+    return [
+        ColumnarChannelReadings.from_dict(readings)
+        for readings in report["ChannelReadingList"]
+    ]
@@ -0,0 +1,165 @@
+"""A pool of decoded component attribute classes shared across layouts.
+
+Sites mostly use the same well-known cacs (see CACS_BY_MAKE_MODEL), so a
+fleet of HardwareLayouts would otherwise hold hundreds of equal
+ComponentAttributeClassGt objects. CacPool decodes each distinct cac once
+and hands the same object to every layout that contains it.
+
+Pooled cacs are instances of a frozen subclass of their decoded type, so
+assigning to one raises a ValidationError instead of changing the cac for
+every layout sharing it. They compare equal to, and pickle as, instances of
+the decoded type.
+"""
+
+import json
+import threading
+from typing import Any, Optional, cast
+
+from pydantic import ConfigDict
+
+from gwproto.decoders import CacDecoder
+from gwproto.default_decoders import get_default_cac_decoder
+from gwproto.named_types import ComponentAttributeClassGt
+
+CacType = type[ComponentAttributeClassGt]
+
+
+class _PooledCac:
+    """Mixed into the frozen subclasses made by pooled_type()."""
+
+    __unpooled_type__: CacType
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ComponentAttributeClassGt):
+            return NotImplemented
+        if unpooled_type(other) is not self.__unpooled_type__:
+            return False
+        return (
+            self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__  # type: ignore[attr-defined]
+            and self.__pydantic_private__ == other.__pydantic_private__  # type: ignore[attr-defined]
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Unpickled cacs are not pooled; see CacPool.intern().
+        return (_cac_from_state, (self.__unpooled_type__, self.__getstate__()))
+
+
+_pooled_types: dict[CacType, CacType] = {}
+_pooled_types_lock = threading.Lock()
+
+
+def pooled_type(cac_type: CacType) -> CacType:
+    """Return the frozen subclass of cac_type that pooled cacs of that type
+    are instances of."""
+    with _pooled_types_lock:
+        pooled = _pooled_types.get(cac_type)
+        if pooled is None:
+            metaclass: Any = type(cac_type)
+            pooled = cast(
+                CacType,
+                metaclass(
+                    cac_type.__name__,
+                    (_PooledCac, cac_type),
+                    {
+                        "__module__": cac_type.__module__,
+                        "__qualname__": cac_type.__qualname__,
+                        "__unpooled_type__": cac_type,
+                        "model_config": ConfigDict(frozen=True),
+                    },
+                ),
+            )
+            _pooled_types[cac_type] = pooled
+    return pooled
+
+
+def unpooled_type(cac: ComponentAttributeClassGt) -> CacType:
+    """Return the decoded type of cac, pooled or not."""
+    return getattr(type(cac), "__unpooled_type__", type(cac))
+
+
+def _cac_from_state(
+    cac_type: CacType, state: dict[Any, Any]
+) -> ComponentAttributeClassGt:
+    cac = cac_type.__new__(cac_type)
+    cac.__setstate__(state)
+    return cac
+
+
+def _pooled_copy(cac: ComponentAttributeClassGt) -> ComponentAttributeClassGt:
+    return _cac_from_state(pooled_type(unpooled_type(cac)), cac.__getstate__())
+
+
+class CacPool:
+    """Decoded cacs, keyed by content.
+
+    Pooled cacs are shared by every layout loaded with the pool, and are
+    frozen so that one layout cannot change them for the others. Cacs are
+    keyed by their content, not by ComponentAttributeClassId, so two sites
+    with different contents under the same id get different objects.
+
+    The pool is thread safe. It is not shared between processes; see
+    intern() for pooling cacs that were decoded elsewhere.
+    """
+
+    cac_decoder: CacDecoder
+    hits: int
+    misses: int
+    _by_source: dict[str, ComponentAttributeClassGt]
+    _by_value: dict[str, ComponentAttributeClassGt]
+    _lock: threading.Lock
+
+    def __init__(self, cac_decoder: Optional[CacDecoder] = None) -> None:
+        self.cac_decoder = (
+            get_default_cac_decoder() if cac_decoder is None else cac_decoder
+        )
+        self.hits = 0
+        self.misses = 0
+        # Canonical JSON of the raw cac dict -> pooled cac.
+        self._by_source = {}
+        # Canonical JSON of the decoded cac -> pooled cac. Raw dicts which
+        # differ only in ways decoding erases share an entry here.
+        self._by_value = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._by_value)
+
+    @classmethod
+    def _value_key(cls, cac: ComponentAttributeClassGt) -> str:
+        return f"{unpooled_type(cac).__qualname__}:{cac.model_dump_json()}"
+
+    def decode(self, cac_dict: dict[str, Any]) -> ComponentAttributeClassGt:
+        """Return the pooled cac for cac_dict, decoding it with
+        self.cac_decoder if it has not been seen before."""
+        source_key = json.dumps(cac_dict, sort_keys=True)
+        with self._lock:
+            cac = self._by_source.get(source_key)
+            if cac is not None:
+                self.hits += 1
+                return cac
+        # Decode outside the lock. Concurrent misses on the same cac may
+        # both decode it, but only the first result is kept.
+        decoded = self.cac_decoder.decode(cac_dict)
+        value_key = self._value_key(decoded)
+        with self._lock:
+            self.misses += 1
+            cac = self._by_value.get(value_key)
+            if cac is None:
+                cac = self._by_value[value_key] = _pooled_copy(decoded)
+            self._by_source.setdefault(source_key, cac)
+        return cac
+
+    def intern(self, cac: ComponentAttributeClassGt) -> ComponentAttributeClassGt:
+        """Return the pooled cac equal to cac, adding a frozen copy of cac to
+        the pool if there is none."""
+        value_key = self._value_key(cac)
+        with self._lock:
+            pooled = self._by_value.get(value_key)
+            if pooled is None:
+                pooled = self._by_value[value_key] = _pooled_copy(
+                    cac.model_copy(deep=True)
+                )
+            return pooled
@@ -0,0 +1,98 @@
+"""Converting channel readings to physical values.
+
+A reading's Value is an integer. Its physical value is Value / 10**Exponent,
+in Unit, where Exponent and Unit come from the ChannelConfig of the
+component which configures the channel. ChannelResolver looks all that up
+once per channel, so converting readings is a dict lookup and a division.
+"""
+
+import operator
+from array import array
+from collections.abc import Iterable
+from itertools import repeat
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from gwproto.enums import TelemetryName, Unit
+from gwproto.named_types import ChannelReadings, SingleReading
+
+if TYPE_CHECKING:
+    from gwproto.data_classes.hardware_layout import HardwareLayout
+
+
+class ResolvedChannel(NamedTuple):
+    Id: str
+    Name: str
+    TelemetryName: TelemetryName
+    Exponent: int
+    Unit: Unit
+    AboutNodeName: str
+    CapturedByNodeName: str
+
+    def physical_value(self, value: int) -> float:
+        if self.Exponent >= 0:
+            divisor: int = 10**self.Exponent
+            return value / divisor
+        return float(value * 10**-self.Exponent)
+
+    def physical_values(self, values: Iterable[int]) -> "array[float]":
+        """Return the physical values of values as an array of doubles."""
+        if self.Exponent == 0:
+            return array("d", values)
+        if self.Exponent > 0:
+            return array("d", map(operator.truediv, values, repeat(10**self.Exponent)))
+        return array("d", map(operator.mul, values, repeat(10**-self.Exponent)))
+
+
+class ChannelResolver:
+    """The ResolvedChannel of each data channel in a HardwareLayout, by
+    channel name.
+
+    The resolver is a snapshot: it does not see channels or components
+    changed in the layout after it was built. Channels which no component
+    configures (possible only in a layout loaded with raise_errors=False)
+    are left out.
+    """
+
+    channels: dict[str, ResolvedChannel]
+
+    def __init__(self, layout: "HardwareLayout") -> None:
+        self.channels = {}
+        for channel in layout.data_channels.values():
+            component_id = layout.component_id_by_channel_name.get(channel.Name)
+            if component_id is None:
+                continue
+            config = next(
+                config
+                for config in layout.components[component_id].gt.ConfigList
+                if config.ChannelName == channel.Name
+            )
+            self.channels[channel.Name] = ResolvedChannel(
+                Id=channel.Id,
+                Name=channel.Name,
+                TelemetryName=TelemetryName(channel.TelemetryName),
+                Exponent=config.Exponent,
+                Unit=Unit(config.Unit),
+                AboutNodeName=channel.AboutNodeName,
+                CapturedByNodeName=channel.CapturedByNodeName,
+            )
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def __contains__(self, channel_name: object) -> bool:
+        return channel_name in self.channels
+
+    def __getitem__(self, channel_name: str) -> ResolvedChannel:
+        return self.channels[channel_name]
+
+    def get(self, channel_name: str) -> Optional[ResolvedChannel]:
+        return self.channels.get(channel_name)
+
+    def physical_value(self, reading: SingleReading) -> float:
+        """Raises KeyError if the reading's channel is unknown."""
+        return self.channels[reading.ChannelName].physical_value(reading.Value)
+
+    def physical_values(self, readings: ChannelReadings) -> "array[float]":
+        """Return the physical values of readings.ValueList, in order.
+        Raises KeyError if the readings' channel is unknown."""
+        return self.channels[readings.ChannelName].physical_values(readings.ValueList)
@@ -73,6 +73,9 @@ class HubitatPollerComponent(
                 if attribute.web_listen_enabled:
                     hubitat_component.add_web_listener(node_name)
 
+    def resolved_component_ids(self) -> set[str]:
+        return {self.hubitat_gt.ComponentId}
+
     def urls(self) -> dict[str, Optional[yarl.URL]]:
         urls = self.hubitat_gt.urls()
         for attribute in self.gt.Poller.attributes:
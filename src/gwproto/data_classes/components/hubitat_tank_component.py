@@ -89,6 +89,12 @@ class HubitatTankComponent(
                 if device.web_listen_enabled:
                     hubitat_component.add_web_listener(tank_node_name)
 
+    def resolved_component_ids(self) -> set[str]:
+        return {self.hubitat.ComponentId}
+
+    def resolved_node_names(self) -> set[str]:
+        return {device.node_name for device in self.devices}
+
     def urls(self) -> dict[str, Optional[yarl.URL]]:
         urls = self.hubitat.urls()
         for device in self.devices:
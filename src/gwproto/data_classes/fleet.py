@@ -0,0 +1,153 @@
+"""Loading the HardwareLayouts of many sites at once.
+
+load_fleet() loads a list of layout files in a thread or process pool. Every
+site gets a SiteLoad with its layout (if one could be built) and the
+LoadErrors found while loading it; one bad site does not stop the others.
+All layouts share the cacs of one CacPool.
+"""
+
+from collections.abc import Iterable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from gwproto.data_classes.cac_pool import CacPool
+from gwproto.data_classes.hardware_layout import (
+    HardwareLayout,
+    LayoutStorage,
+    LoadError,
+)
+from gwproto.decoders import ComponentDecoder
+from gwproto.default_decoders import get_default_cac_decoder
+
+
+@dataclass
+class SiteLoad:
+    layout_path: Path
+    layout: Optional[HardwareLayout]
+    errors: list[LoadError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.layout is not None and not self.errors
+
+
+def load_site(  # noqa: PLR0913
+    layout_path: Path,
+    *,
+    cac_pool: Optional[CacPool] = None,
+    component_decoder: Optional[ComponentDecoder] = None,
+    included_node_names: Optional[set[str]] = None,
+    layout_storage: LayoutStorage = "reference",
+    snapshot_dir: Optional[Path | str] = None,
+) -> SiteLoad:
+    """Load one site with raise_errors=False. Errors that prevent building
+    a layout at all (an unreadable file, for example) are reported as a
+    LoadError of type "hardware.layout" and a layout of None."""
+    errors: list[LoadError] = []
+    try:
+        layout: Optional[HardwareLayout] = HardwareLayout.load(
+            layout_path,
+            included_node_names=included_node_names,
+            raise_errors=False,
+            errors=errors,
+            component_decoder=component_decoder,
+            layout_storage=layout_storage,
+            cac_pool=cac_pool,
+            snapshot_dir=snapshot_dir,
+        )
+    except Exception as e:  # noqa: BLE001
+        layout = None
+        errors.append(LoadError("hardware.layout", {"LayoutPath": str(layout_path)}, e))
+    return SiteLoad(layout_path, layout, errors)
+
+
+def _load_site_in_process(
+    layout_path: Path,
+    included_node_names: Optional[set[str]],
+    layout_storage: LayoutStorage,
+    snapshot_dir: Optional[Path | str],
+) -> SiteLoad:
+    # Cacs decoded in a worker process reach the parent as copies; they are
+    # pooled there by HardwareLayout.intern_cacs().
+    return load_site(
+        layout_path,
+        included_node_names=included_node_names,
+        layout_storage=layout_storage,
+        snapshot_dir=snapshot_dir,
+    )
+
+
+def load_fleet(  # noqa: PLR0913
+    layout_paths: Iterable[Path | str],
+    *,
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+    cac_pool: Optional[CacPool] = None,
+    component_decoder: Optional[ComponentDecoder] = None,
+    included_node_names: Optional[set[str]] = None,
+    layout_storage: LayoutStorage = "reference",
+    snapshot_dir: Optional[Path | str] = None,
+) -> list[SiteLoad]:
+    """Load the layout at each of layout_paths, returning a SiteLoad for
+    each, in order.
+
+    Threads (the default) share cac_pool directly; they help most while
+    reading files, since decoding holds the GIL. With use_processes=True
+    decoding runs in parallel, at the cost of pickling each layout back to
+    this process, where its cacs are replaced by the pooled ones. Decoders
+    cannot be sent to worker processes, so in that case the default
+    decoders are used and component_decoder and a cac_pool with a custom
+    decoder are rejected.
+
+    If cac_pool is None a new CacPool is used for this call. snapshot_dir
+    is passed on to HardwareLayout.load().
+    """
+    if cac_pool is None:
+        cac_pool = CacPool()
+    if use_processes and (
+        component_decoder is not None
+        or cac_pool.cac_decoder is not get_default_cac_decoder()
+    ):
+        raise ValueError(
+            "ERROR. load_fleet(use_processes=True) only supports the default decoders"
+        )
+    paths = [Path(layout_path) for layout_path in layout_paths]
+    executor: Executor
+    if use_processes:
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    with executor:
+        futures: list[Any]
+        if use_processes:
+            futures = [
+                executor.submit(
+                    _load_site_in_process,
+                    path,
+                    included_node_names,
+                    layout_storage,
+                    snapshot_dir,
+                )
+                for path in paths
+            ]
+        else:
+            futures = [
+                executor.submit(
+                    load_site,
+                    path,
+                    cac_pool=cac_pool,
+                    component_decoder=component_decoder,
+                    included_node_names=included_node_names,
+                    layout_storage=layout_storage,
+                    snapshot_dir=snapshot_dir,
+                )
+                for path in paths
+            ]
+        site_loads: list[SiteLoad] = [future.result() for future in futures]
+    if use_processes:
+        for site_load in site_loads:
+            if site_load.layout is not None:
+                site_load.layout.intern_cacs(cac_pool)
+    return site_loads
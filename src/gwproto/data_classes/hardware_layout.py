@@ -6,23 +6,27 @@ away with).
 """
 
 import copy
+import graphlib
 import json
 import typing
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from functools import cached_property
 from pathlib import Path
-from typing import Any, Optional, TypeVar
+from typing import Any, Callable, ClassVar, Literal, Optional, TypeVar
 
 from gw.errors import DcError
 
 import gwproto.data_classes.components
+from gwproto.data_classes.cac_pool import CacPool
 from gwproto.data_classes.components import Ads111xBasedComponent, Component
 from gwproto.data_classes.components.component import ComponentOnly
 from gwproto.data_classes.components.electric_meter_component import (
     ElectricMeterComponent,
 )
 from gwproto.data_classes.data_channel import DataChannel
+from gwproto.data_classes.layout_diff import LayoutDiff
+from gwproto.data_classes.layout_snapshot import LayoutSnapshot
 from gwproto.data_classes.resolver import ComponentResolver
 from gwproto.data_classes.sh_node import ShNode
 from gwproto.data_classes.synth_channel import SynthChannel
@@ -32,8 +36,8 @@ from gwproto.decoders import (
     ComponentDecoder,
 )
 from gwproto.default_decoders import (
-    default_cac_decoder,
-    default_component_decoder,
+    get_default_cac_decoder,
+    get_default_component_decoder,
 )
 from gwproto.enums import ActorClass, TelemetryName
 from gwproto.named_types import (
@@ -42,11 +46,26 @@ from gwproto.named_types import (
     DataChannelGt,
     ElectricMeterCacGt,
     SpaceheatNodeGt,
+    SynthChannelGt,
 )
 
 T = TypeVar("T")
 
 
+def _remove_item(items: list[Any], item: Any) -> None:  # noqa: ANN401
+    """Remove item itself, rather than the first item equal to it."""
+    del items[next(i for i, other in enumerate(items) if other is item)]
+
+
+# How HardwareLayout holds the raw layout dict it was loaded from:
+#   "copy"       a deep copy, isolated from later changes by the caller.
+#   "reference"  the caller's dict itself, without copying.
+#   "drop"       only the entries which are not lists of cacs, components,
+#                nodes or channels. HardwareLayout.layout rebuilds the rest
+#                from the loaded objects each time it is read.
+LayoutStorage = Literal["copy", "reference", "drop"]
+
+
 @dataclass
 class LoadError:
     type_name: str
@@ -63,16 +82,83 @@ class LoadArgs(typing.TypedDict):
 
 
 class HardwareLayout:
-    layout: dict[Any, Any]
+    _layout: Optional[dict[Any, Any]]
+    _layout_metadata: dict[Any, Any]
     cacs: dict[str, ComponentAttributeClassGt]
     components: dict[str, Component[Any, Any]]
     components_by_type: dict[type[Any], list[Component[Any, Any]]]
     nodes: dict[str, ShNode]
     nodes_by_component: dict[str, str]
+    # Secondary node indexes, maintained by __init__ and add_node(). Where
+    # several nodes share a key the first one (in self.nodes order) wins.
+    nodes_by_handle: dict[str, ShNode]
+    nodes_by_hierarchy_name: dict[str, ShNode]
+    # Nodes by their explicit Handle (not falling back to Name), for
+    # node_by_handle(). Here the last node with a Handle wins.
+    nodes_by_explicit_handle: dict[str, ShNode]
+    # boss handle -> nodes whose boss has that handle, in self.nodes order.
+    # Nodes without a dot in their handle are their own boss.
+    direct_reports_by_handle: dict[str, list[ShNode]]
     data_channels: dict[str, DataChannel]
     synth_channels: dict[str, SynthChannel]
+    # Channel indexes, maintained by __init__ and index_channel() /
+    # index_synth_channel(). Lists are in data_channels / synth_channels
+    # order.
+    component_id_by_channel_name: dict[str, str]
+    channels_by_about_node: dict[str, list[DataChannel]]
+    channels_by_captured_by_node: dict[str, list[DataChannel]]
+    channels_by_telemetry_name: dict[str, list[DataChannel]]
+    channels_by_component: dict[str, list[DataChannel]]
+    synth_channels_by_created_by_node: dict[str, list[SynthChannel]]
 
     GT_SUFFIX = "Gt"
+    # Layout lists, in load order, and the list each TypeName is written
+    # back to when the layout is rebuilt. Unlisted TypeNames go to the
+    # Other* list.
+    CAC_LAYOUT_KEYS: ClassVar[dict[str, str]] = {
+        "Ads111xBasedCacs": "ads111x.based.cac.gt",
+        "ResistiveHeaterCacs": "resistive.heater.cac.gt",
+        "ElectricMeterCacs": "electric.meter.cac.gt",
+        "OtherCacs": "",
+    }
+    COMPONENT_LAYOUT_KEYS: ClassVar[dict[str, str]] = {
+        "Ads111xBasedComponents": "ads111x.based.component.gt",
+        "ResistiveHeaterComponents": "resistive.heater.component.gt",
+        "ElectricMeterComponents": "electric.meter.component.gt",
+        "OtherComponents": "",
+    }
+    # The parts of the layout each cached property is derived from, so that
+    # changing one part clears only the properties that depend on it.
+    CACHED_PROPERTY_DEPENDENCIES: ClassVar[dict[str, frozenset[str]]] = {
+        "atn_g_node_alias": frozenset(),
+        "atn_g_node_instance_id": frozenset(),
+        "atn_g_node_id": frozenset(),
+        "terminal_asset_g_node_alias": frozenset(),
+        "terminal_asset_g_node_id": frozenset(),
+        "scada_g_node_alias": frozenset(),
+        "scada_g_node_id": frozenset(),
+        "all_telemetry_tuples_for_agg_power_metering": frozenset(["nodes"]),
+        "all_nodes_in_agg_power_metering": frozenset(["nodes"]),
+        "all_power_meter_telemetry_tuples": frozenset(
+            ["nodes", "components", "data_channels"]
+        ),
+        "power_meter_node": frozenset(["nodes"]),
+        "power_meter_component": frozenset(["nodes", "components"]),
+        "power_meter_cac": frozenset(["nodes", "components"]),
+        "all_multipurpose_telemetry_tuples": frozenset(
+            ["nodes", "components", "data_channels"]
+        ),
+        "my_telemetry_tuples": frozenset(["nodes", "components", "data_channels"]),
+    }
+    ENTITY_LAYOUT_KEYS = frozenset(
+        [
+            *CAC_LAYOUT_KEYS,
+            *COMPONENT_LAYOUT_KEYS,
+            "ShNodes",
+            "DataChannels",
+            "SynthChannels",
+        ]
+    )
 
     @classmethod
     def load_cacs(
@@ -82,21 +168,29 @@ class HardwareLayout:
         raise_errors: bool = True,
         errors: Optional[list[LoadError]] = None,
         cac_decoder: Optional[CacDecoder] = None,
+        cac_pool: Optional[CacPool] = None,
     ) -> dict[str, ComponentAttributeClassGt]:
+        """With cac_pool, cacs are decoded by the pool (using its own
+        decoder) and shared with every other layout loaded from it."""
         if errors is None:
             errors = []
-        if cac_decoder is None:
-            cac_decoder = default_cac_decoder
+        decode: Callable[[dict[str, Any]], ComponentAttributeClassGt]
+        if cac_pool is not None:
+            if cac_decoder is not None and cac_decoder is not cac_pool.cac_decoder:
+                raise ValueError(
+                    "ERROR. cac_decoder and cac_pool were both given. "
+                    "Construct the CacPool with the decoder instead."
+                )
+            decode = cac_pool.decode
+        else:
+            decode = (
+                get_default_cac_decoder() if cac_decoder is None else cac_decoder
+            ).decode
         cacs: dict[str, ComponentAttributeClassGt] = {}
-        for type_name in [
-            "Ads111xBasedCacs",
-            "ResistiveHeaterCacs",
-            "ElectricMeterCacs",
-            "OtherCacs",
-        ]:
+        for type_name in cls.CAC_LAYOUT_KEYS:
             for cac_dict in layout.get(type_name, ()):
                 try:
-                    cac = cac_decoder.decode(cac_dict)
+                    cac = decode(cac_dict)
                     cacs[cac.ComponentAttributeClassId] = cac
                 except Exception as e:  # noqa: PERF203
                     if raise_errors:
@@ -146,14 +240,9 @@ class HardwareLayout:
         if errors is None:
             errors = []
         if component_decoder is None:
-            component_decoder = default_component_decoder
+            component_decoder = get_default_component_decoder()
         components = {}
-        for type_name in [
-            "Ads111xBasedComponents",
-            "ResistiveHeaterComponents",
-            "ElectricMeterComponents",
-            "OtherComponents",
-        ]:
+        for type_name in cls.COMPONENT_LAYOUT_KEYS:
             for component_dict in layout.get(type_name, ()):
                 try:
                     component_gt = component_decoder.decode(component_dict)
@@ -180,19 +269,22 @@ class HardwareLayout:
         components: dict[str, Component[Any, Any]],
     ) -> ShNode:
         if isinstance(node_dict, SpaceheatNodeGt):
-            node_gt = node_dict
-        else:
-            node_gt = SpaceheatNodeGt.model_validate(node_dict)
-        if node_gt.ComponentId:
-            component = components.get(node_gt.ComponentId)
+            node_dict = node_dict.model_dump()
+        # Validate once, directly as ShNode. The component is looked up from
+        # the raw ComponentId, which is a plain str field.
+        component_id = node_dict.get("ComponentId")
+        component = None
+        if component_id:
+            if isinstance(component_id, str):
+                component = components.get(component_id)
             if component is None:
+                # Report invalid node content ahead of the missing component.
+                node_gt = SpaceheatNodeGt.model_validate(node_dict)
                 raise ValueError(
                     f"ERROR. Component <{node_gt.ComponentId}> not loaded "
                     f"for node <{node_gt.Name}>"
                 )
-        else:
-            component = None
-        return ShNode(component=component, **node_gt.model_dump())
+        return ShNode.model_validate({**node_dict, "component": component})
 
     @classmethod
     def load_nodes(
@@ -222,10 +314,19 @@ class HardwareLayout:
     def make_channel(
         cls, dc_dict: dict[str, Any], nodes: dict[str, ShNode]
     ) -> DataChannel:
-        data_channel_gt = DataChannelGt.model_validate(dc_dict)
-        about_node = nodes.get(data_channel_gt.AboutNodeName)
-        captured_by_node = nodes.get(data_channel_gt.CapturedByNodeName)
+        about_node_name = dc_dict.get("AboutNodeName")
+        captured_by_node_name = dc_dict.get("CapturedByNodeName")
+        about_node = (
+            nodes.get(about_node_name) if isinstance(about_node_name, str) else None
+        )
+        captured_by_node = (
+            nodes.get(captured_by_node_name)
+            if isinstance(captured_by_node_name, str)
+            else None
+        )
         if about_node is None or captured_by_node is None:
+            # Report invalid channel content ahead of the missing nodes.
+            data_channel_gt = DataChannelGt.model_validate(dc_dict)
             raise ValueError(
                 f"ERROR. DataChannel related nodes must exist for {dc_dict.get('Name')}!\n"
                 f"  For AboutNodeName <{data_channel_gt.AboutNodeName}> "
@@ -233,8 +334,13 @@ class HardwareLayout:
                 f"  for CapturedByNodeName <{data_channel_gt.CapturedByNodeName}>"
                 f"got {captured_by_node}"
             )
-        return DataChannel(
-            about_node=about_node, captured_by_node=captured_by_node, **dc_dict
+        # Validate once, directly as DataChannel.
+        return DataChannel.model_validate(
+            {
+                **dc_dict,
+                "about_node": about_node,
+                "captured_by_node": captured_by_node,
+            }
         )
 
     @classmethod
@@ -261,32 +367,31 @@ class HardwareLayout:
         if dupes:
             raise DcError(f"Duplicate dc.Id(s) found: {dupes}")
 
+    @classmethod
+    def check_node_channels(
+        cls, node: ShNode, data_channels: dict[str, DataChannel]
+    ) -> None:
+        """Check that the channels in data_channels which node's component
+        configures are captured by node, if node is a capturing actor."""
+        if (
+            node.ActorClass
+            not in {ActorClass.PowerMeter, ActorClass.MultipurposeSensor}
+            or node.component is None
+        ):
+            return
+        for config in node.component.gt.ConfigList:
+            channel = data_channels.get(config.ChannelName)
+            if channel is not None and channel.CapturedByNodeName != node.Name:
+                raise DcError(
+                    f"Channel {channel} should have CapturedByNodeName {node.Name}"
+                )
+
     @classmethod
     def check_node_channel_consistency(
         cls, nodes: dict[str, ShNode], data_channels: dict[str, DataChannel]
     ) -> None:
-        capturing_classes = [
-            ActorClass.PowerMeter,
-            ActorClass.MultipurposeSensor,
-        ]
-        active_nodes = [
-            node for node in nodes.values() if node.ActorClass in capturing_classes
-        ]
-        for node in active_nodes:
-            if node.component is None:
-                my_channel_names = []
-            else:
-                my_channel_names = [
-                    config.ChannelName for config in node.component.gt.ConfigList
-                ]
-            my_channels = [
-                dc for dc in data_channels.values() if dc.Name in my_channel_names
-            ]
-            for channel in my_channels:
-                if channel.CapturedByNodeName != node.Name:
-                    raise DcError(
-                        f"Channel {channel} should have CapturedByNodeName {node.Name}"
-                    )
+        for node in nodes.values():
+            cls.check_node_channels(node, data_channels)
 
     @classmethod
     def check_data_channel_consistency(
@@ -318,25 +423,16 @@ class HardwareLayout:
         cls.check_node_channel_consistency(nodes, data_channels)
 
     @classmethod
-    def check_actor_component_consistency(cls, nodes: dict[str, ShNode]) -> None:
-        pm_nodes = [
-            node for node in nodes.values() if node.ActorClass == ActorClass.PowerMeter
-        ]
-        for node in pm_nodes:
-            if (
-                node.component is None
-                or node.component.gt.TypeName != "electric.meter.component.gt"
-            ):
-                raise DcError(
-                    f"Power Meter node {node} needs ElectricMeterComponent."
-                    f"Got component {node.component}"
-                )
-        em_nodes = [
-            node
-            for node in nodes.values()
-            if node.ActorClass == ActorClass.MultipurposeSensor
-        ]
-        for node in em_nodes:
+    def check_actor_component(cls, node: ShNode) -> None:
+        if node.ActorClass == ActorClass.PowerMeter and (
+            node.component is None
+            or node.component.gt.TypeName != "electric.meter.component.gt"
+        ):
+            raise DcError(
+                f"Power Meter node {node} needs ElectricMeterComponent."
+                f"Got component {node.component}"
+            )
+        if node.ActorClass == ActorClass.MultipurposeSensor:
             multi_comp_type_names = ["ads111x.based.component.gt"]
             if (
                 node.component is None
@@ -348,17 +444,19 @@ class HardwareLayout:
                     f"{node.component}"
                 )
 
+    @classmethod
+    def check_actor_component_consistency(cls, nodes: dict[str, ShNode]) -> None:
+        for node in nodes.values():
+            cls.check_actor_component(node)
+
     @classmethod
     def check_handle_hierarchy(cls, nodes: dict[str, ShNode]) -> None:
+        handles = {n.handle for n in nodes.values()}
         for n in nodes.values():
             boss_handle = cls.boss_handle(n.handle)
             # No dots in your name: you are your own boss
-            if boss_handle:
-                boss = next(
-                    (n for n in nodes.values() if n.handle == boss_handle), None
-                )
-                if boss is None:
-                    raise DcError(f"{n.name} is missing boss {boss_handle}")
+            if boss_handle and boss_handle not in handles:
+                raise DcError(f"{n.name} is missing boss {boss_handle}")
 
     @classmethod
     def check_node_unique_ids(cls, nodes: dict[str, ShNode]) -> None:
@@ -382,8 +480,9 @@ class HardwareLayout:
                     f"Data channel {tc} has about_node {tc.about_node}, which does not have InPowerMetering!"
                 )
         # Check condition 2: If a node is in transactive_nodes, there must be a data channel with that node as about_node
+        transactive_about_node_names = {tc.AboutNodeName for tc in transactive_channels}
         for node in transactive_nodes:
-            if not any(tc for tc in transactive_channels if tc.about_node == node):
+            if node.Name not in transactive_about_node_names:
                 raise DcError(
                     f"Node {node} is in transactive_nodes but no data channel with InPowerMetering has this node as about_node"
                 )
@@ -476,6 +575,94 @@ class HardwareLayout:
                 LoadError("ShNode", {"node": {"name": node.Name, "node": node}}, e)
             )
 
+    @classmethod
+    def resolution_dependencies(
+        cls,
+        nodes: dict[str, ShNode],
+        components: dict[str, Component[Any, Any]],
+    ) -> tuple[dict[str, set[str]], dict[str, Exception]]:
+        """Return, for each node whose component is a ComponentResolver, the
+        names of the other such nodes whose components it is resolved
+        against, and an exception for each node whose component is resolved
+        against a component that is not loaded."""
+        node_by_component: dict[str, str] = {}
+        resolvers: dict[str, ComponentResolver] = {}
+        for node in nodes.values():
+            if node.component_id not in components:
+                continue
+            component = components[node.component_id]
+            if isinstance(component, ComponentResolver):
+                node_by_component.setdefault(node.component_id, node.Name)
+                resolvers[node.Name] = component
+        dependencies: dict[str, set[str]] = {}
+        problems: dict[str, Exception] = {}
+        for node_name, resolver in resolvers.items():
+            component_ids = resolver.resolved_component_ids()
+            if missing := sorted(component_ids - components.keys()):
+                problems[node_name] = DcError(
+                    f"{node_name} component {nodes[node_name].component_id} is "
+                    f"resolved against components {missing}, which are not loaded"
+                )
+            dependencies[node_name] = {
+                node_by_component[component_id]
+                for component_id in component_ids
+                if node_by_component.get(component_id, node_name) != node_name
+            }
+        return dependencies, problems
+
+    @classmethod
+    def resolution_order(
+        cls,
+        nodes: dict[str, ShNode],
+        components: dict[str, Component[Any, Any]],
+        *,
+        raise_errors: bool = True,
+        errors: Optional[list[LoadError]] = None,
+    ) -> list[list[ShNode]]:
+        """Order the nodes whose components are ComponentResolvers for
+        resolution, in generations. The components a node's component is
+        resolved against are resolved in earlier generations, so the nodes
+        of one generation are independent of each other.
+
+        Nodes whose dependencies are not loaded, or which depend on each
+        other in a cycle (or on such nodes), are left out. They are all
+        reported before anything is resolved: raised together in one DcError,
+        or added to errors if raise_errors is False."""
+        if errors is None:
+            errors = []
+        dependencies, problems = cls.resolution_dependencies(nodes, components)
+        generations: list[list[ShNode]] = []
+        done: set[str] = set()
+        remaining = [nodes[name] for name in dependencies if name not in problems]
+        while ready := [node for node in remaining if dependencies[node.Name] <= done]:
+            generations.append(ready)
+            done.update(node.Name for node in ready)
+            remaining = [node for node in remaining if node.Name not in done]
+        if remaining:
+            cycle: list[str] = []
+            try:
+                graphlib.TopologicalSorter(
+                    {node.Name: dependencies[node.Name] - done for node in remaining}
+                ).prepare()
+            except graphlib.CycleError as e:
+                cycle = e.args[1]
+            for node in remaining:
+                problems[node.Name] = DcError(
+                    f"{node.Name} cannot be resolved. It depends on "
+                    f"{sorted(dependencies[node.Name] - done)}"
+                    + (f", in the cycle {' -> '.join(cycle)}" if cycle else "")
+                )
+        if problems and raise_errors:
+            s = "ERROR in component resolution. Caught:\n"
+            for exception in problems.values():
+                s += f"  {exception}\n"
+            raise DcError(s)
+        errors.extend(
+            LoadError("ShNode", {"node": {"name": name, "node": nodes[name]}}, e)
+            for name, e in problems.items()
+        )
+        return generations
+
     @classmethod
     def resolve_links(
         cls,
@@ -485,16 +672,32 @@ class HardwareLayout:
         raise_errors: bool = True,
         errors: Optional[list[LoadError]] = None,
     ) -> None:
+        """Resolve every node's component, in resolution_order()."""
         if errors is None:
             errors = []
+        generations = cls.resolution_order(
+            nodes, components, raise_errors=raise_errors, errors=errors
+        )
         for node in nodes.values():
-            cls.resolve_node_links(
-                node=node,
-                all_nodes=nodes,
-                components=components,
-                raise_errors=raise_errors,
-                errors=errors,
-            )
+            if not isinstance(
+                components.get(node.component_id or ""), ComponentResolver
+            ):
+                cls.resolve_node_links(
+                    node=node,
+                    all_nodes=nodes,
+                    components=components,
+                    raise_errors=raise_errors,
+                    errors=errors,
+                )
+        for generation in generations:
+            for node in generation:
+                cls.resolve_node_links(
+                    node=node,
+                    all_nodes=nodes,
+                    components=components,
+                    raise_errors=raise_errors,
+                    errors=errors,
+                )
 
     def __init__(  # noqa: PLR0913
         self,
@@ -505,8 +708,25 @@ class HardwareLayout:
         nodes: dict[str, ShNode],
         data_channels: dict[str, DataChannel],
         synth_channels: dict[str, SynthChannel],
+        layout_storage: LayoutStorage = "copy",
     ) -> None:
-        self.layout = copy.deepcopy(layout)
+        if layout_storage == "copy":
+            self._layout = copy.deepcopy(layout)
+        elif layout_storage == "reference":
+            self._layout = layout
+        elif layout_storage == "drop":
+            self._layout = None
+        else:
+            raise ValueError(f"ERROR. Unknown layout_storage {layout_storage!r}")
+        self._layout_metadata = (
+            self._layout
+            if self._layout is not None
+            else {
+                key: copy.deepcopy(value)
+                for key, value in layout.items()
+                if key not in self.ENTITY_LAYOUT_KEYS
+            }
+        )
         self.cacs = dict(cacs)
         self.components = dict(components)
         self.components_by_type = defaultdict(list)
@@ -518,16 +738,191 @@ class HardwareLayout:
             for node in self.nodes.values()
             if node.component_id is not None
         }
+        self.nodes_by_handle = {}
+        self.nodes_by_hierarchy_name = {}
+        self.nodes_by_explicit_handle = {}
+        self.direct_reports_by_handle = defaultdict(list)
+        for node in self.nodes.values():
+            self.index_node(node)
         self.data_channels = dict(data_channels)
         self.synth_channels = dict(synth_channels)
+        self.component_id_by_channel_name = {
+            config.ChannelName: component_id
+            for component_id, component in self.components.items()
+            for config in component.gt.ConfigList
+        }
+        self.channels_by_about_node = defaultdict(list)
+        self.channels_by_captured_by_node = defaultdict(list)
+        self.channels_by_telemetry_name = defaultdict(list)
+        self.channels_by_component = defaultdict(list)
+        for channel in self.data_channels.values():
+            self.index_channel(channel)
+        self.synth_channels_by_created_by_node = defaultdict(list)
+        for synth_channel in self.synth_channels.values():
+            self.index_synth_channel(synth_channel)
+
+    @property
+    def layout(self) -> dict[Any, Any]:
+        """The raw layout dict. With layout_storage="drop", or once the
+        layout has been changed in place (by add_node(), remove_node() and
+        the like), this is rebuilt on each access by build_layout()."""
+        if self._layout is None:
+            return self.build_layout()
+        return self._layout
+
+    def build_layout(self) -> dict[Any, Any]:
+        """Return a layout dict built from the loaded cacs, components, nodes
+        and channels. Loading it gives a HardwareLayout equal to this one,
+        though entries may be in different lists than in the original
+        layout (for example a cac from OtherCacs that has a dedicated list),
+        and nodes excluded by included_node_names are absent."""
+        layout: dict[Any, Any] = copy.deepcopy(self._layout_metadata)
+        for key in self.ENTITY_LAYOUT_KEYS:
+            layout[key] = []
+        for layout_keys, gts in [
+            (self.CAC_LAYOUT_KEYS, self.cacs.values()),
+            (
+                self.COMPONENT_LAYOUT_KEYS,
+                (component.gt for component in self.components.values()),
+            ),
+        ]:
+            key_by_type_name = {
+                type_name: key for key, type_name in layout_keys.items()
+            }
+            for gt in gts:
+                key = key_by_type_name.get(gt.TypeName, key_by_type_name[""])
+                layout[key].append(gt.model_dump(mode="json", exclude_none=True))
+        layout["ShNodes"] = [
+            node.model_dump(mode="json", exclude={"component"}, exclude_none=True)
+            for node in self.nodes.values()
+        ]
+        layout["DataChannels"] = [
+            channel.model_dump(
+                mode="json",
+                exclude={"about_node", "captured_by_node"},
+                exclude_none=True,
+            )
+            for channel in self.data_channels.values()
+        ]
+        layout["SynthChannels"] = [
+            channel.model_dump(
+                mode="json", exclude={"created_by_node"}, exclude_none=True
+            )
+            for channel in self.synth_channels.values()
+        ]
+        return layout
+
+    @property
+    def metadata(self) -> dict[Any, Any]:
+        """The entries of the layout other than the lists of cacs,
+        components, nodes and channels."""
+        return {
+            key: value
+            for key, value in self._layout_metadata.items()
+            if key not in self.ENTITY_LAYOUT_KEYS
+        }
+
+    def diff(self, other: "HardwareLayout") -> LayoutDiff:
+        """Return the changes which turn this layout into other, matching
+        entities by their ids."""
+        return LayoutDiff.between(self, other)
+
+    def index_node(self, node: ShNode) -> None:
+        """Add node to the handle, hierarchy name, explicit Handle and boss
+        indexes."""
+        handle = node.handle
+        self.nodes_by_handle.setdefault(handle, node)
+        self.nodes_by_hierarchy_name.setdefault(node.actor_hierarchy_name, node)
+        if node.Handle:
+            self.nodes_by_explicit_handle[node.Handle] = node
+        self.direct_reports_by_handle[self.boss_handle(handle) or handle].append(node)
+
+    def index_channel(self, channel: DataChannel) -> None:
+        """Add channel to the about node, captured by node, telemetry name and
+        component indexes."""
+        self.channels_by_about_node[channel.AboutNodeName].append(channel)
+        self.channels_by_captured_by_node[channel.CapturedByNodeName].append(channel)
+        self.channels_by_telemetry_name[channel.TelemetryName].append(channel)
+        component_id = self.component_id_by_channel_name.get(channel.Name)
+        if component_id is not None:
+            self.channels_by_component[component_id].append(channel)
+
+    def index_synth_channel(self, synth_channel: SynthChannel) -> None:
+        self.synth_channels_by_created_by_node[synth_channel.CreatedByNodeName].append(
+            synth_channel
+        )
 
-    def clear_property_cache(self) -> None:
+    def unindex_node(self, node: ShNode) -> None:
+        """Remove node, which is no longer in self.nodes, from the indexes
+        index_node() added it to. Where it was the first of several nodes
+        with the same key, the next one takes its place."""
+        handle = node.handle
+        _remove_item(
+            self.direct_reports_by_handle[self.boss_handle(handle) or handle], node
+        )
+        if self.nodes_by_handle.get(handle) is node:
+            del self.nodes_by_handle[handle]
+            for other in self.nodes.values():
+                if other.handle == handle:
+                    self.nodes_by_handle[handle] = other
+                    break
+        hierarchy_name = node.actor_hierarchy_name
+        if self.nodes_by_hierarchy_name.get(hierarchy_name) is node:
+            del self.nodes_by_hierarchy_name[hierarchy_name]
+            for other in self.nodes.values():
+                if other.actor_hierarchy_name == hierarchy_name:
+                    self.nodes_by_hierarchy_name[hierarchy_name] = other
+                    break
+        if node.Handle and self.nodes_by_explicit_handle.get(node.Handle) is node:
+            del self.nodes_by_explicit_handle[node.Handle]
+            for other in reversed(self.nodes.values()):
+                if other.Handle == node.Handle:
+                    self.nodes_by_explicit_handle[node.Handle] = other
+                    break
+
+    def unindex_channel(self, channel: DataChannel) -> None:
+        _remove_item(self.channels_by_about_node[channel.AboutNodeName], channel)
+        _remove_item(
+            self.channels_by_captured_by_node[channel.CapturedByNodeName], channel
+        )
+        _remove_item(self.channels_by_telemetry_name[channel.TelemetryName], channel)
+        component_id = self.component_id_by_channel_name.get(channel.Name)
+        if component_id is not None:
+            _remove_item(self.channels_by_component[component_id], channel)
+
+    def intern_cacs(self, cac_pool: CacPool) -> None:
+        """Replace this layout's cacs, including those of its components,
+        with the equal ones in cac_pool."""
+        for cac_id, cac in self.cacs.items():
+            self.cacs[cac_id] = cac_pool.intern(cac)
+        for component in self.components.values():
+            component.cac = cac_pool.intern(component.cac)
+
+    def clear_property_cache(self, *changed: str) -> None:
+        """Drop cached properties. With no arguments all of them are dropped;
+        otherwise only those which CACHED_PROPERTY_DEPENDENCIES says depend
+        on one of the changed parts ("nodes", "components", "data_channels"
+        or "synth_channels"), and those it does not list."""
         for cached_prop_name in [
             prop_name
             for prop_name in type(self).__dict__
             if isinstance(type(self).__dict__[prop_name], cached_property)
         ]:
-            self.__dict__.pop(cached_prop_name, None)
+            dependencies = self.CACHED_PROPERTY_DEPENDENCIES.get(cached_prop_name)
+            if (
+                not changed
+                or dependencies is None
+                or dependencies.intersection(changed)
+            ):
+                self.__dict__.pop(cached_prop_name, None)
+
+    def _layout_changed(self, *changed: str) -> None:
+        # The stored layout dict no longer describes this layout; layout
+        # falls back to build_layout(), as with layout_storage="drop".
+        if self._layout is not None:
+            self._layout_metadata = self.metadata
+            self._layout = None
+        self.clear_property_cache(*changed)
 
     @classmethod
     def load(  # noqa: PLR0913
@@ -539,17 +934,65 @@ class HardwareLayout:
         errors: Optional[list[LoadError]] = None,
         cac_decoder: Optional[CacDecoder] = None,
         component_decoder: Optional[ComponentDecoder] = None,
+        layout_storage: LayoutStorage = "reference",
+        cac_pool: Optional[CacPool] = None,
+        snapshot_dir: Optional[Path | str] = None,
     ) -> "HardwareLayout":
-        with Path(layout_path).open() as f:
-            layout = json.loads(f.read())
-        return cls.load_dict(
-            layout,
+        """Load the layout at layout_path. The parsed dict is private to this
+        call, so by default it is kept without copying.
+
+        With snapshot_dir, a layout that loads without errors is saved there
+        as a LayoutSnapshot, and later loads of the same file contents with
+        the same options return it without parsing, decoding or validating
+        again. Snapshots require the default decoders."""
+        with Path(layout_path).open("rb") as f:
+            layout_bytes = f.read()
+        snapshot = None
+        if snapshot_dir is not None:
+            if (
+                cac_decoder is not None
+                or component_decoder is not None
+                or (
+                    cac_pool is not None
+                    and cac_pool.cac_decoder is not get_default_cac_decoder()
+                )
+            ):
+                raise ValueError(
+                    "ERROR. Layout snapshots only support the default decoders"
+                )
+            snapshot = LayoutSnapshot(
+                snapshot_dir,
+                layout_bytes,
+                options={
+                    "IncludedNodeNames": (
+                        None
+                        if included_node_names is None
+                        else sorted(included_node_names)
+                    ),
+                    "LayoutStorage": layout_storage,
+                },
+            )
+            hardware_layout = snapshot.load()
+            if hardware_layout is not None:
+                if cac_pool is not None:
+                    hardware_layout.intern_cacs(cac_pool)
+                return hardware_layout
+        if errors is None:
+            errors = []
+        num_errors = len(errors)
+        hardware_layout = cls.load_dict(
+            json.loads(layout_bytes),
             included_node_names=included_node_names,
             raise_errors=raise_errors,
             errors=errors,
             cac_decoder=cac_decoder,
             component_decoder=component_decoder,
+            layout_storage=layout_storage,
+            cac_pool=cac_pool,
         )
+        if snapshot is not None and len(errors) == num_errors:
+            snapshot.save(hardware_layout)
+        return hardware_layout
 
     @classmethod
     def validate_layout(  # noqa: C901
@@ -620,6 +1063,8 @@ class HardwareLayout:
         errors: Optional[list[LoadError]] = None,
         cac_decoder: Optional[CacDecoder] = None,
         component_decoder: Optional[ComponentDecoder] = None,
+        layout_storage: LayoutStorage = "copy",
+        cac_pool: Optional[CacPool] = None,
     ) -> "HardwareLayout":
         if errors is None:
             errors = []
@@ -628,6 +1073,7 @@ class HardwareLayout:
             raise_errors=raise_errors,
             errors=errors,
             cac_decoder=cac_decoder,
+            cac_pool=cac_pool,
         )
         components = cls.load_components(
             layout=layout,
@@ -669,9 +1115,12 @@ class HardwareLayout:
             errors=errors,
         )
         cls.validate_layout(load_args, raise_errors=raise_errors, errors=errors)
-        return HardwareLayout(layout, **load_args)
+        return HardwareLayout(layout, layout_storage=layout_storage, **load_args)
 
     def add_node(self, node: dict[str, Any] | SpaceheatNodeGt) -> ShNode:
+        """Add and return a node. If its component is a ComponentResolver,
+        that component's resolution_group() is rebuilt and resolved with the
+        node, before the layout is changed."""
         node = self.make_node(node, self.components)
         if node.Name in self.nodes:
             raise ValueError(f"ERROR. Node with name {node.Name} already exists")
@@ -682,13 +1131,299 @@ class HardwareLayout:
                 f"Tried to add node {node.Name}. Existing node is "
                 f"{self.nodes_by_component[node.ComponentId]}"
             )
+        replacements: dict[str, Component[Any, Any]] = {}
+        if node.ComponentId is not None:
+            component = self.components[node.ComponentId]
+            if isinstance(component, ComponentResolver):
+                replacements = self._rebuild_resolution_group(
+                    node.ComponentId,
+                    self.make_component(component.gt, component.cac),
+                    {**self.nodes, node.Name: node},
+                    {**self.nodes_by_component, node.ComponentId: node.Name},
+                )
         self.nodes[node.Name] = node
-        self.resolve_node_links(node, self.nodes, self.components, raise_errors=True)
         if node.ComponentId is not None:
             self.nodes_by_component[node.ComponentId] = node.Name
-        self.clear_property_cache()
+        self.index_node(node)
+        self._swap_components(replacements)
+        if replacements:
+            self._layout_changed("nodes", "components")
+        else:
+            self._layout_changed("nodes")
+        return node
+
+    # The methods below change a loaded layout in place. Each checks what
+    # its change could break locally and raises before changing anything,
+    # and clears only the cached properties that depend on what it changed
+    # (and the stored layout dict, which no longer matches).
+    # Whether every channel configured by a component has a DataChannel
+    # (and the reverse), and whether every InPowerMetering node has an
+    # InPowerMetering channel, can only hold between whole reconfigurations,
+    # not between their steps; call validate() when one is complete.
+
+    def validate(self) -> None:
+        """Check the whole layout as loading does, raising DcError if it is
+        inconsistent."""
+        self.validate_layout(
+            {
+                "cacs": self.cacs,
+                "components": self.components,
+                "nodes": self.nodes,
+                "data_channels": self.data_channels,
+                "synth_channels": self.synth_channels,
+            },
+            raise_errors=True,
+        )
+
+    def remove_node(self, name: str) -> ShNode:
+        """Remove and return the node called name. Its component is kept. A
+        node that channels or components refer to, or that is the boss of
+        other nodes, cannot be removed.
+
+        A ComponentResolver is only resolved through its node, so removing
+        the node rebuilds the resolver's resolution_group(), leaving the
+        resolver unresolved as loading the layout without the node would."""
+        node = self.nodes.get(name)
+        if node is None:
+            raise ValueError(f"ERROR. Node {name} does not exist")
+        users = sorted(
+            {
+                channel.Name
+                for channel in [
+                    *self.channels_by_about_node.get(name, ()),
+                    *self.channels_by_captured_by_node.get(name, ()),
+                    *self.synth_channels_by_created_by_node.get(name, ()),
+                ]
+            }
+        )
+        if users:
+            raise ValueError(f"ERROR. Node {name} is used by channels {users}")
+        resolvers = sorted(
+            component_id
+            for component_id, component in self.components.items()
+            if isinstance(component, ComponentResolver)
+            and name in component.resolved_node_names()
+        )
+        if resolvers:
+            raise ValueError(f"ERROR. Node {name} is used by components {resolvers}")
+        if self.nodes_by_handle.get(node.handle) is node:
+            reports = [
+                other.Name
+                for other in self.direct_reports_by_handle.get(node.handle, ())
+                if other is not node
+            ]
+            if reports and not any(
+                other.handle == node.handle and other is not node
+                for other in self.nodes.values()
+            ):
+                raise DcError(f"{name} is the boss of {reports}")
+        replacements: dict[str, Component[Any, Any]] = {}
+        component_id = node.ComponentId or ""
+        if self.nodes_by_component.get(component_id) == name:
+            component = self.components[component_id]
+            if isinstance(component, ComponentResolver):
+                replacements = self._rebuild_resolution_group(
+                    component_id,
+                    self.make_component(component.gt, component.cac),
+                    {other: n for other, n in self.nodes.items() if other != name},
+                )
+        del self.nodes[name]
+        if self.nodes_by_component.get(component_id) == name:
+            del self.nodes_by_component[component_id]
+        self.unindex_node(node)
+        self._swap_components(replacements)
+        self._layout_changed("nodes", "components")
         return node
 
+    def replace_component(
+        self,
+        component: dict[str, Any] | ComponentGt,
+        *,
+        component_decoder: Optional[ComponentDecoder] = None,
+    ) -> Component[Any, Any]:
+        """Replace the component with the same ComponentId, keeping its node,
+        and return the new component. The components whose resolution is
+        tied to it (see resolution_group()) are rebuilt and resolved again
+        with it."""
+        if isinstance(component, dict):
+            if component_decoder is None:
+                component_decoder = get_default_component_decoder()
+            component = component_decoder.decode(component)
+        replacements = self._make_replacement_components(component)
+        component_id = component.ComponentId
+        old_channel_names = [
+            config.ChannelName for config in self.components[component_id].gt.ConfigList
+        ]
+        self._swap_components(replacements)
+        for channel_name in old_channel_names:
+            del self.component_id_by_channel_name[channel_name]
+        for config in component.ConfigList:
+            self.component_id_by_channel_name[config.ChannelName] = component_id
+        self.channels_by_component[component_id] = [
+            channel
+            for channel in self.data_channels.values()
+            if self.component_id_by_channel_name.get(channel.Name) == component_id
+        ]
+        self._layout_changed("components")
+        return replacements[component_id]
+
+    def _make_replacement_components(
+        self, component_gt: ComponentGt
+    ) -> dict[str, Component[Any, Any]]:
+        """Build, check and resolve the component for component_gt and the
+        rest of its resolution_group(), without changing the layout."""
+        component_id = component_gt.ComponentId
+        if component_id not in self.components:
+            raise ValueError(f"ERROR. Component {component_id} does not exist")
+        cac = self.cacs.get(component_gt.ComponentAttributeClassId)
+        if cac is None:
+            raise DcError(
+                f"cac {component_gt.ComponentAttributeClassId} not loaded for component "
+                f"<{component_id}/<{component_gt.DisplayName}>\n"
+            )
+        for config in component_gt.ConfigList:
+            owner = self.component_id_by_channel_name.get(
+                config.ChannelName, component_id
+            )
+            if owner != component_id:
+                raise DcError(
+                    f"Channel name overlap!: {config.ChannelName} is also "
+                    f"configured by component {owner}"
+                )
+        replacement = self.make_component(component_gt, cac)
+        if isinstance(replacement, Ads111xBasedComponent):
+            self.check_ads_terminal_block_consistency(replacement)
+        return self._rebuild_resolution_group(component_id, replacement, self.nodes)
+
+    def _rebuild_resolution_group(
+        self,
+        component_id: str,
+        replacement: Component[Any, Any],
+        nodes: dict[str, ShNode],
+        nodes_by_component: Optional[dict[str, str]] = None,
+    ) -> dict[str, Component[Any, Any]]:
+        """Rebuild the components of the resolution_group() of component_id,
+        using replacement for that component, and resolve them with nodes,
+        without changing the layout. nodes_by_component defaults to
+        self.nodes_by_component."""
+        if nodes_by_component is None:
+            nodes_by_component = self.nodes_by_component
+        replacements = {
+            other_id: (
+                replacement
+                if other_id == component_id
+                else self.make_component(
+                    self.components[other_id].gt, self.components[other_id].cac
+                )
+            )
+            for other_id in self.resolution_group(component_id, replacement)
+        }
+        # Check and resolve with copies of the affected nodes, so that a
+        # failure leaves the layout as it was.
+        components = {**self.components, **replacements}
+        nodes = dict(nodes)
+        replaced_nodes: dict[str, ShNode] = {}
+        for replaced_id, component in replacements.items():
+            node_name = nodes_by_component.get(replaced_id, "")
+            if node_name in nodes:
+                node = nodes[node_name] = replaced_nodes[node_name] = nodes[
+                    node_name
+                ].model_copy(update={"component": component})
+                self.check_actor_component(node)
+                self.check_node_channels(node, self.data_channels)
+        for generation in self.resolution_order(replaced_nodes, components):
+            for node in generation:
+                self.resolve_node_links(node, nodes, components, raise_errors=True)
+        return replacements
+
+    def _swap_components(self, replacements: dict[str, Component[Any, Any]]) -> None:
+        for replaced_id, replacement in replacements.items():
+            replaced = self.components[replaced_id]
+            self.components[replaced_id] = replacement
+            by_type = self.components_by_type[type(replaced)]
+            _remove_item(by_type, replaced)
+            self.components_by_type[type(replacement)].append(replacement)
+            node = self.node_from_component(replaced_id)
+            if node is not None:
+                node.component = replacement
+
+    def resolution_group(
+        self, component_id: str, replacement: Component[Any, Any]
+    ) -> set[str]:
+        """Return the ids of the components which must be rebuilt when the
+        component with component_id is replaced by replacement.
+
+        Resolving a component can change the components it is resolved
+        against (a HubitatComponent records its web listeners), so the group
+        is every loaded component connected to this one, in either
+        direction, by ComponentResolver.resolved_component_ids(). Rebuilding
+        and resolving all of them gives what loading the changed layout
+        would."""
+        connected: dict[str, set[str]] = defaultdict(set)
+        for other_id, other in self.components.items():
+            if isinstance(other, ComponentResolver):
+                for provider_id in other.resolved_component_ids():
+                    connected[provider_id].add(other_id)
+                    connected[other_id].add(provider_id)
+        if isinstance(replacement, ComponentResolver):
+            connected[component_id].update(replacement.resolved_component_ids())
+        group = {component_id}
+        pending = [component_id]
+        while pending:
+            for other_id in connected[pending.pop()]:
+                if other_id in self.components and other_id not in group:
+                    group.add(other_id)
+                    pending.append(other_id)
+        return group
+
+    def add_data_channel(self, channel: dict[str, Any] | DataChannelGt) -> DataChannel:
+        if isinstance(channel, DataChannelGt):
+            channel = channel.model_dump()
+        data_channel = self.make_channel(channel, self.nodes)
+        if data_channel.Name in self.data_channels:
+            raise ValueError(
+                f"ERROR. DataChannel with name {data_channel.Name} already exists"
+            )
+        if any(dc.Id == data_channel.Id for dc in self.data_channels.values()):
+            raise DcError(f"Duplicate dc.Id(s) found: {[data_channel.Id]}")
+        node = self.node_from_component(
+            self.component_id_by_channel_name.get(data_channel.Name, "")
+        )
+        if node is not None:
+            self.check_node_channels(node, {data_channel.Name: data_channel})
+        if data_channel.InPowerMetering and not data_channel.about_node.InPowerMetering:
+            raise DcError(
+                f"Data channel {data_channel} has about_node "
+                f"{data_channel.about_node}, which does not have InPowerMetering!"
+            )
+        self.data_channels[data_channel.Name] = data_channel
+        self.index_channel(data_channel)
+        self._layout_changed("data_channels")
+        return data_channel
+
+    def remove_data_channel(self, name: str) -> DataChannel:
+        data_channel = self.data_channels.pop(name, None)
+        if data_channel is None:
+            raise ValueError(f"ERROR. DataChannel {name} does not exist")
+        self.unindex_channel(data_channel)
+        self._layout_changed("data_channels")
+        return data_channel
+
+    def add_synth_channel(
+        self, channel: dict[str, Any] | SynthChannelGt
+    ) -> SynthChannel:
+        if isinstance(channel, SynthChannelGt):
+            channel = channel.model_dump()
+        synth_channel = self.make_synth_channel(channel, self.nodes)
+        if synth_channel.Name in self.synth_channels:
+            raise ValueError(
+                f"ERROR. SynthChannel with name {synth_channel.Name} already exists"
+            )
+        self.synth_channels[synth_channel.Name] = synth_channel
+        self.index_synth_channel(synth_channel)
+        self._layout_changed("synth_channels")
+        return synth_channel
+
     def channel(self, name: str, default: Any = None) -> DataChannel:  # noqa: ANN401
         return self.data_channels.get(name, default)
 
@@ -698,11 +1433,29 @@ class HardwareLayout:
     def node(self, name: str, default: Any = None) -> ShNode:  # noqa: ANN401
         return self.nodes.get(name, default)
 
+    def channels_about(self, node_name: str) -> list[DataChannel]:
+        return list(self.channels_by_about_node.get(node_name, ()))
+
+    def channels_captured_by(self, node_name: str) -> list[DataChannel]:
+        return list(self.channels_by_captured_by_node.get(node_name, ()))
+
+    def channels_with_telemetry_name(
+        self, telemetry_name: TelemetryName | str
+    ) -> list[DataChannel]:
+        return list(self.channels_by_telemetry_name.get(telemetry_name, ()))
+
+    def channels_for_component(self, component_id: str) -> list[DataChannel]:
+        return list(self.channels_by_component.get(component_id, ()))
+
+    def synth_channels_created_by(self, node_name: str) -> list[SynthChannel]:
+        return list(self.synth_channels_by_created_by_node.get(node_name, ()))
+
     def node_by_handle(self, handle: str) -> Optional[ShNode]:
-        d = {node.Handle: node for node in self.nodes.values() if node.Handle}
-        if handle in d:
-            return d[handle]
-        return None
+        """Return the node whose Handle is explicitly handle. Unlike
+        node_from_handle(), this does not match a node without a Handle by
+        its Name. Where several nodes have the same Handle the last one is
+        returned."""
+        return self.nodes_by_explicit_handle.get(handle)
 
     def component(self, node_name: str) -> Optional[Component[Any, Any]]:
         return self.component_from_node(self.node(node_name, None))
@@ -757,12 +1510,10 @@ class HardwareLayout:
         h_name = self.parent_hierarchy_name(node.actor_hierarchy_name)
         if not h_name:
             return None
-        parent = next(
-            (n for n in self.nodes.values() if n.actor_hierarchy_name == h_name), None
-        )
+        parent = self.nodes_by_hierarchy_name.get(h_name)
         if parent is None:
             raise DcError(f"{node} is missing parent {h_name}!")
-        return self.node(h_name)
+        return parent
 
     @classmethod
     def boss_handle(cls, handle: str) -> Optional[str]:
@@ -775,47 +1526,52 @@ class HardwareLayout:
         # No dots in your name: you are your own boss
         if not boss_handle:
             return node
-        boss = next((n for n in self.nodes.values() if n.handle == boss_handle), None)
+        boss = self.nodes_by_handle.get(boss_handle)
         if boss is None:
             raise DcError(f"{node} is missing boss {boss_handle}")
         return boss
 
     def direct_reports(self, node: ShNode) -> list[ShNode]:
-        return [n for n in self.nodes.values() if self.boss_node(n) == node]
+        """Return the nodes whose boss is node. A node whose handle has no
+        dot is its own boss, and so is among its own direct reports."""
+        indexed = self.nodes_by_handle.get(node.handle)
+        if indexed is not node and indexed != node:
+            return []
+        return list(self.direct_reports_by_handle.get(node.handle, ()))
 
     def node_from_handle(self, handle: str) -> Optional[ShNode]:
-        return next((n for n in self.nodes.values() if n.handle == handle), None)
+        return self.nodes_by_handle.get(handle)
 
     @cached_property
     def atn_g_node_alias(self) -> str:
-        return self.layout["MyAtomicTNodeGNode"]["Alias"]  # type: ignore[no-any-return]
+        return self._layout_metadata["MyAtomicTNodeGNode"]["Alias"]  # type: ignore[no-any-return]
 
     @cached_property
     def atn_g_node_instance_id(self) -> str:
-        return self.layout["MyAtomicTNodeGNode"]["GNodeId"]  # type: ignore[no-any-return]
+        return self._layout_metadata["MyAtomicTNodeGNode"]["GNodeId"]  # type: ignore[no-any-return]
 
     @cached_property
     def atn_g_node_id(self) -> str:
-        return self.layout["MyAtomicTNodeGNode"]["GNodeId"]  # type: ignore[no-any-return]
+        return self._layout_metadata["MyAtomicTNodeGNode"]["GNodeId"]  # type: ignore[no-any-return]
 
     @cached_property
     def terminal_asset_g_node_alias(self) -> str:
-        my_atn_as_dict = self.layout["MyTerminalAssetGNode"]
+        my_atn_as_dict = self._layout_metadata["MyTerminalAssetGNode"]
         return my_atn_as_dict["Alias"]  # type: ignore[no-any-return]
 
     @cached_property
     def terminal_asset_g_node_id(self) -> str:
-        my_atn_as_dict = self.layout["MyTerminalAssetGNode"]
+        my_atn_as_dict = self._layout_metadata["MyTerminalAssetGNode"]
         return my_atn_as_dict["GNodeId"]  # type: ignore[no-any-return]
 
     @cached_property
     def scada_g_node_alias(self) -> str:
-        my_scada_as_dict = self.layout["MyScadaGNode"]
+        my_scada_as_dict = self._layout_metadata["MyScadaGNode"]
         return my_scada_as_dict["Alias"]  # type: ignore[no-any-return]
 
     @cached_property
     def scada_g_node_id(self) -> str:
-        my_scada_as_dict = self.layout["MyScadaGNode"]
+        my_scada_as_dict = self._layout_metadata["MyScadaGNode"]
         return my_scada_as_dict["GNodeId"]  # type: ignore[no-any-return]
 
     @cached_property
@@ -0,0 +1,127 @@
+"""Structural differences between two HardwareLayouts.
+
+HardwareLayout.diff() matches the cacs, components, nodes and channels of
+two layouts by their stable ids (ComponentAttributeClassId, ComponentId,
+ShNodeId and Id), so a renamed node is a changed node, not a removed one
+and an added one. Entities are compared as they are written to a layout
+(see HardwareLayout.build_layout()), field by field.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from gwproto.data_classes.hardware_layout import HardwareLayout
+
+# A changed field: its (old, new) values. A field absent on one side is None
+# there.
+FieldChanges = dict[str, tuple[Any, Any]]
+
+
+@dataclass
+class EntityChanges:
+    """The changes to one kind of entity, keyed by entity id. Added and
+    removed entities are given as layout dicts."""
+
+    added: dict[str, dict[str, Any]] = field(default_factory=dict)
+    removed: dict[str, dict[str, Any]] = field(default_factory=dict)
+    changed: dict[str, FieldChanges] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass
+class LayoutDiff:
+    """The changes which turn one HardwareLayout into another.
+
+    metadata holds the (old, new) values of the changed top level layout
+    entries other than the lists of cacs, components, nodes and channels
+    (the GNodes, for example).
+    """
+
+    cacs: EntityChanges = field(default_factory=EntityChanges)
+    components: EntityChanges = field(default_factory=EntityChanges)
+    nodes: EntityChanges = field(default_factory=EntityChanges)
+    data_channels: EntityChanges = field(default_factory=EntityChanges)
+    synth_channels: EntityChanges = field(default_factory=EntityChanges)
+    metadata: FieldChanges = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(
+            self.cacs
+            or self.components
+            or self.nodes
+            or self.data_channels
+            or self.synth_channels
+            or self.metadata
+        )
+
+    @classmethod
+    def between(cls, old: "HardwareLayout", new: "HardwareLayout") -> "LayoutDiff":
+        return LayoutDiff(
+            cacs=diff_entities(
+                {cac.ComponentAttributeClassId: cac for cac in old.cacs.values()},
+                {cac.ComponentAttributeClassId: cac for cac in new.cacs.values()},
+            ),
+            components=diff_entities(
+                {c.gt.ComponentId: c.gt for c in old.components.values()},
+                {c.gt.ComponentId: c.gt for c in new.components.values()},
+            ),
+            nodes=diff_entities(
+                {node.ShNodeId: node for node in old.nodes.values()},
+                {node.ShNodeId: node for node in new.nodes.values()},
+                exclude={"component"},
+            ),
+            data_channels=diff_entities(
+                {channel.Id: channel for channel in old.data_channels.values()},
+                {channel.Id: channel for channel in new.data_channels.values()},
+                exclude={"about_node", "captured_by_node"},
+            ),
+            synth_channels=diff_entities(
+                {channel.Id: channel for channel in old.synth_channels.values()},
+                {channel.Id: channel for channel in new.synth_channels.values()},
+                exclude={"created_by_node"},
+            ),
+            metadata=diff_dicts(old.metadata, new.metadata),
+        )
+
+
+def diff_dicts(old: dict[str, Any], new: dict[str, Any]) -> FieldChanges:
+    return {
+        key: (old.get(key), new.get(key))
+        for key in dict.fromkeys([*old, *new])
+        if old.get(key) != new.get(key)
+    }
+
+
+def diff_entities(
+    old: dict[str, BaseModel],
+    new: dict[str, BaseModel],
+    *,
+    exclude: Iterable[str] = (),
+) -> EntityChanges:
+    """Compare the entities in old and new, each keyed by id. Fields in
+    exclude (links to other loaded objects) are not compared."""
+    exclude = set(exclude)
+
+    def dump(entity: BaseModel) -> dict[str, Any]:
+        return entity.model_dump(mode="json", exclude=exclude, exclude_none=True)
+
+    changes = EntityChanges()
+    for entity_id, old_entity in old.items():
+        new_entity = new.get(entity_id)
+        if new_entity is None:
+            changes.removed[entity_id] = dump(old_entity)
+        elif new_entity is not old_entity:
+            # Cacs shared through a CacPool are the same object.
+            field_changes = diff_dicts(dump(old_entity), dump(new_entity))
+            if field_changes:
+                changes.changed[entity_id] = field_changes
+    for entity_id, new_entity in new.items():
+        if entity_id not in old:
+            changes.added[entity_id] = dump(new_entity)
+    return changes
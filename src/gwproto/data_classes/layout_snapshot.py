@@ -0,0 +1,121 @@
+"""Persisted snapshots of loaded HardwareLayouts.
+
+Loading a layout parses its JSON, decodes every cac and component, builds
+nodes and channels, resolves links and validates the result. A snapshot is
+the pickled result of all that, so a process that restarts with an
+unchanged layout file can skip straight to the validated object graph.
+
+Each snapshot is stored under a name derived from the SHA-256 of the
+layout file's bytes and the load options. It starts with a header naming
+the gwproto, pydantic and Python versions that wrote it; a snapshot
+written by any other versions is ignored and replaced.
+
+Snapshots are pickles. Only point snapshot_dir at a directory that is as
+trusted as the code itself.
+"""
+
+import hashlib
+import importlib.metadata
+import json
+import pickle
+import platform
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+import pydantic
+
+if TYPE_CHECKING:
+    from gwproto.data_classes.hardware_layout import HardwareLayout
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_SUFFIX = ".layout.pickle"
+
+
+def _gwproto_version() -> Optional[str]:
+    try:
+        return importlib.metadata.version("gridworks-protocol")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+# None when gwproto is not installed (run from a source checkout, say). There
+# is then no version to tie snapshots to, so they are neither read nor
+# written.
+GWPROTO_VERSION = _gwproto_version()
+
+
+class LayoutSnapshot:
+    """The snapshot of one layout file's contents loaded with one set of
+    options."""
+
+    path: Path
+    header: dict[str, Any]
+
+    def __init__(
+        self,
+        snapshot_dir: Path | str,
+        layout_bytes: bytes,
+        *,
+        options: dict[str, Any],
+    ) -> None:
+        """options are the load options which change the loaded layout;
+        they must be JSON serializable."""
+        source_hash = hashlib.sha256(layout_bytes).hexdigest()
+        options_json = json.dumps(options, sort_keys=True)
+        name = hashlib.sha256(f"{source_hash}:{options_json}".encode()).hexdigest()
+        self.path = Path(snapshot_dir) / f"{name}{SNAPSHOT_SUFFIX}"
+        self.header = {
+            "Format": SNAPSHOT_FORMAT,
+            "GwprotoVersion": GWPROTO_VERSION,
+            "PydanticVersion": pydantic.VERSION,
+            "PythonVersion": platform.python_version(),
+            "SourceSha256": source_hash,
+            "Options": options_json,
+        }
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return GWPROTO_VERSION is not None
+
+    def load(self) -> Optional["HardwareLayout"]:
+        """Return the layout in the snapshot, or None if there is no usable
+        snapshot."""
+        if not self.enabled():
+            return None
+        try:
+            with self.path.open("rb") as f:
+                if pickle.load(f) != self.header:  # noqa: S301
+                    return None
+                layout: HardwareLayout = pickle.load(f)  # noqa: S301
+        except Exception:  # noqa: BLE001
+            # Missing, truncated or unreadable; it will be written again.
+            return None
+        return layout
+
+    def save(self, layout: "HardwareLayout") -> bool:
+        """Write layout to the snapshot. The file is replaced atomically, so
+        concurrent readers see either the old snapshot or the new one.
+
+        Return whether the snapshot was written. A snapshot is only a cache:
+        if it cannot be written (an unwritable snapshot_dir, a full disk, a
+        layout that cannot be pickled) it is skipped."""
+        if not self.enabled():
+            return False
+        temp_path: Optional[Path] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.path.parent, suffix=".tmp", delete=False
+            ) as f:
+                temp_path = Path(f.name)
+                pickle.dump(self.header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(layout, f, protocol=pickle.HIGHEST_PROTOCOL)
+            temp_path.replace(self.path)
+        except BaseException as e:
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+            if not isinstance(e, Exception):
+                raise
+            return False
+        return True
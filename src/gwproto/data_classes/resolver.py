@@ -14,3 +14,12 @@ class ComponentResolver(ABC):
         components: dict[str, Component[Any, Any]],
     ) -> None:
         raise NotImplementedError
+
+    def resolved_component_ids(self) -> set[str]:
+        """The ids of the other components resolve() reads. If one of them
+        is replaced, this component must be rebuilt and resolved again."""
+        return set()
+
+    def resolved_node_names(self) -> set[str]:
+        """The names of the nodes resolve() requires to exist."""
+        return set()
@@ -1,11 +1,16 @@
 # ruff: noqa: ANN401
 
 import abc
+import contextlib
 import inspect
 import re
 import sys
+import threading
+import time
 from abc import abstractmethod
-from collections.abc import Sequence
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
 
 # Static analysis (mypy, pycharm) thinks 'types' here is gwproto.named_types.
 from types import ModuleType  # noqa
@@ -16,6 +21,8 @@ from typing import (
     Optional,
     TypeVar,
     Union,
+    cast,
+    get_args,
     get_origin,
 )
 
@@ -23,30 +30,182 @@ import pydantic
 from pydantic import BaseModel, Field, ValidationError, create_model
 from pydantic_core import ErrorDetails
 
+from gwproto.binary import BINARY_ENVELOPE_TYPE, BinaryEncoding, TagTable
+from gwproto.encoding import EnvelopeEncoder, JSONBackend
 from gwproto.message import Message
 from gwproto.messages import AnyEvent
 from gwproto.named_types import ComponentAttributeClassGt, ComponentGt
-from gwproto.topic import MQTTTopic
+from gwproto.streaming import (
+    StreamedReport,
+    find_channel_reading_list,
+    iter_channel_readings,
+)
+from gwproto.topic import DecodedMQTTTopic, MQTTTopic
+from gwproto.utils import LRUCache
 
 MessageDiscriminator = TypeVar("MessageDiscriminator", bound=Message[Any])
 
 TYPE_NAME_FIELD: str = "TypeName"
 
 
+@dataclass
+class MessageDecodeError:
+    index: int
+    topic: str
+    payload: bytes
+    exception: Exception
+
+
+@dataclass
+class DecodedBatch:
+    # One entry per input item, None where decoding failed.
+    messages: list[Optional[Message[Any]]] = field(default_factory=list)
+    errors: list[MessageDecodeError] = field(default_factory=list)
+
+
+ModelKey = tuple[type[BaseModel], str, str, tuple[Any, ...], Optional[str]]
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@dataclass
+class ModelCacheStats:
+    hits: int = 0
+    misses: int = 0
+    # Time spent in create_model() (pydantic schema generation) on misses.
+    build_seconds: float = 0.0
+    # Time spent by pydantic_named_types() scanning modules.
+    scan_seconds: float = 0.0
+
+
+class ModelCache:
+    """Process-wide cache of models built by create_message_model(),
+    UnionWrapper.create() (and so CacDecoder and ComponentDecoder) and
+    MQTTCodec.payload_model().
+
+    Models are keyed by (base, model name, field name, resolved field types,
+    discriminator), so identical requests share one compiled model no matter
+    which modules, regex or explicit types resolved those field types.
+    """
+
+    models: dict[ModelKey, type[BaseModel]]
+    stats: ModelCacheStats
+    enabled: bool
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        self.models = {}
+        self.stats = ModelCacheStats()
+        self.enabled = enabled
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        model_name: str,
+        base: type[ModelT],
+        field_name: str,
+        field_types: Sequence[Any],
+        discriminator: Optional[str] = None,
+    ) -> type[ModelT]:
+        """Return a model named model_name derived from base, with field
+        field_name holding one of field_types."""
+        key = (base, model_name, field_name, tuple(field_types), discriminator)
+        with self._lock:
+            cached = self.models.get(key) if self.enabled else None
+            if cached is not None:
+                self.stats.hits += 1
+                return cast(type[ModelT], cached)
+            self.stats.misses += 1
+            start = time.perf_counter()
+            field_type = (
+                key[3][0]
+                if len(key[3]) == 1 and discriminator is None
+                else Union[key[3]]
+            )
+            field_definitions: dict[str, Any] = {
+                field_name: (field_type, Field(..., discriminator=discriminator))
+            }
+            model = create_model(model_name, __base__=base, **field_definitions)
+            self.stats.build_seconds += time.perf_counter() - start
+            if self.enabled:
+                self.models[key] = model
+            return model
+
+    def clear(self) -> None:
+        with self._lock:
+            self.models.clear()
+            self.stats = ModelCacheStats()
+
+
+MODEL_CACHE = ModelCache()
+
+
 class MQTTCodec(abc.ABC):
     ENCODING = "utf-8"
+    TOPIC_CACHE_SIZE = 256
     message_model: type[Message[Any]]
-
-    def __init__(self, message_model: type[Message[Any]]) -> None:
+    dispatch_by_type_name: bool
+    payload_types: dict[str, type[BaseModel]]
+    payload_models: dict[str, type[Message[Any]]]
+    validated_topics: LRUCache[str, DecodedMQTTTopic]
+    encoder: EnvelopeEncoder
+    json_backend: JSONBackend
+    binary_encoding: Optional[BinaryEncoding]
+
+    def __init__(  # noqa: PLR0913
+        self,
+        message_model: type[Message[Any]],
+        *,
+        dispatch_by_type_name: bool = True,
+        topic_cache_size: int = 0,
+        json_backend: Optional[JSONBackend] = None,
+        binary: bool | TagTable = False,
+        delta_encode: bool = False,
+    ) -> None:
         self.message_model = message_model
+        self.encoder = EnvelopeEncoder(json_backend=json_backend)
+        self.json_backend = self.encoder.json_backend
+        self.validated_topics = LRUCache(topic_cache_size)
+        self.dispatch_by_type_name = dispatch_by_type_name
+        self.payload_types = (
+            get_payload_types(message_model) if dispatch_by_type_name else {}
+        )
+        self.payload_models = {}
+        # Peers whose message models differ (e.g. parent and child) can
+        # share tags by passing the same explicitly constructed TagTable.
+        # delta_encode only affects what this codec sends; binary decoding
+        # always accepts delta encoded integer lists.
+        if isinstance(binary, TagTable):
+            self.binary_encoding = BinaryEncoding(binary, delta_encode=delta_encode)
+        elif binary:
+            self.binary_encoding = BinaryEncoding(
+                TagTable.from_message_model(message_model),
+                delta_encode=delta_encode,
+            )
+        else:
+            self.binary_encoding = None
+
+    def envelope_types(self) -> list[str]:
+        if self.binary_encoding is None:
+            return [self.message_model.type_name()]
+        return [self.message_model.type_name(), BINARY_ENVELOPE_TYPE]
 
     def encode(self, content: bytes | BaseModel) -> bytes:  # noqa
         if isinstance(content, bytes):
             encoded = content
+        elif isinstance(content, Message):
+            encoded = self.encoder.encode(content)
         else:
             encoded = content.model_dump_json().encode()
         return encoded
 
+    def encode_binary(self, message: Message[Any]) -> bytes:
+        """Encode message for the BINARY_ENVELOPE_TYPE envelope. Publish the
+        result on message.mqtt_topic(envelope_type=BINARY_ENVELOPE_TYPE)."""
+        if self.binary_encoding is None:
+            raise ValueError(
+                "ERROR. Binary encoding requires a codec constructed with binary=True"
+            )
+        return self.binary_encoding.dumps_model(message)
+
     @classmethod
     def get_unrecognized_payload_error(
         cls, e: ValidationError
@@ -70,8 +229,90 @@ class MQTTCodec(abc.ABC):
                 raise e2 from e
         raise e
 
-    def decode(self, topic: str, payload: bytes) -> Message[Any]:
-        self.validate_topic(topic)
+    def payload_model(self, type_name: str) -> Optional[type[Message[Any]]]:
+        """Return the message model whose Payload is exactly the class
+        registered for type_name, building and caching it on first use."""
+        model = self.payload_models.get(type_name)
+        if model is None:
+            payload_type = self.payload_types.get(type_name)
+            if payload_type is None:
+                return None
+            model = MODEL_CACHE.get(
+                self.message_model.__name__,
+                self.message_model,
+                "Payload",
+                [payload_type],
+            )
+            self.payload_models[type_name] = model
+        return model
+
+    def validate_payload_model(
+        self, model: type[Message[Any]], message_dict: Any
+    ) -> Message[Any]:
+        """Validate message_dict against model, a concrete model from
+        payload_model(), returning an instance of message_model itself."""
+        message = model.model_validate(message_dict)
+        # model only narrows Payload, so the validated state is also valid
+        # for message_model; moving it over is cheaper than model_construct().
+        decoded = self.message_model.__new__(self.message_model)
+        decoded.__setstate__(message.__getstate__())
+        return decoded
+
+    def decode_by_type_name(self, payload: bytes) -> Message[Any]:
+        """Decode payload by reading Payload.TypeName once and validating
+        against the matching concrete message model, rather than against
+        the whole discriminated union in message_model. The result is still
+        an instance of message_model.
+
+        Unrecognized gridworks.event.* types are decoded directly as
+        Message[AnyEvent]. Anything this path cannot classify (invalid JSON,
+        missing or unrecognized TypeName), or that fails validation against
+        its concrete model, is handed to the union decode so that callers
+        see the same errors, with the same locations, as before.
+        """
+        try:
+            message_dict = self.json_backend.loads(payload)
+        except ValueError:
+            return self.decode_union(payload)
+        type_name = get_payload_type_name(message_dict)
+        if (model := self.payload_model(type_name)) is not None:
+            with contextlib.suppress(ValidationError):
+                return self.validate_payload_model(model, message_dict)
+            return self.decode_union(payload)
+        if type_name.startswith("gridworks.event"):
+            return Message[AnyEvent].model_validate(message_dict)
+        return self.decode_union(payload)
+
+    def decode_dict(self, message_dict: Any) -> Message[Any]:
+        """Validate an already parsed message, with the same handling of
+        unrecognized gridworks.event types as decode_payload()."""
+        if (
+            model := self.payload_model(get_payload_type_name(message_dict))
+        ) is not None:
+            # On failure, validate against the union below for its errors.
+            with contextlib.suppress(ValidationError):
+                return self.validate_payload_model(model, message_dict)
+        try:
+            return self.message_model.model_validate(message_dict)
+        except ValidationError as e:
+            details = self.get_unrecognized_payload_error(e)
+            if details is None or not details.get("ctx", {}).get("tag", "").startswith(
+                "gridworks.event"
+            ):
+                raise
+            try:
+                return Message[AnyEvent].model_validate(message_dict)
+            except ValidationError as e2:
+                raise e2 from e
+
+    def decode_binary(self, payload: bytes) -> Message[Any]:
+        if self.binary_encoding is None:
+            raise ValueError(
+                "ERROR. Binary decoding requires a codec constructed with binary=True"
+            )
+        return self.decode_dict(self.binary_encoding.loads(payload))
+
+    def decode_union(self, payload: bytes) -> Message[Any]:
         try:
             message = self.message_model.model_validate_json(payload)
         except pydantic.ValidationError as e:
@@ -85,14 +326,108 @@ class MQTTCodec(abc.ABC):
             raise
         return message
 
-    def validate_topic(self, topic: str) -> None:
-        decoded_topic = MQTTTopic.decode(topic)
-        if decoded_topic.envelope_type != self.message_model.type_name():
-            raise ValueError(
-                f"Type {decoded_topic.envelope_type} not recognized. "
-                f"Available decoders: {self.message_model.type_name()}"
-            )
-        self.validate_source_and_destination(decoded_topic.src, decoded_topic.dst)
+    def decode_payload(self, payload: bytes) -> Message[Any]:
+        if self.payload_types:
+            return self.decode_by_type_name(payload)
+        return self.decode_union(payload)
+
+    def decode_topic_payload(
+        self, decoded_topic: DecodedMQTTTopic, payload: bytes
+    ) -> Message[Any]:
+        if decoded_topic.envelope_type == BINARY_ENVELOPE_TYPE:
+            return self.decode_binary(payload)
+        return self.decode_payload(payload)
+
+    def decode(self, topic: str, payload: bytes) -> Message[Any]:
+        return self.decode_topic_payload(self.validate_topic(topic), payload)
+
+    def decode_streaming(self, topic: str, payload: bytes) -> StreamedReport:
+        """Decode a message whose payload may contain a large
+        ChannelReadingList (a Report or a ReportEvent), producing the
+        ChannelReadings lazily.
+
+        For JSON envelopes the rest of the message is validated immediately
+        and each ChannelReadings is validated from the raw bytes only when
+        StreamedReport.channel_readings reaches it, so peak memory scales
+        with one channel rather than the whole report. Binary envelopes and
+        messages without a ChannelReadingList are decoded whole; their
+        readings, if any, are moved from the message to the iterator so the
+        result looks the same.
+        """
+        decoded_topic = self.validate_topic(topic)
+        found = None
+        if decoded_topic.envelope_type != BINARY_ENVELOPE_TYPE:
+            found = find_channel_reading_list(payload)
+        if found is None:
+            message = self.decode_topic_payload(decoded_topic, payload)
+            report = getattr(message.Payload, "Report", message.Payload)
+            readings = getattr(report, "ChannelReadingList", None)
+            if not isinstance(readings, list):
+                return StreamedReport(message)
+            report.ChannelReadingList = []
+            return StreamedReport(message, iter(readings))
+        start, end, items = found
+        message = self.decode_topic_payload(
+            decoded_topic, payload[:start] + b"[]" + payload[end:]
+        )
+        return StreamedReport(message, iter_channel_readings(payload, items))
+
+    def decode_many(self, items: Iterable[tuple[str, bytes]]) -> DecodedBatch:
+        """Decode a batch of (topic, payload) items without raising.
+
+        Items are grouped by topic, so each distinct topic (and therefore
+        message type) is validated once and its payloads are decoded
+        together. Failures are reported per item in DecodedBatch.errors, in
+        input order; the corresponding entry in DecodedBatch.messages is None.
+        """
+        groups: dict[str, list[tuple[int, bytes]]] = defaultdict(list)
+        num_items = 0
+        for index, (topic, payload) in enumerate(items):
+            groups[topic].append((index, payload))
+            num_items += 1
+        batch = DecodedBatch(messages=[None] * num_items)
+        for topic, group in groups.items():
+            try:
+                decoded_topic = self.validate_topic(topic)
+            except Exception as e:  # noqa: BLE001
+                batch.errors.extend(
+                    MessageDecodeError(index, topic, payload, e)
+                    for index, payload in group
+                )
+                continue
+            for index, payload in group:
+                try:
+                    batch.messages[index] = self.decode_topic_payload(
+                        decoded_topic, payload
+                    )
+                except Exception as e:  # noqa: BLE001, PERF203
+                    batch.errors.append(MessageDecodeError(index, topic, payload, e))
+        batch.errors.sort(key=lambda error: error.index)
+        return batch
+
+    def validate_topic(self, topic: str) -> DecodedMQTTTopic:
+        """Validate topic. With topic_cache_size > 0 (e.g. TOPIC_CACHE_SIZE),
+        topics that pass are remembered in validated_topics so that repeats
+        cost one cache lookup, and are not checked again. Only enable the
+        cache if validate_source_and_destination() always gives the same
+        answer for the same src and dst, or call clear_topic_cache()
+        whenever its answer may change (e.g. when the set of known peers
+        changes)."""
+        decoded_topic = self.validated_topics.get(topic)
+        if decoded_topic is None:
+            decoded_topic = MQTTTopic.decode_cached(topic)
+            if decoded_topic.envelope_type not in self.envelope_types():
+                raise ValueError(
+                    f"Type {decoded_topic.envelope_type} not recognized. "
+                    f"Available decoders: {', '.join(self.envelope_types())}"
+                )
+            self.validate_source_and_destination(decoded_topic.src, decoded_topic.dst)
+            self.validated_topics.put(topic, decoded_topic)
+        return decoded_topic
+
+    def clear_topic_cache(self) -> None:
+        """Forget the topics remembered by validate_topic()."""
+        self.validated_topics.clear()
 
     @abstractmethod
     def validate_source_and_destination(self, src: str, dst: str) -> None: ...
@@ -127,6 +462,38 @@ def get_model_type_name(cls: Any) -> str:
     return ""
 
 
+def get_payload_types(message_model: type[Message[Any]]) -> dict[str, type[BaseModel]]:
+    """Return a {TypeName: class} map of the discriminated union in
+    message_model.Payload. The result is empty if Payload is not a union of
+    BaseModels with Literal TypeName fields."""
+    payload_field = message_model.model_fields.get("Payload")
+    if payload_field is None or payload_field.annotation is None:
+        return {}
+    annotation = payload_field.annotation
+    candidates = get_args(annotation) if get_origin(annotation) is Union else ()
+    payload_types: dict[str, type[BaseModel]] = {}
+    for candidate in candidates:
+        if not (inspect.isclass(candidate) and issubclass(candidate, BaseModel)):
+            return {}
+        type_name = get_model_type_name(candidate)
+        if not type_name:
+            return {}
+        payload_types[type_name] = candidate
+    return payload_types
+
+
+def get_payload_type_name(message_dict: Any) -> str:
+    """Return message_dict["Payload"]["TypeName"] if it is a string, else an
+    empty string."""
+    if isinstance(message_dict, Mapping):
+        payload = message_dict.get("Payload")
+        if isinstance(payload, Mapping):
+            type_name = payload.get(TYPE_NAME_FIELD)
+            if isinstance(type_name, str):
+                return type_name
+    return ""
+
+
 def get_candidate_modules(
     module_names: str | Sequence[str],
     modules: Optional[Sequence[Any]] = None,
@@ -196,6 +563,7 @@ def pydantic_named_types(
     type_name_regex: Optional[re.Pattern[str]] = None,
 ) -> list[Any]:
     """Find Pyantic BaseModels with Literal 'TypeName' fields."""
+    start = time.perf_counter()
     named_types = []
     accumulated_types: dict[str, Any] = {}
     for module in get_candidate_modules(module_names, modules):
@@ -212,6 +580,7 @@ def pydantic_named_types(
             if type_name_regex is None or type_name_regex.match(type_name):
                 accumulated_types[type_name] = candidate_class
                 named_types.append(candidate_class)
+    MODEL_CACHE.stats.scan_seconds += time.perf_counter() - start
     return named_types
 
 
@@ -229,14 +598,7 @@ def create_message_model(
     )
     if explicit_types is not None:
         used_types.extend(explicit_types)
-    return create_model(
-        model_name,
-        __base__=Message,
-        Payload=(
-            Union[tuple(used_types)],
-            Field(..., discriminator=TYPE_NAME_FIELD),
-        ),
-    )
+    return MODEL_CACHE.get(model_name, Message, "Payload", used_types, TYPE_NAME_FIELD)
 
 
 WrappedT = TypeVar("WrappedT")
@@ -269,20 +631,14 @@ class UnionWrapper(BaseModel, Generic[WrappedT]):
         )
         if explicit_types is not None:
             used_types.extend(explicit_types)
-        if len(used_types) == 1:
-            payload_field_type = (
-                used_types[0],
-                Field(...),
-            )
-        else:
-            payload_field_type = (
-                Union[tuple(used_types)],
-                Field(..., discriminator=TYPE_NAME_FIELD),
-            )
         # Pydantic requires us to put our discriminated union in a named field.
         # We use the name 'Wrapped'.
-        return create_model(
-            model_name, __base__=UnionWrapper, Wrapped=payload_field_type
+        return MODEL_CACHE.get(
+            model_name,
+            UnionWrapper,
+            "Wrapped",
+            used_types,
+            None if len(used_types) == 1 else TYPE_NAME_FIELD,
         )
 
 
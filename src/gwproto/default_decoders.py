@@ -1,21 +1,44 @@
 # ruff: noqa: ANN401, RUF100,
 
+import functools
+from typing import Any
 
-import gwproto.named_types.cacs
-import gwproto.named_types.components
 from gwproto.decoders import CacDecoder, ComponentDecoder
 
 __all__ = [
-    "default_cac_decoder",
-    "default_component_decoder",
+    "default_cac_decoder",  # noqa: F822
+    "default_component_decoder",  # noqa: F822
+    "get_default_cac_decoder",
+    "get_default_component_decoder",
 ]
 
-default_cac_decoder = CacDecoder(
-    model_name="DefaultCacDecoder",
-    modules=[gwproto.named_types.cacs],
-)
 
-default_component_decoder = ComponentDecoder(
-    model_name="DefaultComponentDecoder",
-    modules=[gwproto.named_types.components],
-)
+# The default decoders are built on first use rather than at import time,
+# since building them imports all cacs and components and builds their
+# union models.
+@functools.cache
+def get_default_cac_decoder() -> CacDecoder:
+    import gwproto.named_types.cacs  # noqa: PLC0415
+
+    return CacDecoder(
+        model_name="DefaultCacDecoder",
+        modules=[gwproto.named_types.cacs],
+    )
+
+
+@functools.cache
+def get_default_component_decoder() -> ComponentDecoder:
+    import gwproto.named_types.components  # noqa: PLC0415
+
+    return ComponentDecoder(
+        model_name="DefaultComponentDecoder",
+        modules=[gwproto.named_types.components],
+    )
+
+
+def __getattr__(name: str) -> Any:
+    if name == "default_cac_decoder":
+        return get_default_cac_decoder()
+    if name == "default_component_decoder":
+        return get_default_component_decoder()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,155 @@
+# ruff: noqa: ANN401
+
+from typing import Any, Optional, Protocol
+
+import pydantic_core
+from pydantic import BaseModel
+
+from gwproto.message import Header, Message, trusted_payload_classes
+from gwproto.utils import LRUCache
+
+
+class JSONBackend(Protocol):
+    def dumps(self, obj: Any) -> bytes: ...
+
+    def loads(self, data: bytes | str) -> Any: ...
+
+
+class PydanticCoreJSONBackend:
+    """Default JSON backend, using the same serializer pydantic uses for
+    model_dump_json()."""
+
+    def dumps(self, obj: Any) -> bytes:  # noqa: PLR6301
+        return pydantic_core.to_json(obj)
+
+    def loads(self, data: bytes | str) -> Any:  # noqa: PLR6301
+        return pydantic_core.from_json(data)
+
+
+DEFAULT_JSON_BACKEND: JSONBackend = PydanticCoreJSONBackend()
+
+HeaderKey = tuple[str, str, str, bool, str, str]
+
+
+class EnvelopeEncoder:
+    """Encodes Messages as JSON by splicing the payload JSON into cached,
+    pre-serialized header bytes.
+
+    Serialized headers are cached per (Src, Dst, MessageType, AckRequired,
+    TypeName, Version). MessageId, which typically changes per message, is
+    serialized separately and spliced into the cached header. For model
+    payloads the output is byte-for-byte identical to
+    message.model_dump_json(). Messages whose layout the encoder does not
+    recognize (subclasses with extra fields, payloads whose class is not
+    exactly the declared Payload type, and message or payload classes with
+    custom serializers or serialization aliases) are encoded with
+    model_dump_json().
+
+    Payloads that are not BaseModels are serialized with json_backend.
+    """
+
+    HEADER_CACHE_SIZE = 256
+    MESSAGE_ID_MARKER = b'"MessageId":""'
+    MESSAGE_FIELDS = frozenset({"Header", "Payload", "TypeName"})
+    EMPTY_STRING_JSON = b'""'
+    GW_SUFFIX = b',"TypeName":"gw"}'
+
+    json_backend: JSONBackend
+    header_parts: LRUCache[HeaderKey, tuple[bytes, bytes]]
+    _spliceable: dict[tuple[type[Any], type[Any]], bool]
+
+    def __init__(
+        self,
+        *,
+        json_backend: Optional[JSONBackend] = None,
+        header_cache_size: int = HEADER_CACHE_SIZE,
+    ) -> None:
+        self.json_backend = (
+            DEFAULT_JSON_BACKEND if json_backend is None else json_backend
+        )
+        self.header_parts = LRUCache(header_cache_size)
+        self._spliceable = {}
+
+    def get_header_parts(self, header: Header) -> tuple[bytes, bytes]:
+        """Return the message JSON up to the MessageId value and from after the
+        MessageId value up to the Payload value."""
+        key = (
+            header.Src,
+            header.Dst,
+            header.MessageType,
+            header.AckRequired,
+            header.TypeName,
+            header.Version,
+        )
+        parts = self.header_parts.get(key)
+        if parts is None:
+            header_json = header.model_copy(update={"MessageId": ""}).model_dump_json()
+            before, marker, after = (
+                b'{"Header":' + header_json.encode() + b',"Payload":'
+            ).partition(self.MESSAGE_ID_MARKER)
+            parts = before + marker[:-2], after
+            self.header_parts.put(key, parts)
+        return parts
+
+    @classmethod
+    def has_custom_serialization(cls, model_class: type[BaseModel]) -> bool:
+        """Whether model_class has a model or field serializer, or a field
+        with a serialization alias."""
+        decorators = model_class.__pydantic_decorators__
+        return bool(
+            decorators.model_serializers or decorators.field_serializers
+        ) or any(
+            field.serialization_alias is not None
+            for field in model_class.model_fields.values()
+        )
+
+    @classmethod
+    def check_spliceable(
+        cls, message_class: type[Message[Any]], payload_class: type[Any]
+    ) -> bool:
+        if (
+            message_class.model_fields.keys() != cls.MESSAGE_FIELDS
+            or message_class.model_config.get("extra") == "allow"
+            or cls.has_custom_serialization(message_class)
+        ):
+            return False
+        if not issubclass(payload_class, BaseModel):
+            return True
+        if cls.has_custom_serialization(payload_class):
+            return False
+        payload_classes = trusted_payload_classes(message_class)
+        return payload_classes is None or payload_class in payload_classes
+
+    def spliceable(self, message: Message[Any]) -> bool:
+        if type(message.Header) is not Header:
+            return False
+        key = (type(message), type(message.Payload))
+        spliceable = self._spliceable.get(key)
+        if spliceable is None:
+            spliceable = self._spliceable[key] = self.check_spliceable(*key)
+        return spliceable
+
+    def encode(self, message: Message[Any]) -> bytes:
+        if not self.spliceable(message):
+            return message.model_dump_json().encode()
+        header = message.Header
+        before_message_id, after_message_id = self.get_header_parts(header)
+        payload = message.Payload
+        serializer = getattr(payload, "__pydantic_serializer__", None)
+        if serializer is not None:
+            payload_json = serializer.to_json(payload)
+        else:
+            payload_json = self.json_backend.dumps(payload)
+        return b"".join(
+            (
+                before_message_id,
+                pydantic_core.to_json(header.MessageId)
+                if header.MessageId
+                else self.EMPTY_STRING_JSON,
+                after_message_id,
+                payload_json,
+                self.GW_SUFFIX
+                if message.TypeName == "gw"
+                else b',"TypeName":' + pydantic_core.to_json(message.TypeName) + b"}",
+            )
+        )
@@ -1,5 +1,7 @@
 # ruff: noqa: ANN401
 
+import functools
+import inspect
 from collections.abc import Mapping
 from typing import (
     Any,
@@ -10,6 +12,8 @@ from typing import (
     TypeAlias,
     TypeVar,
     Union,
+    get_args,
+    get_origin,
 )
 
 from pydantic import BaseModel
@@ -55,6 +59,23 @@ def ensure_arg(arg_name: str, default_value: Any, kwargs_dict: dict[str, Any]) -
             kwargs_dict[arg_name] = default_value
 
 
+@functools.cache
+def trusted_payload_classes(
+    message_class: type[BaseModel],
+) -> Optional[tuple[type[Any], ...]]:
+    """Return the classes a payload instance may have to be placed in
+    message_class.Payload without validation, or None if any BaseModel
+    instance is acceptable."""
+    annotation = message_class.model_fields["Payload"].annotation
+    if annotation is Any or isinstance(annotation, TypeVar):
+        return None
+    if get_origin(annotation) is Union:
+        candidates = get_args(annotation)
+    else:
+        candidates = (annotation,)
+    return tuple(candidate for candidate in candidates if inspect.isclass(candidate))
+
+
 class Message(BaseModel, Generic[PayloadT]):
     Header: Header
     Payload: PayloadT
@@ -65,6 +86,62 @@ class Message(BaseModel, Generic[PayloadT]):
             header = self._header_from_kwargs(kwargs)
         super().__init__(Header=header, **kwargs)
 
+    @classmethod
+    def build(  # noqa: PLR0913
+        cls,
+        src: str,
+        dst: str,
+        payload: PayloadT | Mapping[str, Any],
+        *,
+        message_type: str = "",
+        message_id: str = "",
+        ack_required: bool = False,
+    ) -> "Message[PayloadT]":
+        """Construct a message without re-validating an already validated
+        payload.
+
+        If payload is a BaseModel instance acceptable for this class's
+        Payload field, the Header and Message are assembled with
+        model_construct(), skipping header inference and validation.
+        Otherwise this falls back to regular, validating construction. If
+        message_type or message_id are not provided, they are taken from the
+        payload's TypeName and MessageId, as in regular construction.
+        """
+        if isinstance(payload, BaseModel) and (
+            (payload_classes := trusted_payload_classes(cls)) is None
+            or isinstance(payload, payload_classes)
+        ):
+            header_type = message_type or cls._header_value_from_payload(
+                payload, PAYLOAD_TYPE_FIELDS
+            )
+            header_id = message_id or cls._header_value_from_payload(
+                payload, ["MessageId"]
+            )
+            if header_id is None:
+                header_id = ""
+            # Only header values a Header would accept as they are may skip
+            # validation. Anything else (no type at all, for example) is
+            # left to regular construction, to infer or reject.
+            if isinstance(header_type, str) and isinstance(header_id, str):
+                return cls.model_construct(
+                    Header=Header.model_construct(
+                        Src=src,
+                        Dst=dst,
+                        MessageType=header_type,
+                        MessageId=header_id,
+                        AckRequired=ack_required,
+                    ),
+                    Payload=payload,
+                )
+        return cls(
+            Src=src,
+            Dst=dst,
+            MessageType=message_type or None,
+            MessageId=message_id or None,
+            AckRequired=ack_required,
+            Payload=payload,
+        )
+
     def message_type(self) -> str:
         return self.Header.MessageType
 
@@ -78,14 +155,24 @@ class Message(BaseModel, Generic[PayloadT]):
     def type_name(cls) -> str:
         return str(Message.model_fields["TypeName"].default)
 
-    def mqtt_topic(self) -> str:
+    def mqtt_topic(self, envelope_type: str = "") -> str:
         return MQTTTopic.encode(
-            envelope_type=self.type_name(),
+            envelope_type=envelope_type or self.type_name(),
             src=self.src(),
             dst=self.dst(),
             message_type=self.message_type(),
         )
 
+    @classmethod
+    def _header_value_from_payload(cls, payload: Any, payload_fields: list[str]) -> Any:
+        val = None
+        for payload_field in payload_fields:
+            if hasattr(payload, payload_field):
+                val = getattr(payload, payload_field)
+            elif isinstance(payload, Mapping) and payload_field in payload:
+                val = payload[payload_field]
+        return val
+
     @classmethod
     def _header_from_kwargs(cls, kwargs: dict[str, Any]) -> HeaderT:
         header_kwargs = {}
@@ -100,16 +187,13 @@ class Message(BaseModel, Generic[PayloadT]):
             ]:
                 val = kwargs.get(header_field)
                 if val is None:
-                    for payload_field in payload_fields:
-                        if hasattr(payload, payload_field):
-                            val = getattr(payload, payload_field)
-                        elif isinstance(payload, Mapping) and payload_field in payload:
-                            val = payload[payload_field]
+                    val = cls._header_value_from_payload(payload, payload_fields)
                 if val is not None:
                     header_kwargs[header_field] = val
         header: Optional[Union[Header, dict[str, Any]]] = kwargs.pop("Header", None)
         if isinstance(header, Header):
-            header = header.model_copy(update=header_kwargs, deep=True)
+            # Header fields are all immutable, so a shallow copy suffices.
+            header = header.model_copy(update=header_kwargs)
         else:
             if header is not None:
                 header_kwargs = dict(header, **header_kwargs)
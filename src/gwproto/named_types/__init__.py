@@ -1,55 +1,138 @@
 """list of all the types"""
 
-from gwproto.named_types.ads111x_based_cac_gt import Ads111xBasedCacGt
-from gwproto.named_types.ads111x_based_component_gt import Ads111xBasedComponentGt
-from gwproto.named_types.ads_channel_config import AdsChannelConfig
-from gwproto.named_types.alert import Alert
-from gwproto.named_types.analog_dispatch import AnalogDispatch
-from gwproto.named_types.channel_config import ChannelConfig
-from gwproto.named_types.channel_readings import ChannelReadings
-from gwproto.named_types.component_attribute_class_gt import ComponentAttributeClassGt
-from gwproto.named_types.component_gt import ComponentGt
-from gwproto.named_types.data_channel_gt import DataChannelGt
-from gwproto.named_types.dfr_component_gt import DfrComponentGt
-from gwproto.named_types.dfr_config import DfrConfig
-from gwproto.named_types.egauge_register_config import EgaugeRegisterConfig
-from gwproto.named_types.electric_meter_cac_gt import ElectricMeterCacGt
-from gwproto.named_types.electric_meter_channel_config import ElectricMeterChannelConfig
-from gwproto.named_types.electric_meter_component_gt import ElectricMeterComponentGt
-from gwproto.named_types.fibaro_smart_implant_component_gt import (
-    FibaroSmartImplantComponentGt,
-)
-from gwproto.named_types.fsm_atomic_report import FsmAtomicReport
-from gwproto.named_types.fsm_full_report import FsmFullReport
-from gwproto.named_types.heartbeat_b import HeartbeatB
-from gwproto.named_types.hubitat_component_gt import HubitatComponentGt
-from gwproto.named_types.hubitat_poller_component_gt import HubitatPollerComponentGt
-from gwproto.named_types.hubitat_tank_component_gt import HubitatTankComponentGt
-from gwproto.named_types.i2c_multichannel_dt_relay_component_gt import (
-    I2cMultichannelDtRelayComponentGt,
-)
-from gwproto.named_types.keyparam_change_log import KeyparamChangeLog
-from gwproto.named_types.machine_states import MachineStates
-from gwproto.named_types.pico_btu_meter_component_gt import PicoBtuMeterComponentGt
-from gwproto.named_types.pico_flow_module_component_gt import PicoFlowModuleComponentGt
-from gwproto.named_types.pico_tank_module_component_gt import PicoTankModuleComponentGt
-from gwproto.named_types.power_watts import PowerWatts
-from gwproto.named_types.relay_actor_config import RelayActorConfig
-from gwproto.named_types.report import Report
-from gwproto.named_types.resistive_heater_cac_gt import ResistiveHeaterCacGt
-from gwproto.named_types.resistive_heater_component_gt import ResistiveHeaterComponentGt
-from gwproto.named_types.rest_poller_component_gt import RESTPollerComponentGt
-from gwproto.named_types.send_snap import SendSnap
-from gwproto.named_types.single_reading import SingleReading
-from gwproto.named_types.spaceheat_node_gt import SpaceheatNodeGt
-from gwproto.named_types.synced_readings import SyncedReadings
-from gwproto.named_types.synth_channel_gt import SynthChannelGt
-from gwproto.named_types.tank_module_params import TankModuleParams
-from gwproto.named_types.ticklist_hall import TicklistHall
-from gwproto.named_types.ticklist_hall_report import TicklistHallReport
-from gwproto.named_types.ticklist_reed import TicklistReed
-from gwproto.named_types.ticklist_reed_report import TicklistReedReport
-from gwproto.named_types.web_server_component_gt import WebServerComponentGt
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from gwproto.named_types.ads111x_based_cac_gt import Ads111xBasedCacGt
+    from gwproto.named_types.ads111x_based_component_gt import Ads111xBasedComponentGt
+    from gwproto.named_types.ads_channel_config import AdsChannelConfig
+    from gwproto.named_types.alert import Alert
+    from gwproto.named_types.analog_dispatch import AnalogDispatch
+    from gwproto.named_types.channel_config import ChannelConfig
+    from gwproto.named_types.channel_readings import ChannelReadings
+    from gwproto.named_types.component_attribute_class_gt import (
+        ComponentAttributeClassGt,
+    )
+    from gwproto.named_types.component_gt import ComponentGt
+    from gwproto.named_types.data_channel_gt import DataChannelGt
+    from gwproto.named_types.dfr_component_gt import DfrComponentGt
+    from gwproto.named_types.dfr_config import DfrConfig
+    from gwproto.named_types.egauge_register_config import EgaugeRegisterConfig
+    from gwproto.named_types.electric_meter_cac_gt import ElectricMeterCacGt
+    from gwproto.named_types.electric_meter_channel_config import (
+        ElectricMeterChannelConfig,
+    )
+    from gwproto.named_types.electric_meter_component_gt import ElectricMeterComponentGt
+    from gwproto.named_types.fibaro_smart_implant_component_gt import (
+        FibaroSmartImplantComponentGt,
+    )
+    from gwproto.named_types.fsm_atomic_report import FsmAtomicReport
+    from gwproto.named_types.fsm_full_report import FsmFullReport
+    from gwproto.named_types.heartbeat_b import HeartbeatB
+    from gwproto.named_types.hubitat_component_gt import HubitatComponentGt
+    from gwproto.named_types.hubitat_poller_component_gt import HubitatPollerComponentGt
+    from gwproto.named_types.hubitat_tank_component_gt import HubitatTankComponentGt
+    from gwproto.named_types.i2c_multichannel_dt_relay_component_gt import (
+        I2cMultichannelDtRelayComponentGt,
+    )
+    from gwproto.named_types.keyparam_change_log import KeyparamChangeLog
+    from gwproto.named_types.machine_states import MachineStates
+    from gwproto.named_types.pico_btu_meter_component_gt import PicoBtuMeterComponentGt
+    from gwproto.named_types.pico_flow_module_component_gt import (
+        PicoFlowModuleComponentGt,
+    )
+    from gwproto.named_types.pico_tank_module_component_gt import (
+        PicoTankModuleComponentGt,
+    )
+    from gwproto.named_types.power_watts import PowerWatts
+    from gwproto.named_types.relay_actor_config import RelayActorConfig
+    from gwproto.named_types.report import Report
+    from gwproto.named_types.resistive_heater_cac_gt import ResistiveHeaterCacGt
+    from gwproto.named_types.resistive_heater_component_gt import (
+        ResistiveHeaterComponentGt,
+    )
+    from gwproto.named_types.rest_poller_component_gt import RESTPollerComponentGt
+    from gwproto.named_types.send_snap import SendSnap
+    from gwproto.named_types.single_reading import SingleReading
+    from gwproto.named_types.spaceheat_node_gt import SpaceheatNodeGt
+    from gwproto.named_types.synced_readings import SyncedReadings
+    from gwproto.named_types.synth_channel_gt import SynthChannelGt
+    from gwproto.named_types.tank_module_params import TankModuleParams
+    from gwproto.named_types.ticklist_hall import TicklistHall
+    from gwproto.named_types.ticklist_hall_report import TicklistHallReport
+    from gwproto.named_types.ticklist_reed import TicklistReed
+    from gwproto.named_types.ticklist_reed_report import TicklistReedReport
+    from gwproto.named_types.web_server_component_gt import WebServerComponentGt
+
+# Named types are imported on first access, so that code which only needs
+# a few of them (or none, e.g. users of gwproto.MQTTTopic) does not pay for
+# building every pydantic schema at import time.
+_LAZY_IMPORTS: dict[str, str] = {
+    "Ads111xBasedCacGt": "ads111x_based_cac_gt",
+    "Ads111xBasedComponentGt": "ads111x_based_component_gt",
+    "AdsChannelConfig": "ads_channel_config",
+    "Alert": "alert",
+    "AnalogDispatch": "analog_dispatch",
+    "ChannelConfig": "channel_config",
+    "ChannelReadings": "channel_readings",
+    "ComponentAttributeClassGt": "component_attribute_class_gt",
+    "ComponentGt": "component_gt",
+    "DataChannelGt": "data_channel_gt",
+    "DfrComponentGt": "dfr_component_gt",
+    "DfrConfig": "dfr_config",
+    "EgaugeRegisterConfig": "egauge_register_config",
+    "ElectricMeterCacGt": "electric_meter_cac_gt",
+    "ElectricMeterChannelConfig": "electric_meter_channel_config",
+    "ElectricMeterComponentGt": "electric_meter_component_gt",
+    "FibaroSmartImplantComponentGt": "fibaro_smart_implant_component_gt",
+    "FsmAtomicReport": "fsm_atomic_report",
+    "FsmFullReport": "fsm_full_report",
+    "HeartbeatB": "heartbeat_b",
+    "HubitatComponentGt": "hubitat_component_gt",
+    "HubitatPollerComponentGt": "hubitat_poller_component_gt",
+    "HubitatTankComponentGt": "hubitat_tank_component_gt",
+    "I2cMultichannelDtRelayComponentGt": "i2c_multichannel_dt_relay_component_gt",
+    "KeyparamChangeLog": "keyparam_change_log",
+    "MachineStates": "machine_states",
+    "PicoBtuMeterComponentGt": "pico_btu_meter_component_gt",
+    "PicoFlowModuleComponentGt": "pico_flow_module_component_gt",
+    "PicoTankModuleComponentGt": "pico_tank_module_component_gt",
+    "PowerWatts": "power_watts",
+    "RelayActorConfig": "relay_actor_config",
+    "Report": "report",
+    "ResistiveHeaterCacGt": "resistive_heater_cac_gt",
+    "ResistiveHeaterComponentGt": "resistive_heater_component_gt",
+    "RESTPollerComponentGt": "rest_poller_component_gt",
+    "SendSnap": "send_snap",
+    "SingleReading": "single_reading",
+    "SpaceheatNodeGt": "spaceheat_node_gt",
+    "SyncedReadings": "synced_readings",
+    "SynthChannelGt": "synth_channel_gt",
+    "TankModuleParams": "tank_module_params",
+    "TicklistHall": "ticklist_hall",
+    "TicklistHallReport": "ticklist_hall_report",
+    "TicklistReed": "ticklist_reed",
+    "TicklistReedReport": "ticklist_reed_report",
+    "WebServerComponentGt": "web_server_component_gt",
+    "cacs": "cacs",
+    "components": "components",
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = module if module_name == name else getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     "Ads111xBasedCacGt",
@@ -98,6 +181,6 @@ __all__ = [
     "TicklistReed",
     "TicklistReedReport",
     "WebServerComponentGt",
-    "cacs",  # noqa: F822
-    "components",  # noqa: F822
+    "cacs",
+    "components",
 ]
@@ -31,5 +31,10 @@ class ChannelReadings(BaseModel):
         Axiom 1: ListLengthConsistency.
         ValueList and ScadaReadTimeUnixMsList must have the same length.
         """
-        # Implement check for axiom 1"
+        if len(self.ValueList) != len(self.ScadaReadTimeUnixMsList):
+            raise ValueError(
+                "Axiom 1 violated! ValueList and ScadaReadTimeUnixMsList must have "
+                f"the same length. Got {len(self.ValueList)} and "
+                f"{len(self.ScadaReadTimeUnixMsList)}"
+            )
         return self
@@ -1,13 +1,15 @@
 """Type fsm.full.report, version 000"""
 
-from typing import Literal
+from typing import Any, Literal
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, model_validator
 
 from gwproto.named_types.fsm_atomic_report import FsmAtomicReport
 from gwproto.property_format import (
     SpaceheatName,
     UUID4Str,
+    is_uuid4_str,
+    is_uuid4_str_list,
 )
 
 
@@ -19,3 +21,32 @@ class FsmFullReport(BaseModel):
     Version: str = "000"
 
     model_config = ConfigDict(extra="allow", use_enum_values=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _check_atomic_trigger_ids(cls, data: Any) -> Any:  # noqa: ANN401
+        """Check the TriggerId of every AtomicList item with one match over
+        them all. If that fails, each is checked on its own and the error
+        names the first bad item."""
+        if not isinstance(data, dict):
+            return data
+        atomic_list = data.get("AtomicList")
+        if not isinstance(atomic_list, list):
+            return data
+        # Items that are already FsmAtomicReports, and missing ids or ids of
+        # other types, are left to FsmAtomicReport validation.
+        trigger_ids = {
+            i: item["TriggerId"]
+            for i, item in enumerate(atomic_list)
+            if isinstance(item, dict) and isinstance(item.get("TriggerId"), str)
+        }
+        try:
+            is_uuid4_str_list(list(trigger_ids.values()))
+        except ValueError:
+            for i, trigger_id in trigger_ids.items():
+                try:
+                    is_uuid4_str(trigger_id)
+                except ValueError as e:  # noqa: PERF203
+                    raise ValueError(f"AtomicList[{i}].TriggerId: {e}") from e
+            raise
+        return data
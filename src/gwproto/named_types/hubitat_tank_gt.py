@@ -1,4 +1,3 @@
-import copy
 import re
 from functools import cached_property
 from typing import Annotated, Optional
@@ -119,12 +118,9 @@ class FibaroTempSensorSettings(FibaroTempSensorSettingsGt):
         self,
         hubitat: HubitatRESTResolutionSettings,
     ) -> None:
-        # Constuct url config on top of maker api url url config
-        constructed_config = copy.deepcopy(hubitat.maker_api_url_config)
-        constructed_config.url_path_format += "/devices/{device_id}/refresh"
-        if constructed_config.url_path_args is None:
-            constructed_config.url_path_args = {}
-        constructed_config.url_path_args["device_id"] = self.device_id
+        # Constuct url config on top of maker api url url config. Building it
+        # afresh is much cheaper than deep copying hubitat's.
+        constructed_config = hubitat.component_gt.refresh_url_config(self.device_id)
 
         if self.rest is None:
             # Since no "inline" rest configuration is present, use constructed url config
@@ -154,7 +150,7 @@ class FibaroTempSensorSettings(FibaroTempSensorSettingsGt):
                     existing_config.url_path_args = constructed_config.url_path_args
                 else:
                     existing_config.url_path_args = dict(
-                        constructed_config.url_path_args,
+                        constructed_config.url_path_args or {},
                         **existing_config.url_path_args,
                     )
         self.rest.clear_property_cache()
@@ -7,7 +7,7 @@ from functools import cached_property
 from typing import Any, Literal, Optional, Self
 
 import yarl
-from pydantic import BaseModel, ConfigDict, HttpUrl, model_validator
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, model_validator
 
 from gwproto.utils import snake_to_camel
 
@@ -159,8 +159,8 @@ class ErrorResponse(BaseModel):
 
 
 class ErrorResponses(BaseModel):
-    request: ErrorResponse = ErrorResponse()
-    convert: ErrorResponse = ErrorResponse()
+    request: ErrorResponse = Field(default_factory=ErrorResponse)
+    convert: ErrorResponse = Field(default_factory=ErrorResponse)
     model_config = ConfigDict(
         extra="allow", alias_generator=snake_to_camel, populate_by_name=True
     )
@@ -170,10 +170,10 @@ DEFAULT_REST_POLL_PERIOD_SECONDS = 60.0
 
 
 class RESTPollerSettings(BaseModel):
-    session: SessionArgs = SessionArgs()
-    request: RequestArgs = RequestArgs()
+    session: SessionArgs = Field(default_factory=SessionArgs)
+    request: RequestArgs = Field(default_factory=RequestArgs)
     poll_period_seconds: float = DEFAULT_REST_POLL_PERIOD_SECONDS
-    errors: ErrorResponses = ErrorResponses()
+    errors: ErrorResponses = Field(default_factory=ErrorResponses)
     model_config = ConfigDict(
         extra="allow",
         alias_generator=snake_to_camel,
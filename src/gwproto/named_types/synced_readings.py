@@ -6,13 +6,13 @@ from pydantic import BaseModel, ConfigDict, StrictInt, model_validator
 from typing_extensions import Self
 
 from gwproto.property_format import (
-    SpaceheatName,
+    SpaceheatNameList,
     UTCMilliseconds,
 )
 
 
 class SyncedReadings(BaseModel):
-    ChannelNameList: list[SpaceheatName]
+    ChannelNameList: SpaceheatNameList
     ValueList: list[StrictInt]
     ScadaReadTimeUnixMs: UTCMilliseconds
     TypeName: Literal["synced.readings"] = "synced.readings"
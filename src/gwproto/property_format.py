@@ -1,15 +1,88 @@
 # ruff: noqa: ANN401
+import functools
 import re
+import sys
 import uuid
+from collections.abc import Callable, Iterable, Mapping
 from datetime import datetime, timezone
-from typing import Annotated
+from typing import Annotated, Any, Optional
 
 from gw.enums import MarketTypeName
 from pydantic import BeforeValidator, Field
 
+from gwproto.utils import LRUCache
+
 UTC_2000_01_01_TIMESTAMP = datetime(2000, 1, 1, tzinfo=timezone.utc).timestamp()
 UTC_3000_01_01_TIMESTAMP = datetime(3000, 1, 1, tzinfo=timezone.utc).timestamp()
 
+# Fast paths for name validators. Every string these match passes the
+# word-by-word checks in the corresponding is_* function. Strings they do
+# not match (including non-ASCII names, which str.isalnum() may accept) fall
+# through to those checks, which also produce the error messages.
+HANDLE_NAME_PATTERN = r"[a-z][a-z0-9.\-]*"
+LEFT_RIGHT_DOT_PATTERN = r"[a-z][a-z0-9]*(?:\.[a-z0-9]+)*"
+SPACEHEAT_NAME_PATTERN = r"[a-z][a-z0-9]*(?:-[a-z0-9]+)*"
+HANDLE_NAME_REGEX = re.compile(HANDLE_NAME_PATTERN)
+LEFT_RIGHT_DOT_REGEX = re.compile(LEFT_RIGHT_DOT_PATTERN)
+SPACEHEAT_NAME_REGEX = re.compile(SPACEHEAT_NAME_PATTERN)
+# Match a whole list of names, joined by newlines, in one pass.
+SPACEHEAT_NAME_LIST_REGEX = re.compile(
+    rf"{SPACEHEAT_NAME_PATTERN}(?:\n{SPACEHEAT_NAME_PATTERN})*"
+)
+# Canonical (lowercase, hyphenated) version 4, RFC 4122 variant UUID, which
+# is exactly what is_uuid4_str returns for valid input.
+UUID4_PATTERN = r"[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}"
+UUID4_REGEX = re.compile(UUID4_PATTERN)
+UUID4_LIST_REGEX = re.compile(rf"{UUID4_PATTERN}(?:\n{UUID4_PATTERN})*")
+
+
+class ValidatedStringCache:
+    """Opt-in memo of strings that passed name-format validation.
+
+    Disabled by default. Once enabled with enable(), the validators decorated
+    with @memoized_validator remember up to maxsize (validator, string) pairs
+    that passed. A repeat costs one cache lookup. Remembered strings are
+    interned, so every decoded copy of a given channel name, alias or handle
+    is the same object.
+    """
+
+    DEFAULT_MAXSIZE = 4096
+
+    strings: Optional[LRUCache[tuple[str, str], str]] = None
+
+    def enable(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.strings = LRUCache(maxsize)
+
+    def disable(self) -> None:
+        self.strings = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.strings is not None
+
+
+VALIDATED_STRINGS = ValidatedStringCache()
+
+
+def memoized_validator(validator: Callable[[str], str]) -> Callable[[str], str]:
+    """Serve validator's results from VALIDATED_STRINGS when it is enabled.
+    Only successful validations of str values are remembered."""
+    name = validator.__name__
+
+    @functools.wraps(validator)
+    def validate(v: str) -> str:
+        strings = VALIDATED_STRINGS.strings
+        if strings is None or type(v) is not str:
+            return validator(v)
+        key = (name, v)
+        validated = strings.get(key)
+        if validated is None:
+            validated = sys.intern(validator(v))
+            strings.put(key, validated)
+        return validated
+
+    return validate
+
 
 def check_is_log_style_date_with_millis(v: str) -> None:
     """Checks LogStyleDateWithMillis format
@@ -38,11 +111,14 @@ def check_is_log_style_date_with_millis(v: str) -> None:
         )
 
 
+@memoized_validator
 def is_handle_name(v: str) -> str:
     """
     HandleName format: words separated by periods, where the worlds are lowercase
     alphanumeric plus hyphens
     """
+    if isinstance(v, str) and HANDLE_NAME_REGEX.fullmatch(v):
+        return v
     try:
         x = v.split(".")
     except Exception as e:
@@ -90,6 +166,7 @@ def is_int(v: int) -> int:
     return v
 
 
+@memoized_validator
 def is_left_right_dot(candidate: str) -> str:
     """Lowercase AlphanumericStrings separated by dots (i.e. periods), with most
     significant word to the left.  I.e. `d1.ne` is the child of `d1`.
@@ -101,6 +178,8 @@ def is_left_right_dot(candidate: str) -> str:
     Raises:
         ValueError: if candidate is not of lrd format (e.g. d1.iso.me.apple)
     """
+    if isinstance(candidate, str) and LEFT_RIGHT_DOT_REGEX.fullmatch(candidate):
+        return candidate
     try:
         x: list[str] = candidate.split(".")
     except Exception as e:
@@ -128,10 +207,13 @@ def has_mac_address_format(mac_str: str) -> bool:
     return bool(MAC_REGEX.match(mac_str.lower()))
 
 
+@memoized_validator
 def is_spaceheat_name(v: str) -> str:
     """
     SpaceheatName format: Lowercase alphanumeric words separated by hypens
     """
+    if isinstance(v, str) and SPACEHEAT_NAME_REGEX.fullmatch(v):
+        return v
     try:
         x = v.split("-")
     except Exception as e:
@@ -156,7 +238,47 @@ def is_spaceheat_name(v: str) -> str:
     return v
 
 
+def _joined_fullmatch(v: list[Any], list_regex: re.Pattern[str]) -> bool:
+    """Whether v is a list of strings which list_regex matches when joined
+    by newlines. An item containing a newline would be taken for two items,
+    so v does not match if any does."""
+    if not v:
+        return True
+    try:
+        joined = "\n".join(v)
+    except TypeError:
+        return False
+    return joined.count("\n") == len(v) - 1 and list_regex.fullmatch(joined) is not None
+
+
+def check_name_list(
+    v: Any, list_regex: re.Pattern[str], check_name: Callable[[str], str]
+) -> Any:
+    """Validate every name in v with one match of list_regex against the
+    names joined by newlines. If that fails, check_name is run on each name,
+    raising the same error a per-item validator would.
+
+    Input that cannot be a list is returned unchanged so that pydantic
+    reports the usual list type error."""
+    if isinstance(v, (str, bytes, Mapping)) or not isinstance(v, Iterable):
+        return v
+    if not isinstance(v, list):
+        v = list(v)
+    if not _joined_fullmatch(v, list_regex):
+        for name in v:
+            check_name(name)
+    return v
+
+
+def is_spaceheat_name_list(v: Any) -> Any:
+    return check_name_list(v, SPACEHEAT_NAME_LIST_REGEX, is_spaceheat_name)
+
+
 def is_uuid4_str(v: str) -> str:
+    # Canonical input is returned as is; anything else is parsed by uuid.UUID,
+    # which accepts other spellings and returns the canonical form.
+    if isinstance(v, str) and UUID4_REGEX.fullmatch(v):
+        return v
     v = str(v)
     try:
         u = uuid.UUID(v)
@@ -167,6 +289,18 @@ def is_uuid4_str(v: str) -> str:
     return str(u)
 
 
+def is_uuid4_str_list(v: Any) -> Any:
+    """Bulk version of is_uuid4_str: one regex match over the newline-joined
+    values when they are all canonical, otherwise is_uuid4_str per item."""
+    if isinstance(v, (str, bytes, Mapping)) or not isinstance(v, Iterable):
+        return v
+    if not isinstance(v, list):
+        v = list(v)
+    if _joined_fullmatch(v, UUID4_LIST_REGEX):
+        return v
+    return [is_uuid4_str(item) for item in v]
+
+
 def is_world_instance_name_format(candidate: str) -> bool:
     try:
         words = candidate.split("__")
@@ -215,6 +349,7 @@ def is_bit(candidate: int) -> int:
     return candidate
 
 
+@memoized_validator
 def is_market_name(v: str) -> str:
     try:
         x = v.split(".")
@@ -288,6 +423,7 @@ LeftRightDotStr = Annotated[str, BeforeValidator(is_left_right_dot)]
 MarketName = Annotated[str, BeforeValidator(is_market_name)]
 MarketSlotName = Annotated[str, BeforeValidator(is_market_slot_name)]
 SpaceheatName = Annotated[str, BeforeValidator(is_spaceheat_name)]
+SpaceheatNameList = Annotated[list[str], BeforeValidator(is_spaceheat_name_list)]
 UUID4Str = Annotated[str, BeforeValidator(is_uuid4_str)]
 UTCSeconds = Annotated[
     int, Field(ge=UTC_2000_01_01_TIMESTAMP, le=UTC_3000_01_01_TIMESTAMP)
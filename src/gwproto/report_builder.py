@@ -0,0 +1,244 @@
+"""Incremental construction of Reports.
+
+ReportBuilder collects readings, machine states and FSM reports as they
+arrive over a slot. It appends them to per-channel array('q') buffers, so
+the cost of building a Report is spread across the slot instead of paid in
+one validation pass at its end. Values are checked on the way in (or not at
+all when they arrive as already-validated models), and build() assembles
+the Report without validating them again. Reading values must fit the
+64-bit buffers.
+"""
+
+import time
+import uuid
+from array import array
+from typing import Optional
+
+from gwproto.columnar import MAX_UTC_MILLISECONDS, MIN_UTC_MILLISECONDS
+from gwproto.named_types import (
+    ChannelReadings,
+    FsmFullReport,
+    MachineStates,
+    Report,
+    SingleReading,
+    SyncedReadings,
+)
+from gwproto.property_format import (
+    UTC_2000_01_01_TIMESTAMP,
+    UTC_3000_01_01_TIMESTAMP,
+    is_handle_name,
+    is_left_right_dot,
+    is_spaceheat_name,
+    is_uuid4_str,
+)
+
+
+def _check_utc_ms(unix_ms: int) -> None:
+    if (
+        type(unix_ms) is not int
+        or not MIN_UTC_MILLISECONDS <= unix_ms <= MAX_UTC_MILLISECONDS
+    ):
+        raise ValueError(f"<{unix_ms}> is not UTCMilliseconds")
+
+
+MIN_VALUE = -(2**63)
+MAX_VALUE = 2**63 - 1
+
+
+def _check_value(value: int) -> None:
+    if not MIN_VALUE <= value <= MAX_VALUE:
+        raise ValueError(f"Value must fit in 64 bits. Got {value}")
+
+
+class _ChannelBuffer:
+    __slots__ = ("times", "values")
+
+    def __init__(self) -> None:
+        self.values: array[int] = array("q")
+        self.times: array[int] = array("q")
+
+
+class _MachineStateBuffer:
+    __slots__ = ("states", "times")
+
+    def __init__(self) -> None:
+        self.states: list[str] = []
+        self.times: array[int] = array("q")
+
+
+class ReportBuilder:
+    """Accumulates the contents of one Report slot.
+
+    Typical use::
+
+        builder = ReportBuilder(from_alias, instance_id, about_alias,
+                                slot_start_unix_s, 300)
+        builder.add_single_reading(reading)   # as readings arrive
+        ...
+        report = builder.build()
+        builder.start_slot(slot_start_unix_s + 300)
+
+    The builder is not thread safe.
+    """
+
+    from_g_node_alias: str
+    from_g_node_instance_id: str
+    about_g_node_alias: str
+    slot_start_unix_s: int
+    slot_duration_s: int
+    _channels: dict[str, _ChannelBuffer]
+    _machine_states: dict[tuple[str, str], _MachineStateBuffer]
+    _fsm_reports: list[FsmFullReport]
+
+    def __init__(  # noqa: PLR0913
+        self,
+        from_g_node_alias: str,
+        from_g_node_instance_id: str,
+        about_g_node_alias: str,
+        slot_start_unix_s: int,
+        slot_duration_s: int,
+        *,
+        channel_names: tuple[str, ...] = (),
+    ) -> None:
+        """channel_names pre-creates buffers, fixing the order of channels in
+        built reports. Channels not listed are added as they first appear."""
+        self.from_g_node_alias = is_left_right_dot(from_g_node_alias)
+        self.from_g_node_instance_id = is_uuid4_str(from_g_node_instance_id)
+        self.about_g_node_alias = is_left_right_dot(about_g_node_alias)
+        if type(slot_duration_s) is not int or slot_duration_s <= 0:
+            raise ValueError(
+                f"SlotDurationS must be a positive integer. Got {slot_duration_s}"
+            )
+        self.slot_duration_s = slot_duration_s
+        self._channels = {}
+        for channel_name in channel_names:
+            self._channel(channel_name)
+        self._machine_states = {}
+        self._fsm_reports = []
+        self.start_slot(slot_start_unix_s)
+
+    def start_slot(self, slot_start_unix_s: int) -> None:
+        """Drop accumulated data and start collecting for a new slot. Channel
+        buffers are kept, so channels keep their order across slots."""
+        if type(slot_start_unix_s) is not int or not (
+            UTC_2000_01_01_TIMESTAMP <= slot_start_unix_s <= UTC_3000_01_01_TIMESTAMP
+        ):
+            raise ValueError(f"<{slot_start_unix_s}> is not UTCSeconds")
+        self.slot_start_unix_s = slot_start_unix_s
+        for buffer in self._channels.values():
+            del buffer.values[:]
+            del buffer.times[:]
+        self._machine_states.clear()
+        self._fsm_reports.clear()
+
+    def _channel(self, channel_name: str) -> _ChannelBuffer:
+        buffer = self._channels.get(channel_name)
+        if buffer is None:
+            buffer = self._channels[is_spaceheat_name(channel_name)] = _ChannelBuffer()
+        return buffer
+
+    def add_reading(self, channel_name: str, value: int, read_time_ms: int) -> None:
+        """Add one reading given as raw values, which are checked against the
+        ChannelReadings field types."""
+        if type(value) is not int:
+            raise ValueError(f"Value must be an integer. Got {value!r}")
+        _check_value(value)
+        _check_utc_ms(read_time_ms)
+        buffer = self._channel(channel_name)
+        buffer.values.append(value)
+        buffer.times.append(read_time_ms)
+
+    def add_single_reading(self, reading: SingleReading) -> None:
+        _check_value(reading.Value)
+        buffer = self._channels.get(reading.ChannelName)
+        if buffer is None:
+            buffer = self._channel(reading.ChannelName)
+        buffer.values.append(reading.Value)
+        buffer.times.append(reading.ScadaReadTimeUnixMs)
+
+    def add_synced_readings(self, readings: SyncedReadings) -> None:
+        if len(readings.ChannelNameList) != len(readings.ValueList):
+            raise ValueError(
+                "ChannelNameList and ValueList must have the same length. Got "
+                f"{len(readings.ChannelNameList)} and {len(readings.ValueList)}"
+            )
+        if readings.ValueList:
+            # Check every value first, so that no reading is added if any is
+            # out of range.
+            _check_value(min(readings.ValueList))
+            _check_value(max(readings.ValueList))
+        read_time_ms = readings.ScadaReadTimeUnixMs
+        for channel_name, value in zip(
+            readings.ChannelNameList, readings.ValueList, strict=True
+        ):
+            buffer = self._channel(channel_name)
+            buffer.values.append(value)
+            buffer.times.append(read_time_ms)
+
+    def add_machine_state(
+        self, machine_handle: str, state_enum: str, state: str, unix_ms: int
+    ) -> None:
+        """Record that machine_handle entered state (a value of state_enum) at
+        unix_ms."""
+        key = (machine_handle, state_enum)
+        buffer = self._machine_states.get(key)
+        if buffer is None:
+            is_handle_name(machine_handle)
+            is_left_right_dot(state_enum)
+            buffer = self._machine_states[key] = _MachineStateBuffer()
+        if not isinstance(state, str):
+            raise ValueError(f"State must be a string. Got {state!r}")  # noqa: TRY004
+        _check_utc_ms(unix_ms)
+        buffer.states.append(state)
+        buffer.times.append(unix_ms)
+
+    def add_fsm_report(self, report: FsmFullReport) -> None:
+        self._fsm_reports.append(report)
+
+    def __len__(self) -> int:
+        """The number of channel readings accumulated in this slot."""
+        return sum(len(buffer.values) for buffer in self._channels.values())
+
+    def build(
+        self,
+        *,
+        message_created_ms: Optional[int] = None,
+        report_id: Optional[str] = None,
+    ) -> Report:
+        """Return a Report of everything accumulated in the current slot.
+        Channels without readings in this slot are omitted. Data is not
+        validated again; only message_created_ms and report_id, if given,
+        are checked."""
+        if message_created_ms is None:
+            message_created_ms = int(time.time() * 1000)
+        else:
+            _check_utc_ms(message_created_ms)
+        report_id = str(uuid.uuid4()) if report_id is None else is_uuid4_str(report_id)
+        return Report.model_construct(
+            FromGNodeAlias=self.from_g_node_alias,
+            FromGNodeInstanceId=self.from_g_node_instance_id,
+            AboutGNodeAlias=self.about_g_node_alias,
+            SlotStartUnixS=self.slot_start_unix_s,
+            SlotDurationS=self.slot_duration_s,
+            ChannelReadingList=[
+                ChannelReadings.model_construct(
+                    ChannelName=channel_name,
+                    ValueList=buffer.values.tolist(),
+                    ScadaReadTimeUnixMsList=buffer.times.tolist(),
+                )
+                for channel_name, buffer in self._channels.items()
+                if buffer.values
+            ],
+            StateList=[
+                MachineStates.model_construct(
+                    MachineHandle=machine_handle,
+                    StateEnum=state_enum,
+                    StateList=list(buffer.states),
+                    UnixMsList=buffer.times.tolist(),
+                )
+                for (machine_handle, state_enum), buffer in self._machine_states.items()
+            ],
+            FsmReportList=list(self._fsm_reports),
+            MessageCreatedMs=message_created_ms,
+            Id=report_id,
+        )
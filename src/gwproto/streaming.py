@@ -0,0 +1,194 @@
+"""Incremental decoding of large Report payloads.
+
+A backlogged ReportEvent can carry thousands of readings for each of many
+channels. Decoding it as a whole builds every ChannelReadings (and every
+boxed int in them) before the caller sees any of it. The functions here
+find ChannelReadingList in the raw JSON bytes with a small structural
+scanner, and validate its items one at a time, so only one channel's
+readings are materialized at once.
+"""
+
+import json
+import re
+from collections.abc import Container, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from gwproto.message import Message
+from gwproto.named_types.channel_readings import ChannelReadings
+
+WHITESPACE = re.compile(rb"[ \t\n\r]*")
+STRING = re.compile(rb'"(?:[^"\\]|\\.)*"', re.DOTALL)
+STRUCTURAL = re.compile(rb'["\[\]{}]')
+SCALAR = re.compile(rb"[^ \t\n\r,\]}]+")
+QUOTE, COMMA, COLON = ord('"'), ord(","), ord(":")
+OPEN_OBJECT, CLOSE_OBJECT = ord("{"), ord("}")
+OPEN_ARRAY, CLOSE_ARRAY = ord("["), ord("]")
+CLOSERS = {OPEN_OBJECT: CLOSE_OBJECT, OPEN_ARRAY: CLOSE_ARRAY}
+
+
+class _ScanError(ValueError):
+    pass
+
+
+def _skip_whitespace(data: bytes, pos: int) -> int:
+    return WHITESPACE.match(data, pos).end()  # type: ignore[union-attr]
+
+
+def _string_end(data: bytes, pos: int) -> int:
+    match = STRING.match(data, pos)
+    if match is None:
+        raise _ScanError(f"Unterminated string at {pos}")
+    return match.end()
+
+
+def _value_end(data: bytes, pos: int) -> int:
+    """Return the offset just past the JSON value starting at pos, without
+    parsing it."""
+    first = data[pos]
+    if first == QUOTE:
+        return _string_end(data, pos)
+    if first not in CLOSERS:
+        match = SCALAR.match(data, pos)
+        if match is None:
+            raise _ScanError(f"Expected a value at {pos}")
+        return match.end()
+    # The closing bracket expected for each open object or array.
+    closers: list[int] = []
+    while True:
+        match = STRUCTURAL.search(data, pos)
+        if match is None:
+            raise _ScanError("Unbalanced brackets")
+        pos = match.start()
+        char = data[pos]
+        if char == QUOTE:
+            pos = _string_end(data, pos)
+            continue
+        pos += 1
+        if char in CLOSERS:
+            closers.append(CLOSERS[char])
+        elif char != closers.pop():
+            raise _ScanError(f"Mismatched bracket at {pos - 1}")
+        elif not closers:
+            return pos
+
+
+def _object_member(
+    data: bytes, pos: int, keys: Container[str]
+) -> Optional[tuple[str, int]]:
+    """data[pos] is '{'. Return the first of keys found in that object and
+    the offset of its value, or None if it has none of them. The matched
+    value itself is not scanned."""
+    pos = _skip_whitespace(data, pos + 1)
+    if data[pos] == CLOSE_OBJECT:
+        return None
+    while True:
+        key_end = _string_end(data, pos)
+        name = json.loads(data[pos:key_end])
+        pos = _skip_whitespace(data, key_end)
+        if data[pos] != COLON:
+            raise _ScanError(f"Expected ':' at {pos}")
+        pos = _skip_whitespace(data, pos + 1)
+        if name in keys:
+            return name, pos
+        pos = _skip_whitespace(data, _value_end(data, pos))
+        if data[pos] == CLOSE_OBJECT:
+            return None
+        if data[pos] != COMMA:
+            raise _ScanError(f"Expected ',' or '}}' at {pos}")
+        pos = _skip_whitespace(data, pos + 1)
+
+
+def _find_value_start(data: bytes, path: Sequence[str]) -> Optional[int]:
+    start = _skip_whitespace(data, 0)
+    for key in path:
+        if data[start] != OPEN_OBJECT:
+            return None
+        member = _object_member(data, start, (key,))
+        if member is None:
+            return None
+        start = member[1]
+    return start
+
+
+def find_json_value(data: bytes, path: Sequence[str]) -> Optional[tuple[int, int]]:
+    """Return the (start, end) offsets of the value at path (a sequence of
+    object keys) in the JSON document data, or None if there is no such
+    value or data is not well formed enough to tell. Only the objects along
+    path are scanned; nothing is parsed into Python objects."""
+    try:
+        start = _find_value_start(data, path)
+        if start is None:
+            return None
+        return start, _value_end(data, start)
+    except (IndexError, ValueError):
+        return None
+
+
+def json_array_items(data: bytes, start: int) -> tuple[list[tuple[int, int]], int]:
+    """Return the (start, end) offsets of each item of the JSON array
+    starting at data[start], and the offset just past the array. Raises
+    ValueError if the array is malformed."""
+    if data[start] != OPEN_ARRAY:
+        raise ValueError(f"Expected a JSON array at {start}")
+    items: list[tuple[int, int]] = []
+    pos = _skip_whitespace(data, start + 1)
+    if data[pos] == CLOSE_ARRAY:
+        return items, pos + 1
+    while True:
+        item_end = _value_end(data, pos)
+        items.append((pos, item_end))
+        pos = _skip_whitespace(data, item_end)
+        if data[pos] == CLOSE_ARRAY:
+            return items, pos + 1
+        if data[pos] != COMMA:
+            raise _ScanError(f"Expected ',' or ']' at {pos}")
+        pos = _skip_whitespace(data, pos + 1)
+
+
+def find_channel_reading_list(
+    data: bytes,
+) -> Optional[tuple[int, int, list[tuple[int, int]]]]:
+    """Locate the ChannelReadingList of a Report or ReportEvent message in
+    its JSON bytes. Return the list's (start, end) offsets and the offsets
+    of its items, or None if data is not such a message."""
+    try:
+        start = _find_value_start(data, ("Payload",))
+        if start is None or data[start] != OPEN_OBJECT:
+            return None
+        member = _object_member(data, start, ("ChannelReadingList", "Report"))
+        if member is not None and member[0] == "Report":
+            if data[member[1]] != OPEN_OBJECT:
+                return None
+            member = _object_member(data, member[1], ("ChannelReadingList",))
+        if member is None:
+            return None
+        start = member[1]
+        items, end = json_array_items(data, start)
+    except (IndexError, ValueError):
+        return None
+    return start, end, items
+
+
+def iter_channel_readings(
+    data: bytes, items: Iterable[tuple[int, int]]
+) -> Iterator[ChannelReadings]:
+    """Validate and yield the ChannelReadings at each (start, end) span of
+    data, one at a time."""
+    for start, end in items:
+        yield ChannelReadings.model_validate_json(data[start:end])
+
+
+@dataclass
+class StreamedReport:
+    """A message decoded by MQTTCodec.decode_streaming().
+
+    message is validated with an empty ChannelReadingList; the readings
+    themselves are produced by channel_readings, validated one channel at a
+    time as it is iterated. Validation errors in a channel are raised when
+    that channel is reached."""
+
+    message: Message[Any]
+    channel_readings: Iterator[ChannelReadings] = field(
+        default_factory=lambda: iter(())
+    )
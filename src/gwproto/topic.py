@@ -1,8 +1,12 @@
 import dataclasses
+import sys
 from dataclasses import dataclass
+from typing import ClassVar, Generic, TypeVar
 
+from gwproto.utils import LRUCache
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class DecodedMQTTTopic:
     envelope_type: str = ""
     src: str = ""
@@ -70,6 +74,11 @@ class MQTTTopic:
 
     DOT = "."
     DOT_REPLACEMENT = "-"
+    DECODE_CACHE_SIZE = 256
+
+    decode_cache: ClassVar[LRUCache[str, DecodedMQTTTopic]] = LRUCache(
+        DECODE_CACHE_SIZE
+    )
 
     @classmethod
     def encode(cls, envelope_type: str, src: str, dst: str, message_type: str) -> str:
@@ -132,3 +141,182 @@ class MQTTTopic:
             message_type=message_type,
             remainder=remainder,
         )
+
+    @classmethod
+    def decode_cached(cls, topic: str) -> DecodedMQTTTopic:
+        """Like decode(), but memoized in decode_cache, keyed by the raw topic.
+
+        Repeated topics return the same DecodedMQTTTopic instance, whose
+        string fields are interned. Since that instance is shared, callers
+        must not mutate its remainder list.
+        """
+        decoded = cls.decode_cache.get(topic)
+        if decoded is None:
+            decoded = cls.decode(topic)
+            decoded = DecodedMQTTTopic(
+                envelope_type=sys.intern(decoded.envelope_type),
+                src=sys.intern(decoded.src),
+                dst=sys.intern(decoded.dst),
+                message_type=sys.intern(decoded.message_type),
+                remainder=decoded.remainder,
+            )
+            cls.decode_cache.put(topic, decoded)
+        return decoded
+
+
+HandlerT = TypeVar("HandlerT")
+
+
+class _TopicTrieNode(Generic[HandlerT]):
+    __slots__ = ("children", "handlers", "multi_level_handlers")
+
+    children: dict[str, "_TopicTrieNode[HandlerT]"]
+    # Handlers for patterns ending at this node.
+    handlers: list[HandlerT]
+    # Handlers for patterns ending with '#' right below this node.
+    multi_level_handlers: list[HandlerT]
+
+    def __init__(self) -> None:
+        self.children = {}
+        self.handlers = []
+        self.multi_level_handlers = []
+
+    def is_empty(self) -> bool:
+        return not (self.children or self.handlers or self.multi_level_handlers)
+
+
+class TopicRouter(Generic[HandlerT]):
+    """Routes concrete MQTT topics to handlers registered for subscription
+    patterns, such as those produced by MQTTTopic.encode_subscription().
+
+    Patterns follow MQTT wildcard rules: '+' matches exactly one level, '#'
+    matches any number of levels (including none) and must be the last
+    level. As in MQTT, wildcards in the first level do not match topics
+    starting with '$'. Patterns are compiled into a trie, so the cost of
+    match() grows with topic depth rather than the number of subscriptions.
+    """
+
+    SEPARATOR = "/"
+    SINGLE_LEVEL_WILDCARD = "+"
+    MULTI_LEVEL_WILDCARD = "#"
+
+    _root: _TopicTrieNode[HandlerT]
+    _num_subscriptions: int
+
+    def __init__(self) -> None:
+        self._root = _TopicTrieNode()
+        self._num_subscriptions = 0
+
+    def __len__(self) -> int:
+        return self._num_subscriptions
+
+    @classmethod
+    def split_pattern(cls, pattern: str) -> list[str]:
+        if not pattern:
+            raise ValueError(
+                "ERROR. Subscription pattern must have at least one character"
+            )
+        levels = pattern.split(cls.SEPARATOR)
+        for i, level in enumerate(levels):
+            if cls.MULTI_LEVEL_WILDCARD in level and (
+                level != cls.MULTI_LEVEL_WILDCARD or i != len(levels) - 1
+            ):
+                raise ValueError(
+                    f"ERROR. In <{pattern}> '{cls.MULTI_LEVEL_WILDCARD}' must "
+                    "occupy an entire level and be the last level"
+                )
+            if (
+                cls.SINGLE_LEVEL_WILDCARD in level
+                and level != cls.SINGLE_LEVEL_WILDCARD
+            ):
+                raise ValueError(
+                    f"ERROR. In <{pattern}> '{cls.SINGLE_LEVEL_WILDCARD}' must "
+                    "occupy an entire level"
+                )
+        return levels
+
+    def add(self, pattern: str, handler: HandlerT) -> None:
+        levels = self.split_pattern(pattern)
+        node = self._root
+        multi_level = levels[-1] == self.MULTI_LEVEL_WILDCARD
+        if multi_level:
+            levels = levels[:-1]
+        for level in levels:
+            child = node.children.get(level)
+            if child is None:
+                child = node.children[level] = _TopicTrieNode()
+            node = child
+        if multi_level:
+            node.multi_level_handlers.append(handler)
+        else:
+            node.handlers.append(handler)
+        self._num_subscriptions += 1
+
+    def remove(self, pattern: str, handler: HandlerT) -> bool:
+        """Remove one registration of handler for pattern. Returns False if
+        there was no such registration."""
+        levels = self.split_pattern(pattern)
+        multi_level = levels[-1] == self.MULTI_LEVEL_WILDCARD
+        if multi_level:
+            levels = levels[:-1]
+        path = [self._root]
+        for level in levels:
+            child = path[-1].children.get(level)
+            if child is None:
+                return False
+            path.append(child)
+        handlers = path[-1].multi_level_handlers if multi_level else path[-1].handlers
+        try:
+            handlers.remove(handler)
+        except ValueError:
+            return False
+        self._num_subscriptions -= 1
+        # Prune nodes left without subscriptions.
+        for level, parent, node in zip(
+            reversed(levels), reversed(path[:-1]), reversed(path[1:]), strict=True
+        ):
+            if not node.is_empty():
+                break
+            del parent.children[level]
+        return True
+
+    def match(self, topic: str) -> list[HandlerT]:
+        """Return handlers of all patterns matching topic, in the order
+        found, with each handler object appearing at most once."""
+        matched: list[HandlerT] = []
+        nodes = [self._root]
+        levels = topic.split(self.SEPARATOR)
+        for i, level in enumerate(levels):
+            wildcards_apply = i > 0 or not level.startswith("$")
+            next_nodes = []
+            for node in nodes:
+                if wildcards_apply:
+                    matched.extend(node.multi_level_handlers)
+                    plus_child = node.children.get(self.SINGLE_LEVEL_WILDCARD)
+                    if plus_child is not None:
+                        next_nodes.append(plus_child)
+                if level != self.SINGLE_LEVEL_WILDCARD:
+                    child = node.children.get(level)
+                    if child is not None:
+                        next_nodes.append(child)
+            nodes = next_nodes
+            if not nodes:
+                break
+        else:
+            for node in nodes:
+                matched.extend(node.handlers)
+                # 'a/#' also matches 'a'
+                matched.extend(node.multi_level_handlers)
+        return self._unique(matched)
+
+    @classmethod
+    def _unique(cls, handlers: list[HandlerT]) -> list[HandlerT]:
+        if len(handlers) < 2:
+            return handlers
+        seen: set[int] = set()
+        unique = []
+        for handler in handlers:
+            if id(handler) not in seen:
+                seen.add(id(handler))
+                unique.append(handler)
+        return unique
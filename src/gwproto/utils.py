@@ -1,4 +1,7 @@
+import contextlib
 import re
+from collections import OrderedDict
+from typing import Generic, Optional, TypeVar
 
 snake_add_underscore_to_camel_pattern = re.compile(r"(?<!^)(?=[A-Z])")
 
@@ -13,3 +16,62 @@ def snake_to_camel(word: str) -> str:
 
 def rld_alias(alias: str) -> str:
     return ".".join(reversed(alias.split(".")))
+
+
+KeyT = TypeVar("KeyT")
+ValueT = TypeVar("ValueT")
+
+
+class LRUCache(Generic[KeyT, ValueT]):
+    """A bounded, least-recently-used cache with hit/miss counters.
+
+    A maxsize of 0 disables storage; every get() is then a miss.
+    """
+
+    maxsize: int
+    hits: int
+    misses: int
+    _entries: OrderedDict[KeyT, ValueT]
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 0:
+            raise ValueError(f"ERROR. LRUCache maxsize must be >= 0. Got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: KeyT) -> bool:
+        return key in self._entries
+
+    def get(self, key: KeyT) -> Optional[ValueT]:
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # try/except is measurably cheaper than contextlib.suppress here.
+        try:  # noqa: SIM105
+            self._entries.move_to_end(key)
+        except KeyError:
+            # Another thread evicted key since the lookup above.
+            pass
+        return value
+
+    def put(self, key: KeyT, value: ValueT) -> None:
+        if self.maxsize == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            with contextlib.suppress(KeyError):
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,51 @@
+import json
+from array import array
+from pathlib import Path
+
+import pytest
+
+from gwproto import ChannelResolver, HardwareLayout
+from gwproto.enums import TelemetryName, Unit
+from gwproto.named_types import ChannelReadings, SingleReading
+
+
+def test_channel_resolver() -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    layout = HardwareLayout.load_dict(layout_dict)
+    resolver = ChannelResolver(layout)
+    assert len(resolver) == len(layout.data_channels)
+
+    oat = resolver["oat"]
+    channel = layout.data_channels["oat"]
+    assert oat.Id == channel.Id
+    assert oat.TelemetryName == TelemetryName.WaterTempCTimes1000
+    assert (oat.Exponent, oat.Unit) == (3, Unit.Celcius)
+    assert (oat.AboutNodeName, oat.CapturedByNodeName) == ("oat", "analog-temp")
+    assert resolver.get("no-such-channel") is None
+    assert "no-such-channel" not in resolver
+
+    read_time = 1_700_000_000_000
+    assert (
+        resolver.physical_value(
+            SingleReading(ChannelName="oat", Value=-4250, ScadaReadTimeUnixMs=read_time)
+        )
+        == -4.25
+    )
+    readings = ChannelReadings(
+        ChannelName="oat",
+        ValueList=[21500, 0, -1],
+        ScadaReadTimeUnixMsList=[read_time, read_time + 1, read_time + 2],
+    )
+    assert resolver.physical_values(readings) == array("d", [21.5, 0.0, -0.001])
+    power = resolver["elt1-pwr"]
+    assert power.Exponent == 0
+    assert power.physical_values([1500, 0]) == array("d", [1500.0, 0.0])
+    assert power._replace(Exponent=-2).physical_values([15]) == array("d", [1500.0])
+    assert power._replace(Exponent=-2).physical_value(15) == 1500.0
+    with pytest.raises(KeyError):
+        resolver.physical_values(readings.model_copy(update={"ChannelName": "x"}))
+
+    # A channel that no component configures is left out.
+    del layout.component_id_by_channel_name["oat"]
+    assert "oat" not in ChannelResolver(layout)
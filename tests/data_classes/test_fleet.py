@@ -0,0 +1,133 @@
+import json
+import pickle
+import threading
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from gwproto import CacPool, HardwareLayout, load_fleet
+from gwproto.decoders import CacDecoder
+
+
+def test_cac_pool() -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    pool = CacPool()
+    first = HardwareLayout.load_dict(layout_dict, cac_pool=pool)
+    second = HardwareLayout.load_dict(layout_dict, cac_pool=pool)
+    unpooled = HardwareLayout.load_dict(layout_dict)
+    assert len(pool) == len(first.cacs)
+    assert (pool.hits, pool.misses) == (len(first.cacs), len(first.cacs))
+    for cac_id, cac in first.cacs.items():
+        assert second.cacs[cac_id] is cac
+        assert unpooled.cacs[cac_id] == cac
+    for component_id, component in first.components.items():
+        assert second.components[component_id].cac is component.cac
+        assert component.cac is first.cacs[component.gt.ComponentAttributeClassId]
+
+    # Key order does not matter; content does.
+    cac_dict = layout_dict["OtherCacs"][0]
+    cac = pool.decode(dict(reversed(cac_dict.items())))
+    assert cac is first.cacs[cac_dict["ComponentAttributeClassId"]]
+    renamed = pool.decode({**cac_dict, "DisplayName": "Another Web Server CAC"})
+    assert renamed is not cac
+    assert pool.intern(cac.model_copy()) is cac
+
+    # Pooled cacs are frozen: one layout cannot change them for another.
+    cac_id = cac_dict["ComponentAttributeClassId"]
+    with pytest.raises(ValidationError, match="frozen"):
+        first.cacs[cac_id].DisplayName = "mutated"
+    assert second.cacs[cac_id].DisplayName == cac_dict["DisplayName"]
+    # Interning copies, so changing the interned cac does not change the pool.
+    unfrozen = unpooled.cacs[cac_id].model_copy(update={"DisplayName": "Interned"})
+    interned = pool.intern(unfrozen)
+    assert interned is not unfrozen
+    assert interned == unfrozen
+    unfrozen.DisplayName = "mutated"
+    assert interned.DisplayName == "Interned"
+    # Pooled cacs unpickle as unpooled ones.
+    unpickled = pickle.loads(pickle.dumps(cac))  # noqa: S301
+    assert type(unpickled) is type(unpooled.cacs[cac_id])
+    assert unpickled == cac
+    unpickled.DisplayName = "mutated"
+
+    # Counts are exact when the pool is shared by threads.
+    hits = pool.hits
+    threads = [
+        threading.Thread(target=lambda: [pool.decode(cac_dict) for _ in range(1000)])
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert pool.hits == hits + 4000
+
+    with pytest.raises(ValueError, match="both given"):
+        HardwareLayout.load_dict(
+            layout_dict,
+            cac_pool=CacPool(),
+            cac_decoder=CacDecoder("OtherCacs", module_names=["gwproto.named_types"]),
+        )
+
+
+@pytest.mark.parametrize("use_processes", [False, True])
+def test_load_fleet(tmp_path: Path, use_processes: bool) -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"site{i}.json"
+        path.write_text(json.dumps(layout_dict))
+        paths.append(path)
+    layout_dict["OtherCacs"][0]["DisplayName"] = 17
+    bad_cac_path = tmp_path / "bad-cac.json"
+    bad_cac_path.write_text(json.dumps(layout_dict))
+    missing_path = tmp_path / "missing.json"
+
+    pool = CacPool()
+    site_loads = load_fleet(
+        [*paths, bad_cac_path, missing_path],
+        max_workers=2,
+        use_processes=use_processes,
+        cac_pool=pool,
+    )
+    assert [site_load.layout_path for site_load in site_loads] == [
+        *paths,
+        bad_cac_path,
+        missing_path,
+    ]
+    good, bad_cac, missing = site_loads[:3], site_loads[3], site_loads[4]
+    assert all(site_load.ok for site_load in good)
+    first = good[0].layout
+    assert first is not None
+    assert first.build_layout() == HardwareLayout.load(paths[0]).build_layout()
+    for site_load in good[1:]:
+        assert site_load.layout is not None
+        for cac_id, cac in site_load.layout.cacs.items():
+            assert cac is first.cacs[cac_id]
+        for component_id, component in site_load.layout.components.items():
+            assert component.cac is first.components[component_id].cac
+
+    # A bad cac fails only what depends on it.
+    assert not bad_cac.ok
+    assert bad_cac.layout is not None
+    assert bad_cac.errors[0].type_name == "OtherCacs"
+    assert isinstance(bad_cac.errors[0].exception, ValidationError)
+    assert len(bad_cac.layout.cacs) == len(first.cacs) - 1
+
+    assert missing.layout is None
+    assert [error.type_name for error in missing.errors] == ["hardware.layout"]
+    assert isinstance(missing.errors[0].exception, FileNotFoundError)
+
+
+def test_load_fleet_process_decoders() -> None:
+    with pytest.raises(ValueError, match="default decoders"):
+        load_fleet(
+            [],
+            use_processes=True,
+            cac_pool=CacPool(
+                CacDecoder("OtherCacs", module_names=["gwproto.named_types"])
+            ),
+        )
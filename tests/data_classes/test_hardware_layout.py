@@ -1,10 +1,24 @@
+import copy
 import json
+import pickle
+import uuid
 from pathlib import Path
+from typing import Any, Optional
 
 import pytest
 from gw.errors import DcError
+from pydantic import ValidationError
 
-from gwproto import HardwareLayout
+from gwproto import CacDecoder, CacPool, HardwareLayout, ShNode
+from gwproto.data_classes import layout_snapshot
+from gwproto.data_classes.components import (
+    HubitatComponent,
+    HubitatPollerComponent,
+    HubitatTankComponent,
+)
+from gwproto.data_classes.fleet import load_site
+from gwproto.data_classes.hardware_layout import LayoutStorage
+from gwproto.enums import TelemetryName
 
 
 def test_hardware_layout() -> None:
@@ -21,3 +35,764 @@ def test_hardware_layout() -> None:
 
         with pytest.raises(DcError):
             HardwareLayout.load_dict(layout_dict)
+
+
+def test_hardware_layout_node_indexes() -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    nodes = {node["Name"]: node for node in layout_dict["ShNodes"]}
+    for name, handle in [
+        ("a", "a"),
+        ("h", "a.h"),
+        ("s", "a.s"),
+        ("elt1", "a.h.elt1"),
+        ("power-meter", "a.s.power-meter"),
+    ]:
+        nodes[name]["Handle"] = handle
+        nodes[name]["ActorHierarchyName"] = handle
+    layout = HardwareLayout.load_dict(layout_dict)
+    layout.add_node(
+        {
+            "ShNodeId": "5f5d8c4a-7e2f-4ab8-9c1d-3f6b2a9e8d71",
+            "Name": "relay1",
+            "Handle": "a.h.relay1",
+            "ActorHierarchyName": "a.h.relay1",
+            "ActorClass": "Relay",
+            "TypeName": "spaceheat.node.gt",
+        }
+    )
+
+    # The indexed lookups agree with scanning every node.
+    def scan_handle(handle: str) -> Optional[ShNode]:
+        return next((n for n in layout.nodes.values() if n.handle == handle), None)
+
+    def scan_boss(node: ShNode) -> Optional[ShNode]:
+        boss_handle = layout.boss_handle(node.handle)
+        return scan_handle(boss_handle) if boss_handle else node
+
+    for node in layout.nodes.values():
+        assert layout.node_from_handle(node.handle) is scan_handle(node.handle)
+        assert layout.boss_node(node) is scan_boss(node)
+        assert layout.direct_reports(node) == [
+            n for n in layout.nodes.values() if scan_boss(n) == node
+        ]
+    h = layout.nodes["h"]
+    assert [n.Name for n in layout.direct_reports(h)] == ["elt1", "relay1"]
+    assert [n.Name for n in layout.direct_reports(layout.nodes["a"])] == [
+        "a",
+        "h",
+        "s",
+    ]
+    assert layout.parent_node(layout.nodes["relay1"]) is h
+    assert layout.parent_node(layout.nodes["a"]) is None
+    assert layout.node_by_handle("a.h") is h
+    # node_by_handle only matches explicit Handles.
+    assert layout.node_by_handle("buffer-cold-pipe") is None
+    assert (
+        layout.node_from_handle("buffer-cold-pipe") is layout.nodes["buffer-cold-pipe"]
+    )
+
+    # node_by_handle() finds the node whose Handle matches even when an
+    # earlier node without a Handle has that Name, and of several nodes with
+    # the same Handle, the last.
+    with Path("tests/config/hardware-layout.json").open() as f:
+        collision_dict = json.loads(f.read())
+    collision_nodes = {node["Name"]: node for node in collision_dict["ShNodes"]}
+    collision_nodes["elt1"]["Handle"] = "h"
+    collision = HardwareLayout.load_dict(collision_dict)
+    assert collision.node_by_handle("h") is collision.nodes["elt1"]
+    assert collision.node_from_handle("h") is collision.nodes["h"]
+    collision_nodes["s"]["Handle"] = "h"
+    collision = HardwareLayout.load_dict(collision_dict)
+    assert collision.node_by_handle("h") is collision.nodes["elt1"]
+    relay = collision.add_node(
+        {
+            "ShNodeId": "0e3c7a4b-2d5f-4c8e-9a1b-6f7d8e9c0a12",
+            "Name": "relay2",
+            "Handle": "h",
+            "ActorClass": "Relay",
+            "TypeName": "spaceheat.node.gt",
+        }
+    )
+    assert collision.node_by_handle("h") is relay
+    collision.remove_node("relay2")
+    assert collision.node_by_handle("h") is collision.nodes["elt1"]
+
+    nodes["s"]["Handle"] = "missing.s"
+    with pytest.raises(DcError, match="missing boss missing"):
+        HardwareLayout.load_dict(layout_dict)
+    errors: list[Any] = []
+    HardwareLayout.load_dict(layout_dict, raise_errors=False, errors=errors)
+    assert errors
+
+
+def test_hardware_layout_channel_indexes() -> None:
+    layout = HardwareLayout.load("tests/config/hardware-layout.json")
+    channels = list(layout.data_channels.values())
+    for node_name in layout.nodes:
+        assert layout.channels_about(node_name) == [
+            dc for dc in channels if dc.AboutNodeName == node_name
+        ]
+        assert layout.channels_captured_by(node_name) == [
+            dc for dc in channels if dc.CapturedByNodeName == node_name
+        ]
+        assert layout.synth_channels_created_by(node_name) == [
+            sc
+            for sc in layout.synth_channels.values()
+            if sc.CreatedByNodeName == node_name
+        ]
+    for telemetry_name in TelemetryName:
+        assert layout.channels_with_telemetry_name(telemetry_name) == [
+            dc for dc in channels if dc.TelemetryName == telemetry_name
+        ]
+    for component_id, component in layout.components.items():
+        assert sorted(
+            dc.Name for dc in layout.channels_for_component(component_id)
+        ) == sorted(config.ChannelName for config in component.gt.ConfigList)
+    assert layout.channels_about("no-such-node") == []
+    assert layout.channels_with_telemetry_name(TelemetryName.WaterTempCTimes1000)
+
+
+def test_hardware_layout_storage() -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    copied = HardwareLayout.load_dict(layout_dict)
+    assert copied.layout == layout_dict
+    assert copied.layout is not layout_dict
+    referenced = HardwareLayout.load_dict(layout_dict, layout_storage="reference")
+    assert referenced.layout is layout_dict
+    dropped = HardwareLayout.load_dict(layout_dict, layout_storage="drop")
+    assert dropped.atn_g_node_alias == copied.atn_g_node_alias
+    assert dropped.scada_g_node_id == copied.scada_g_node_id
+
+    # A rebuilt layout loads to the same objects.
+    rebuilt = dropped.layout
+    assert set(rebuilt) == set(layout_dict)
+    for key in layout_dict:
+        assert len(rebuilt[key]) == len(layout_dict[key]), key
+    reloaded = HardwareLayout.load_dict(rebuilt)
+    assert reloaded.cacs == copied.cacs
+    assert {
+        component_id: component.gt
+        for component_id, component in reloaded.components.items()
+    } == {
+        component_id: component.gt
+        for component_id, component in copied.components.items()
+    }
+
+    # Compare without the links to components and nodes, which are only
+    # equal by identity.
+    def gts(loaded: HardwareLayout) -> list[dict[str, Any]]:
+        return [
+            {name: node.to_gt() for name, node in loaded.nodes.items()},
+            {name: dc.to_gt() for name, dc in loaded.data_channels.items()},
+            {name: sc.to_gt() for name, sc in loaded.synth_channels.items()},
+        ]
+
+    assert gts(reloaded) == gts(copied)
+
+    with pytest.raises(ValueError, match="layout_storage"):
+        HardwareLayout.load_dict(layout_dict, layout_storage="bad")  # type: ignore[arg-type]
+
+
+def test_make_node_and_channel_errors() -> None:
+    layout = HardwareLayout.load("tests/config/hardware-layout.json")
+    node_dict = layout.nodes["a"].to_gt().model_dump()
+    node_dict["ComponentId"] = "5f5d8c4a-7e2f-4ab8-9c1d-3f6b2a9e8d71"
+    with pytest.raises(ValueError, match="not loaded for node <a>"):
+        HardwareLayout.make_node(node_dict, layout.components)
+    # Invalid content is reported ahead of the missing component.
+    with pytest.raises(ValidationError):
+        HardwareLayout.make_node(dict(node_dict, Name="A"), layout.components)
+    dc_dict = next(iter(layout.data_channels.values())).to_gt().model_dump()
+    with pytest.raises(ValueError, match="related nodes must exist"):
+        HardwareLayout.make_channel(dict(dc_dict, AboutNodeName="nope"), layout.nodes)
+    with pytest.raises(ValidationError):
+        HardwareLayout.make_channel(
+            dict(dc_dict, AboutNodeName="nope", Id="1"), layout.nodes
+        )
+
+
+def test_hardware_layout_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(layout_snapshot, "GWPROTO_VERSION", "1.3.1")
+    layout_path = tmp_path / "hardware-layout.json"
+    layout_dict = json.loads(Path("tests/config/hardware-layout.json").read_text())
+    layout_path.write_text(json.dumps(layout_dict))
+    snapshot_dir = tmp_path / "snapshots"
+    loaded = HardwareLayout.load(layout_path, snapshot_dir=snapshot_dir)
+    assert len(list(snapshot_dir.iterdir())) == 1
+
+    # Later loads come from the snapshot, without loading the dict again.
+    with monkeypatch.context() as m:
+        m.setattr(HardwareLayout, "load_dict", None)
+        snapshotted = HardwareLayout.load(layout_path, snapshot_dir=snapshot_dir)
+        pool = CacPool()
+        pooled = HardwareLayout.load(
+            layout_path, snapshot_dir=snapshot_dir, cac_pool=pool
+        )
+    assert snapshotted is not loaded
+    assert snapshotted.build_layout() == loaded.build_layout()
+    assert snapshotted.layout == loaded.layout
+    for node in snapshotted.nodes.values():
+        if node.component_id is not None:
+            assert node.component is snapshotted.components[node.component_id]
+    assert len(pool) == len(pooled.cacs)
+    for component in pooled.components.values():
+        assert component.cac is pooled.cacs[component.gt.ComponentAttributeClassId]
+
+    # Other options, other contents and other versions get their own
+    # snapshots.
+    dropped = HardwareLayout.load(
+        layout_path, snapshot_dir=snapshot_dir, layout_storage="drop"
+    )
+    assert dropped.layout is not dropped.layout
+    assert len(list(snapshot_dir.iterdir())) == 2
+    layout_dict["MyScadaGNode"]["Alias"] = "d1.isone.ver.keene.other.scada"
+    layout_path.write_text(json.dumps(layout_dict))
+    changed = HardwareLayout.load(layout_path, snapshot_dir=snapshot_dir)
+    assert changed.scada_g_node_alias == "d1.isone.ver.keene.other.scada"
+    assert len(list(snapshot_dir.iterdir())) == 3
+    monkeypatch.setattr(layout_snapshot, "GWPROTO_VERSION", "1.3.2")
+    with monkeypatch.context() as m:
+        m.setattr(layout_snapshot.LayoutSnapshot, "save", None)
+        with pytest.raises(TypeError):
+            HardwareLayout.load(layout_path, snapshot_dir=snapshot_dir)
+
+    # Layouts with errors are not saved.
+    layout_dict["OtherCacs"][0]["DisplayName"] = 17
+    layout_path.write_text(json.dumps(layout_dict))
+    errors: list[Any] = []
+    HardwareLayout.load(
+        layout_path, snapshot_dir=snapshot_dir, raise_errors=False, errors=errors
+    )
+    assert errors
+    assert len(list(snapshot_dir.iterdir())) == 3
+
+    with pytest.raises(ValueError, match="default decoders"):
+        HardwareLayout.load(
+            layout_path,
+            snapshot_dir=snapshot_dir,
+            cac_decoder=CacDecoder("OtherCacs", module_names=["gwproto.named_types"]),
+        )
+
+
+def test_hardware_layout_snapshot_unwritable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(layout_snapshot, "GWPROTO_VERSION", "1.3.1")
+    layout_path = Path("tests/config/hardware-layout.json")
+    expected = HardwareLayout.load(layout_path).build_layout()
+
+    # A snapshot that cannot be written does not fail the load.
+    not_a_dir = tmp_path / "not-a-dir"
+    not_a_dir.write_text("")
+    for snapshot_dir in [not_a_dir, not_a_dir / "snapshots"]:
+        layout = HardwareLayout.load(layout_path, snapshot_dir=snapshot_dir)
+        assert layout.build_layout() == expected
+        site_load = load_site(layout_path, snapshot_dir=snapshot_dir)
+        assert site_load.ok
+
+    def fail_to_pickle(*_args: object, **_kwargs: object) -> None:
+        raise pickle.PicklingError("cannot pickle")
+
+    snapshot_dir = tmp_path / "snapshots"
+    with monkeypatch.context() as m:
+        m.setattr(pickle, "dump", fail_to_pickle)
+        layout = HardwareLayout.load(layout_path, snapshot_dir=snapshot_dir)
+    assert layout.build_layout() == expected
+    # Nothing, not even a partly written temporary file, is left behind.
+    assert list(snapshot_dir.iterdir()) == []
+
+
+@pytest.mark.parametrize("layout_storage", ["copy", "reference", "drop"])
+def test_hardware_layout_mutation_layout_storage(layout_storage: LayoutStorage) -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    original = copy.deepcopy(layout_dict)
+    layout = HardwareLayout.load_dict(layout_dict, layout_storage=layout_storage)
+    channel = layout.remove_data_channel("oat").to_gt()
+    # Whatever the storage, layout describes the layout as changed.
+    assert "oat" not in [c["Name"] for c in layout.layout["DataChannels"]]
+    assert layout.layout["MyScadaGNode"] == original["MyScadaGNode"]
+    layout.add_data_channel(channel)
+    assert "oat" in [c["Name"] for c in layout.layout["DataChannels"]]
+    assert layout.layout == layout.build_layout()
+    # The caller's dict is never changed.
+    assert layout_dict == original
+
+
+def test_hardware_layout_mutation() -> None:  # noqa: PLR0915
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    layout = HardwareLayout.load_dict(layout_dict)
+
+    def index_names(layout: HardwareLayout) -> dict[str, Any]:
+        return {
+            "by_component": {
+                key: sorted(dc.Name for dc in dcs)
+                for key, dcs in layout.channels_by_component.items()
+                if dcs
+            },
+            "by_about": {
+                key: [dc.Name for dc in dcs]
+                for key, dcs in layout.channels_by_about_node.items()
+                if dcs
+            },
+            "by_handle": {key: n.Name for key, n in layout.nodes_by_handle.items()},
+            "reports": {
+                key: sorted(n.Name for n in nodes)
+                for key, nodes in layout.direct_reports_by_handle.items()
+                if nodes
+            },
+            "channel_components": layout.component_id_by_channel_name,
+            "by_type": {
+                key.__name__: sorted(c.gt.ComponentId for c in components)
+                for key, components in layout.components_by_type.items()
+                if components
+            },
+        }
+
+    # Add a tank sensor: its node, its channel and a new config on the
+    # analog temp component.
+    assert len(layout.my_telemetry_tuples) == 16
+    assert layout.scada_g_node_alias
+    layout.add_node(
+        {
+            "Name": "tank1-depth1",
+            "ActorClass": "NoActor",
+            "ShNodeId": "b3f5c1f6-8c8c-4a0f-9e59-4a1f3f6ef8a1",
+            "TypeName": "spaceheat.node.gt",
+        }
+    )
+    assert "my_telemetry_tuples" not in layout.__dict__
+    assert "scada_g_node_alias" in layout.__dict__
+    assert len(layout.my_telemetry_tuples) == 16
+    channel_dict = {
+        "Name": "tank1-depth1",
+        "DisplayName": "Tank 1 Depth 1",
+        "AboutNodeName": "tank1-depth1",
+        "CapturedByNodeName": "analog-temp",
+        "TelemetryName": "WaterTempCTimes1000",
+        "TerminalAssetAlias": "d1.isone.ct.newhaven.orange1.ta",
+        "Id": "0bb0f1c6-2fd0-4b44-b4b4-8a6ef8d5f2a2",
+        "TypeName": "data.channel.gt",
+    }
+    channel = layout.add_data_channel(channel_dict)
+    assert layout.channels_about("tank1-depth1") == [channel]
+    assert channel.about_node is layout.nodes["tank1-depth1"]
+    with pytest.raises(DcError, match="Channel inconsistency"):
+        layout.validate()
+    ads_dict = copy.deepcopy(layout_dict["Ads111xBasedComponents"][0])
+    ads_dict["ConfigList"].append(
+        {
+            **ads_dict["ConfigList"][-1],
+            "ChannelName": "tank1-depth1",
+            "TerminalBlockIdx": 10,
+        }
+    )
+    ads = layout.replace_component(ads_dict)
+    assert layout.nodes["analog-temp"].component is ads
+    assert layout.component_id_by_channel_name["tank1-depth1"] == ads.gt.ComponentId
+    assert len(layout.my_telemetry_tuples) == 17
+    layout.validate()
+    assert index_names(layout) == index_names(
+        HardwareLayout.load_dict(layout.build_layout())
+    )
+
+    # Swap the hubitat. The poller resolved against it is rebuilt.
+    poller_node = layout.nodes["zone1-down-stat"]
+    old_poller = poller_node.component
+    hubitat_dict = copy.deepcopy(layout_dict["OtherComponents"][0])
+    hubitat_dict["Hubitat"]["Host"] = "hubitat-orange2.local"
+    hubitat = layout.replace_component(hubitat_dict)
+    poller = poller_node.component
+    assert poller is not old_poller
+    assert isinstance(poller, HubitatPollerComponent)
+    assert layout.components[poller.gt.ComponentId] is poller_node.component
+    assert poller.hubitat_gt is hubitat.gt
+    assert poller.rest.url.host == "hubitat-orange2.local"
+    assert layout.nodes["hubitat"].component is hubitat
+    layout.validate()
+
+    # Failed changes leave the layout as it was.
+    before = index_names(layout)
+    with pytest.raises(DcError, match="Terminal Block indices"):
+        layout.replace_component(
+            {
+                **ads_dict,
+                "ConfigList": [{**ads_dict["ConfigList"][0], "TerminalBlockIdx": 13}],
+            }
+        )
+    with pytest.raises(DcError, match="Channel name overlap"):
+        layout.replace_component(
+            {
+                **ads_dict,
+                "ConfigList": [
+                    {**ads_dict["ConfigList"][0], "ChannelName": "hp-odu-pwr"}
+                ],
+            }
+        )
+    with pytest.raises(ValueError, match="does not exist"):
+        layout.replace_component({**ads_dict, "ComponentId": str(uuid.uuid4())})
+    with pytest.raises(ValueError, match="already exists"):
+        layout.add_data_channel(channel.to_gt())
+    with pytest.raises(DcError, match=r"Duplicate dc\.Id"):
+        layout.add_data_channel({**channel_dict, "Name": "tank1-depth2"})
+    with pytest.raises(DcError, match="does not have InPowerMetering"):
+        layout.add_data_channel(
+            {
+                **channel_dict,
+                "Name": "tank1-pwr",
+                "Id": str(uuid.uuid4()),
+                "CapturedByNodeName": "power-meter",
+                "TelemetryName": "PowerW",
+                "InPowerMetering": True,
+            }
+        )
+    assert layout.nodes["analog-temp"].component is ads
+    assert index_names(layout) == before
+
+    # Remove the tank sensor again.
+    with pytest.raises(ValueError, match="used by channels"):
+        layout.remove_node("tank1-depth1")
+    assert layout.remove_data_channel("tank1-depth1") is channel
+    with pytest.raises(DcError, match="should have CapturedByNodeName analog-temp"):
+        layout.add_data_channel({**channel_dict, "CapturedByNodeName": "power-meter"})
+    assert layout.channels_about("tank1-depth1") == []
+    removed = layout.remove_node("tank1-depth1")
+    assert removed.Name == "tank1-depth1"
+    assert layout.node_from_handle("tank1-depth1") is None
+    layout.replace_component(layout_dict["Ads111xBasedComponents"][0])
+    layout.validate()
+    assert index_names(layout) == index_names(HardwareLayout.load_dict(layout_dict))
+
+    synth_channel = layout.add_synth_channel(
+        {
+            **layout_dict["SynthChannels"][0],
+            "Id": "5a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d",
+            "Name": "required-rwt",
+        }
+    )
+    assert synth_channel in layout.synth_channels_created_by("h")
+    with pytest.raises(ValueError, match="already exists"):
+        layout.add_synth_channel(layout_dict["SynthChannels"][0])
+    with pytest.raises(ValueError, match="used by channels"):
+        layout.remove_node("h")
+
+
+def tank_layout_dict() -> dict[str, Any]:
+    """The test layout plus a HubitatTankModule node "tank", with one
+    sensor node "tank-depth1", resolved against the test hubitat."""
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict: dict[str, Any] = json.loads(f.read())
+    hubitat_id = layout_dict["OtherComponents"][0]["ComponentId"]
+    tank_id = str(uuid.uuid4())
+    layout_dict["OtherComponents"].append(
+        {
+            "ComponentId": tank_id,
+            "ComponentAttributeClassId": "60ac199d-679a-49f7-9142-8ca3e6428a5f",
+            "DisplayName": "tank",
+            "ConfigList": [],
+            "Tank": {
+                "hubitat_component_id": hubitat_id,
+                "devices": [
+                    {
+                        "stack_depth": 1,
+                        "device_id": 1,
+                        "fibaro_component_id": "",
+                        "analog_input_id": 1,
+                    }
+                ],
+            },
+            "TypeName": "hubitat.tank.component.gt",
+        }
+    )
+    for node_name, actor_class, component_id in [
+        ("tank", "HubitatTankModule", tank_id),
+        ("tank-depth1", "NoActor", None),
+    ]:
+        layout_dict["ShNodes"].append(
+            {
+                "Name": node_name,
+                "ActorClass": actor_class,
+                "ComponentId": component_id,
+                "ShNodeId": str(uuid.uuid4()),
+                "TypeName": "spaceheat.node.gt",
+            }
+        )
+    return layout_dict
+
+
+def web_listener_nodes(layout: HardwareLayout) -> set[str]:
+    hubitat = layout.components[layout.nodes["hubitat"].ComponentId or ""]
+    assert isinstance(hubitat, HubitatComponent)
+    return hubitat.web_listener_nodes
+
+
+def test_hardware_layout_replace_web_listener() -> None:
+    layout_dict = tank_layout_dict()
+    hubitat_id = layout_dict["OtherComponents"][0]["ComponentId"]
+    tank_dict = layout_dict["OtherComponents"][-1]
+    tank_id = tank_dict["ComponentId"]
+    layout = HardwareLayout.load_dict(layout_dict)
+    assert web_listener_nodes(layout) == {"zone1-down-stat", "tank"}
+
+    # Turning web listening off for a poller or a tank removes it from the
+    # hubitat, as loading the changed layout would.
+    poller_dict = copy.deepcopy(layout_dict["OtherComponents"][1])
+    poller_dict["Poller"]["WebListenEnabled"] = False
+    layout.replace_component(poller_dict)
+    assert web_listener_nodes(layout) == {"tank"}
+    tank_dict = copy.deepcopy(tank_dict)
+    tank_dict["Tank"]["web_listen_enabled"] = False
+    layout.replace_component(tank_dict)
+    assert web_listener_nodes(layout) == set()
+    reloaded = HardwareLayout.load_dict(layout.build_layout())
+    assert web_listener_nodes(reloaded) == set()
+    # Everything resolved against the hubitat was resolved against the new
+    # one.
+    hubitat = layout.components[hubitat_id]
+    assert layout.nodes["hubitat"].component is hubitat
+    poller = layout.components[poller_dict["ComponentId"]]
+    assert isinstance(poller, HubitatPollerComponent)
+    assert poller.hubitat_gt is hubitat.gt
+    tank = layout.components[tank_id]
+    assert isinstance(tank, HubitatTankComponent)
+    assert tank.hubitat is hubitat.gt
+
+    # A failed replacement leaves the hubitat as it was.
+    poller_dict["Poller"]["WebListenEnabled"] = True
+    poller_dict["Poller"]["DeviceId"] = "not a device id"
+    with pytest.raises(ValidationError):
+        layout.replace_component(poller_dict)
+    poller_dict["Poller"]["DeviceId"] = 164
+    poller_dict["Poller"]["HubitatComponentId"] = str(uuid.uuid4())
+    with pytest.raises(DcError, match="not loaded"):
+        layout.replace_component(poller_dict)
+    assert layout.components[hubitat_id] is hubitat
+    assert web_listener_nodes(layout) == set()
+
+
+def test_hardware_layout_remove_resolver_node() -> None:
+    layout = HardwareLayout.load_dict(tank_layout_dict())
+    tank_id = layout.nodes["tank"].ComponentId or ""
+    assert web_listener_nodes(layout) == {"zone1-down-stat", "tank"}
+    with pytest.raises(ValueError, match="used by components"):
+        layout.remove_node("tank-depth1")
+
+    # Without its node the tank is not resolved, so it neither listens on
+    # the hubitat nor needs its sensor nodes.
+    tank_node = layout.remove_node("tank")
+    assert web_listener_nodes(layout) == {"zone1-down-stat"}
+    tank = layout.components[tank_id]
+    assert isinstance(tank, HubitatTankComponent)
+    assert tank.resolved_node_names() == set()
+    reloaded = HardwareLayout.load_dict(layout.build_layout())
+    assert web_listener_nodes(reloaded) == web_listener_nodes(layout)
+    depth1 = layout.remove_node("tank-depth1")
+    layout.validate()
+
+    # The tank node cannot be added back without its sensor nodes, and the
+    # failed add leaves the layout as it was.
+    hubitat = layout.components[layout.nodes["hubitat"].ComponentId or ""]
+
+    def node_state(layout: HardwareLayout) -> list[Any]:
+        return [
+            list(layout.nodes),
+            dict(layout.nodes_by_component),
+            {key: n.Name for key, n in layout.nodes_by_handle.items()},
+            {key: n.Name for key, n in layout.nodes_by_hierarchy_name.items()},
+            {key: n.Name for key, n in layout.nodes_by_explicit_handle.items()},
+            {
+                key: [n.Name for n in nodes]
+                for key, nodes in layout.direct_reports_by_handle.items()
+                if nodes
+            },
+        ]
+
+    before = node_state(layout)
+    with pytest.raises(ValueError, match="Node not found"):
+        layout.add_node(tank_node)
+    assert node_state(layout) == before
+    assert tank.resolved_node_names() == set()
+    assert layout.components[tank_id] is tank
+    assert layout.components[hubitat.gt.ComponentId] is hubitat
+    assert web_listener_nodes(layout) == {"zone1-down-stat"}
+
+    layout.add_node(depth1)
+    added = layout.add_node(tank_node)
+    assert web_listener_nodes(layout) == {"zone1-down-stat", "tank"}
+    assert added.component is layout.components[tank_id]
+    assert layout.components[tank_id] is not tank
+    layout.validate()
+    assert HardwareLayout.load_dict(layout.build_layout()).build_layout() == (
+        layout.build_layout()
+    )
+
+
+def test_resolution_order() -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    hubitat_id = layout_dict["OtherComponents"][0]["ComponentId"]
+    poller_id = layout_dict["OtherComponents"][1]["ComponentId"]
+
+    def add_tank(name: str, hubitat_component_id: str) -> None:
+        component_id = str(uuid.uuid4())
+        layout_dict["OtherComponents"].append(
+            {
+                "ComponentId": component_id,
+                "ComponentAttributeClassId": "60ac199d-679a-49f7-9142-8ca3e6428a5f",
+                "DisplayName": name,
+                "ConfigList": [],
+                "Tank": {
+                    "hubitat_component_id": hubitat_component_id,
+                    "devices": [
+                        {
+                            "stack_depth": 1,
+                            "device_id": 1,
+                            "fibaro_component_id": "",
+                            "analog_input_id": 1,
+                        }
+                    ],
+                },
+                "TypeName": "hubitat.tank.component.gt",
+            }
+        )
+        for node_name, actor_class, node_component_id in [
+            (name, "HubitatTankModule", component_id),
+            (f"{name}-depth1", "NoActor", None),
+        ]:
+            layout_dict["ShNodes"].append(
+                {
+                    "Name": node_name,
+                    "ActorClass": actor_class,
+                    "ComponentId": node_component_id,
+                    "ShNodeId": str(uuid.uuid4()),
+                    "TypeName": "spaceheat.node.gt",
+                }
+            )
+
+    add_tank("tank1", hubitat_id)
+    add_tank("tank2", hubitat_id)
+    layout = HardwareLayout.load_dict(layout_dict)
+    assert [
+        [node.Name for node in generation]
+        for generation in HardwareLayout.resolution_order(
+            layout.nodes, layout.components
+        )
+    ] == [["zone1-down-stat", "tank1", "tank2"]]
+    tank1 = layout.nodes["tank1"].component
+    assert isinstance(tank1, HubitatTankComponent)
+    assert tank1.resolved_node_names() == {"tank1-depth1"}
+    with pytest.raises(ValueError, match="used by components"):
+        layout.remove_node("tank1-depth1")
+
+    # Components resolved against other resolvers come later. Missing
+    # dependencies and cycles are all reported before resolving anything.
+    layout_dict["OtherComponents"] = layout_dict["OtherComponents"][:2]
+    layout_dict["ShNodes"] = layout_dict["ShNodes"][:-4]
+    add_tank("tank1", poller_id)
+    add_tank("tank2", str(uuid.uuid4()))
+    tank_ids = [str(uuid.uuid4()) for _ in range(2)]
+    add_tank("tank3", tank_ids[1])
+    add_tank("tank4", tank_ids[0])
+    for tank_dict, tank_id in zip(
+        layout_dict["OtherComponents"][-2:], tank_ids, strict=True
+    ):
+        tank_dict["ComponentId"] = tank_id
+        node = next(
+            n for n in layout_dict["ShNodes"] if n["Name"] == tank_dict["DisplayName"]
+        )
+        node["ComponentId"] = tank_id
+    cacs = HardwareLayout.load_cacs(layout_dict)
+    components = HardwareLayout.load_components(layout_dict, cacs)
+    nodes = HardwareLayout.load_nodes(layout_dict, components)
+    errors: list[Any] = []
+    generations = HardwareLayout.resolution_order(
+        nodes, components, raise_errors=False, errors=errors
+    )
+    assert [[node.Name for node in generation] for generation in generations] == [
+        ["zone1-down-stat"],
+        ["tank1"],
+    ]
+    assert [error.src_dict["node"]["name"] for error in errors] == [
+        "tank2",
+        "tank3",
+        "tank4",
+    ]
+    assert "not loaded" in str(errors[0].exception)
+    assert "in the cycle" in str(errors[1].exception)
+    with pytest.raises(DcError, match="ERROR in component resolution") as e:
+        HardwareLayout.resolve_links(nodes, components)
+    assert "tank2" in str(e.value)
+    assert "tank4" in str(e.value)
+    # Nothing was resolved.
+    poller = nodes["zone1-down-stat"].component
+    assert isinstance(poller, HubitatPollerComponent)
+    with pytest.raises(ValueError, match="resolve_rest"):
+        _ = poller.rest
+
+
+def test_hardware_layout_diff() -> None:
+    with Path("tests/config/hardware-layout.json").open() as f:
+        layout_dict = json.loads(f.read())
+    pool = CacPool()
+    old = HardwareLayout.load_dict(layout_dict, cac_pool=pool)
+    assert not old.diff(HardwareLayout.load_dict(layout_dict))
+    assert not old.diff(HardwareLayout.load_dict(layout_dict, cac_pool=pool))
+
+    new_dict = copy.deepcopy(layout_dict)
+    new_dict["MyScadaGNode"]["Alias"] += ".new"
+    cac_dict = new_dict["OtherCacs"][0]
+    cac_dict["DisplayName"] = "Renamed CAC"
+    component_dict = new_dict["OtherComponents"][0]
+    component_dict["DisplayName"] = "Renamed component"
+    nodes = {node["Name"]: node for node in new_dict["ShNodes"]}
+    nodes["oat"]["DisplayName"] = "Outside air"
+    new_node = {
+        "Name": "new-node",
+        "ActorClass": "NoActor",
+        "ShNodeId": str(uuid.uuid4()),
+        "TypeName": "spaceheat.node.gt",
+    }
+    new_dict["ShNodes"].append(new_node)
+    channels = {channel["Name"]: channel for channel in new_dict["DataChannels"]}
+    channels["oat"]["DisplayName"] = "Outside air"
+    removed_synth_channel = new_dict["SynthChannels"].pop(0)
+    new = HardwareLayout.load_dict(new_dict)
+
+    diff = old.diff(new)
+    assert diff
+    assert diff.metadata == {
+        "MyScadaGNode": (layout_dict["MyScadaGNode"], new_dict["MyScadaGNode"])
+    }
+    assert diff.cacs.changed == {
+        cac_dict["ComponentAttributeClassId"]: {
+            "DisplayName": (layout_dict["OtherCacs"][0]["DisplayName"], "Renamed CAC")
+        }
+    }
+    assert list(diff.components.changed) == [component_dict["ComponentId"]]
+    assert not diff.components.added
+    assert not diff.components.removed
+    assert diff.nodes.added == {new_node["ShNodeId"]: {**new_node, "Version": "200"}}
+    assert not diff.nodes.removed
+    assert list(diff.nodes.changed) == [nodes["oat"]["ShNodeId"]]
+    assert diff.data_channels.changed == {
+        channels["oat"]["Id"]: {
+            "DisplayName": (
+                layout_dict["DataChannels"][8]["DisplayName"],
+                "Outside air",
+            )
+        }
+    }
+    assert not diff.data_channels.added
+    assert not diff.data_channels.removed
+    assert list(diff.synth_channels.removed) == [removed_synth_channel["Id"]]
+    assert not diff.synth_channels.added
+    assert not diff.synth_channels.changed
+
+    reverse = new.diff(old)
+    assert reverse.nodes.removed == diff.nodes.added
+    assert reverse.synth_channels.added == diff.synth_channels.removed
@@ -1,14 +1,17 @@
+from typing import Any
+
 from gwproto import MQTTCodec, create_message_model
 from tests.dummy_decoders import CHILD, PARENT
 
 
 class ChildMQTTCodec(MQTTCodec):
-    def __init__(self) -> None:
+    def __init__(self, **kwargs: Any) -> None:  # noqa: ANN401
         super().__init__(
             create_message_model(
                 "ChildMessageDecoder",
                 ["gwproto.messages"],
-            )
+            ),
+            **kwargs,
         )
 
     def validate_source_and_destination(self, src: str, dst: str) -> None:
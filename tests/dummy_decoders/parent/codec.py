@@ -1,3 +1,5 @@
+from typing import Any
+
 from gwproto import (
     MQTTCodec,
     create_message_model,
@@ -6,12 +8,13 @@ from tests.dummy_decoders import CHILD, PARENT
 
 
 class ParentMQTTCodec(MQTTCodec):
-    def __init__(self) -> None:
+    def __init__(self, **kwargs: Any) -> None:  # noqa: ANN401
         super().__init__(
             create_message_model(
                 model_name="ParentMessageDecoder",
                 module_names=["gwproto.messages"],
-            )
+            ),
+            **kwargs,
         )
 
     def validate_source_and_destination(self, src: str, dst: str) -> None:
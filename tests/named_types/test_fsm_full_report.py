@@ -1,10 +1,17 @@
 """Tests fsm.full.report type, version 000"""
 
+import copy
+import uuid
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
 from gwproto.named_types import FsmFullReport
 
 
 def test_fsm_full_report_generated() -> None:
-    d = {
+    d: dict[str, Any] = {
         "FromName": "admin",
         "TriggerId": "12da4269-63c3-44f4-ab65-3ee5e29329fe",
         "AtomicList": [
@@ -66,3 +73,16 @@ def test_fsm_full_report_generated() -> None:
     d2 = FsmFullReport.model_validate(d).model_dump(exclude_none=True)
 
     assert d2 == d
+
+    # Every AtomicList TriggerId is checked; a bad one is reported by index.
+    bad = copy.deepcopy(d)
+    bad["AtomicList"][2]["TriggerId"] = str(uuid.uuid1())
+    with pytest.raises(ValidationError, match=r"AtomicList\[2\]\.TriggerId: .*not 4"):
+        FsmFullReport.model_validate(bad)
+    bad["AtomicList"][2]["TriggerId"] = "not-a-uuid"
+    with pytest.raises(ValidationError, match=r"AtomicList\[2\]\.TriggerId: Invalid"):
+        FsmFullReport.model_validate(bad)
+    # Non-canonical spellings are still accepted, and made canonical.
+    upper = copy.deepcopy(d)
+    upper["AtomicList"][1]["TriggerId"] = d["TriggerId"].upper()
+    assert FsmFullReport.model_validate(upper).model_dump(exclude_none=True) == d
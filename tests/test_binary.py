@@ -0,0 +1,127 @@
+from typing import Any
+
+import pytest
+
+from gwproto import Message, MQTTTopic
+from gwproto.binary import (
+    BINARY_ENVELOPE_TYPE,
+    BinaryDecodeError,
+    BinaryEncoding,
+    TagTable,
+)
+from gwproto.messages import ReportEvent
+from gwproto.named_types import PowerWatts
+from tests.dummy_decoders.child.codec import ChildMQTTCodec
+from tests.dummy_decoders.parent.codec import ParentMQTTCodec
+from tests.test_decoders import child_to_parent_messages, parent_to_child_messages
+
+
+def test_binary_encoding_round_trip() -> None:
+    encoding = BinaryEncoding(TagTable(["A", "B"], ["power.watts"]))
+    for obj in [
+        None,
+        True,
+        False,
+        0,
+        127,
+        128,
+        -1,
+        -(2**40),
+        2**70,
+        1.5,
+        "",
+        "é",
+        "power.watts",
+        [],
+        [1, 2**40, -3],
+        [2**70, 1],
+        [1, "a", None],
+        {"A": 1, "B": [True], "C": {"A": "power.watts"}},
+    ]:
+        assert encoding.loads(encoding.dumps(obj)) == obj
+    assert len(encoding.dumps({"A": "power.watts"})) < len(
+        encoding.dumps({"C": "other"})
+    )
+    with pytest.raises(TypeError):
+        encoding.dumps(object())
+    frame = encoding.dumps({"A": [1, 2, 3]})
+    with pytest.raises(BinaryDecodeError):
+        encoding.loads(frame[:-1])
+    with pytest.raises(BinaryDecodeError):
+        encoding.loads(frame + b"\x00")
+    with pytest.raises(BinaryDecodeError):
+        BinaryEncoding(TagTable(["A"], [])).loads(frame)
+
+
+def test_delta_encoding() -> None:
+    tags = TagTable(["A"], [])
+    encoding = BinaryEncoding(tags)
+    delta_encoding = BinaryEncoding(tags, delta_encode=True)
+    times = [1708518800235 + i * 1000 + i % 7 for i in range(100)]
+    for obj in [
+        times,
+        [38870, 38871, 38869, 38869, 38900],
+        [-(2**63), 2**63 - 1, -(2**63)],
+        [5, 1],
+        [1],
+        [1, "a"],
+        {"A": [2**70, 2**70 + 1]},
+    ]:
+        frame = delta_encoding.dumps(obj)
+        assert delta_encoding.loads(frame) == obj
+        # Plain encodings decode delta frames too.
+        assert encoding.loads(frame) == obj
+    assert len(delta_encoding.dumps(times)) < len(encoding.dumps(times)) / 3
+    # Delta encoding is only used when it is smaller.
+    noisy = [0, 127, 0, 127]
+    assert delta_encoding.dumps(noisy) == encoding.dumps(noisy)
+
+
+@pytest.mark.parametrize("delta_encode", [False, True])
+def test_codec_binary(delta_encode: bool) -> None:  # noqa: FBT001
+    child_codec = ChildMQTTCodec(binary=True, delta_encode=delta_encode)
+    parent_codec = ParentMQTTCodec(binary=True)
+    assert child_codec.binary_encoding is not None
+    assert parent_codec.binary_encoding is not None
+    assert (
+        child_codec.binary_encoding.tags.fingerprint
+        == parent_codec.binary_encoding.tags.fingerprint
+    )
+    for src_codec, dst_codec, cases in [
+        (child_codec, parent_codec, child_to_parent_messages()),
+        (parent_codec, child_codec, parent_to_child_messages()),
+    ]:
+        for case in cases:
+            if case.exp_exceptions:
+                continue
+            message = case.src_message
+            topic = message.mqtt_topic(envelope_type=BINARY_ENVELOPE_TYPE)
+            assert MQTTTopic.decode(topic).envelope_type == BINARY_ENVELOPE_TYPE
+            decoded = dst_codec.decode(topic, src_codec.encode_binary(message))
+            json_decoded = dst_codec.decode(
+                message.mqtt_topic(), src_codec.encode(message)
+            )
+            assert decoded == json_decoded, case.tag
+
+    report_message = next(
+        case.src_message
+        for case in child_to_parent_messages()
+        if case.src_message.message_type()
+        == ReportEvent.model_fields["TypeName"].default
+    )
+    assert len(child_codec.encode_binary(report_message)) < (
+        len(child_codec.encode(report_message)) / 2
+    )
+
+
+def test_codec_binary_disabled() -> None:
+    codec = ParentMQTTCodec()
+    message: Message[Any] = Message(
+        Src="child", Dst="parent", Payload=PowerWatts(Watts=1)
+    )
+    with pytest.raises(ValueError):
+        codec.encode_binary(message)
+    with pytest.raises(ValueError):
+        codec.decode(
+            message.mqtt_topic(envelope_type=BINARY_ENVELOPE_TYPE), b"\x01\x00"
+        )
@@ -0,0 +1,63 @@
+from array import array
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from gwproto.columnar import ColumnarChannelReadings, columnar_channel_readings
+from gwproto.named_types import ChannelReadings
+
+
+def test_channel_readings_axiom_1() -> None:
+    with pytest.raises(ValidationError, match="Axiom 1"):
+        ChannelReadings(
+            ChannelName="hp-odu-pwr",
+            ValueList=[1, 2],
+            ScadaReadTimeUnixMsList=[1656443705023],
+        )
+
+
+def test_columnar_channel_readings() -> None:
+    d: dict[str, Any] = {
+        "ChannelName": "hp-odu-pwr",
+        "ValueList": [4559, -3, 2**40],
+        "ScadaReadTimeUnixMsList": [1656443705023, 1656443706023, 1656443707023],
+        "TypeName": "channel.readings",
+        "Version": "002",
+    }
+    columnar = ColumnarChannelReadings.from_dict(d)
+    assert len(columnar) == 3
+    assert columnar.values == array("q", d["ValueList"])
+    assert columnar.to_dict() == d
+    readings = columnar.to_channel_readings()
+    assert readings == ChannelReadings.model_validate(d)
+    assert ColumnarChannelReadings.from_channel_readings(readings) == columnar
+    assert columnar_channel_readings({"ChannelReadingList": [d, d]}) == [
+        columnar,
+        columnar,
+    ]
+
+    times = array("q", d["ScadaReadTimeUnixMsList"])
+    assert ColumnarChannelReadings("a", [1, 2, 3], times).times is times
+    assert len(ColumnarChannelReadings("a", [], [])) == 0
+    # Unlike ChannelReadings, values must fit in 64 bits.
+    with pytest.raises(ValueError, match="64-bit"):
+        ColumnarChannelReadings("a", [2**64], [1656443705023])
+
+    invalid: list[dict[str, Any]] = [
+        {"ValueList": [1, 2]},
+        {"ValueList": [1, 2, True]},
+        {"ValueList": [1, 2, 3.0]},
+        {"ValueList": [1, 2, "3"]},
+        {"ScadaReadTimeUnixMsList": [1656443705023, 1656443706023, 1656443707]},
+        {"ScadaReadTimeUnixMsList": [1656443705023, 1656443706023, 2**50]},
+        {"ChannelName": "Not_A_Name"},
+        {"TypeName": "synced.readings"},
+    ]
+    for kwargs in invalid:
+        with pytest.raises(ValueError):
+            ColumnarChannelReadings.from_dict({**d, **kwargs})
+        # Columnar validation matches ChannelReadings.
+        if "TypeName" not in kwargs:
+            with pytest.raises(ValidationError):
+                ChannelReadings.model_validate({**d, **kwargs})
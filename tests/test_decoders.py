@@ -2,9 +2,17 @@ import json
 from pathlib import Path
 from typing import Any
 
+import pytest
 from pydantic import ValidationError
 
-from gwproto import Message
+from gwproto import (
+    CacDecoder,
+    ComponentDecoder,
+    Message,
+    MQTTTopic,
+    create_message_model,
+)
+from gwproto.decoders import MODEL_CACHE, ModelCache
 from gwproto.messages import (
     Ack,
     AnyEvent,
@@ -219,3 +227,142 @@ def test_decoder_simple() -> None:
     parent_codec = ParentMQTTCodec()
     assert_encode_decode(child_codec, parent_codec, child_to_parent_messages())
     assert_encode_decode(parent_codec, child_codec, parent_to_child_messages())
+
+
+def test_decoder_dispatch_by_type_name() -> None:
+    # Union decoding and TypeName dispatch must agree.
+    for dispatch_by_type_name in [True, False]:
+        child_codec = ChildMQTTCodec(dispatch_by_type_name=dispatch_by_type_name)
+        parent_codec = ParentMQTTCodec(dispatch_by_type_name=dispatch_by_type_name)
+        assert bool(parent_codec.payload_types) == dispatch_by_type_name
+        assert_encode_decode(child_codec, parent_codec, child_to_parent_messages())
+        assert_encode_decode(parent_codec, child_codec, parent_to_child_messages())
+
+    # Concrete models are built once per TypeName, but decoding still
+    # produces instances of the codec's message model itself.
+    child_codec = ChildMQTTCodec()
+    parent_codec = ParentMQTTCodec()
+    message: Message[Any] = Message(Src=CHILD, Dst=PARENT, Payload=PowerWatts(Watts=1))
+    decoded = parent_codec.decode(message.mqtt_topic(), child_codec.encode(message))
+    assert type(decoded) is parent_codec.message_model
+    assert decoded.Payload == message.Payload
+    assert decoded == parent_codec.decode_union(child_codec.encode(message))
+    assert PowerWatts.model_fields["TypeName"].default in parent_codec.payload_models
+
+    # Invalid payloads of a recognized TypeName fail with the union's errors.
+    bad_payload = child_codec.encode(message).replace(b'"Watts":1', b'"Watts":"x"')
+    assert bad_payload != child_codec.encode(message)
+    for dispatch_by_type_name in [True, False]:
+        codec = ParentMQTTCodec(dispatch_by_type_name=dispatch_by_type_name)
+        with pytest.raises(ValidationError) as exc_info:
+            codec.decode(message.mqtt_topic(), bad_payload)
+        assert [error["loc"] for error in exc_info.value.errors()] == [
+            ("Payload", "power.watts", "Watts")
+        ]
+
+    # Unrecognized events bypass the union entirely.
+    event = AnyEvent(TypeName="gridworks.event.bar", MessageId="1", Src=CHILD)
+    message = Message(Src=CHILD, Dst=PARENT, Payload=event)
+    decoded = parent_codec.decode(message.mqtt_topic(), child_codec.encode(message))
+    assert isinstance(decoded.Payload, AnyEvent)
+    assert decoded.Payload == event
+
+
+def test_decode_many() -> None:
+    child_codec = ChildMQTTCodec()
+    parent_codec = ParentMQTTCodec()
+    cases = child_to_parent_messages()
+    items = [
+        (case.src_message.mqtt_topic(), child_codec.encode(case.src_message))
+        for case in cases
+    ]
+    bad_topic = MQTTTopic.encode("gw", PARENT, CHILD, "power.watts")
+    items.insert(1, (bad_topic, items[0][1]))
+    items.append((bad_topic, items[0][1]))
+    batch = parent_codec.decode_many(items)
+    assert len(batch.messages) == len(items)
+    exp_error_indices = [1, len(items) - 1] + [
+        idx + 1 if idx > 0 else idx
+        for idx, case in enumerate(cases)
+        if case.exp_exceptions
+    ]
+    assert sorted(exp_error_indices) == [error.index for error in batch.errors]
+    for error in batch.errors:
+        assert batch.messages[error.index] is None
+        assert error.topic == items[error.index][0]
+        if error.topic == bad_topic:
+            assert isinstance(error.exception, ValueError)
+        else:
+            assert isinstance(error.exception, ValidationError)
+    for idx, (topic, payload) in enumerate(items):
+        if idx not in exp_error_indices:
+            assert batch.messages[idx] == parent_codec.decode(topic, payload)
+
+
+def test_validate_topic_cache() -> None:
+    topic = MQTTTopic.encode("gw", CHILD, PARENT, "power.watts")
+    # The cache is off by default.
+    parent_codec = ParentMQTTCodec()
+    parent_codec.validate_topic(topic)
+    assert topic not in parent_codec.validated_topics
+
+    parent_codec = ParentMQTTCodec(topic_cache_size=ParentMQTTCodec.TOPIC_CACHE_SIZE)
+    decoded_topic = parent_codec.validate_topic(topic)
+    assert parent_codec.validate_topic(topic) is decoded_topic
+    assert parent_codec.validated_topics.hits == 1
+    bad_topic = MQTTTopic.encode("gw", PARENT, CHILD, "power.watts")
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            parent_codec.validate_topic(bad_topic)
+    assert bad_topic not in parent_codec.validated_topics
+
+    # A codec whose checks depend on state clears the cache when it changes.
+    class PeerCodec(ParentMQTTCodec):
+        peers: set[str]
+
+        def validate_source_and_destination(self, src: str, dst: str) -> None:
+            if src not in self.peers or dst != PARENT:
+                raise ValueError(f"ERROR. Unknown peer {src}")
+
+    peer_codec = PeerCodec(topic_cache_size=PeerCodec.TOPIC_CACHE_SIZE)
+    peer_codec.peers = {CHILD}
+    peer_codec.validate_topic(topic)
+    peer_codec.peers = set()
+    peer_codec.clear_topic_cache()
+    assert topic not in peer_codec.validated_topics
+    with pytest.raises(ValueError, match="Unknown peer"):
+        peer_codec.validate_topic(topic)
+
+
+def test_model_cache() -> None:
+    hits = MODEL_CACHE.stats.hits
+    model = create_message_model("CachedMessages", ["gwproto.messages"])
+    assert create_message_model("CachedMessages", ["gwproto.messages"]) is model
+    assert create_message_model("OtherName", ["gwproto.messages"]) is not model
+    assert (
+        CacDecoder("CachedCacs", module_names=["gwproto.named_types"]).loader
+        is CacDecoder("CachedCacs", module_names=["gwproto.named_types"]).loader
+    )
+    assert (
+        ComponentDecoder(
+            "CachedComponents", module_names=["gwproto.named_types"]
+        ).loader
+        is not CacDecoder(
+            "CachedComponents", module_names=["gwproto.named_types"]
+        ).loader
+    )
+    child_codec = ChildMQTTCodec()
+    assert child_codec.payload_model("gridworks.ping") is not None
+    assert child_codec.payload_model("gridworks.ping") is (
+        ChildMQTTCodec().payload_model("gridworks.ping")
+    )
+    assert MODEL_CACHE.stats.hits >= hits + 3
+    assert MODEL_CACHE.stats.build_seconds > 0
+    assert MODEL_CACHE.stats.scan_seconds > 0
+
+    cache = ModelCache(enabled=False)
+    assert cache.get("A", Message, "Payload", [int]) is not cache.get(
+        "A", Message, "Payload", [int]
+    )
+    assert cache.stats.misses == 2
+    assert not cache.models
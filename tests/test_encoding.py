@@ -0,0 +1,106 @@
+# ruff: noqa: ANN401
+
+import json
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field, field_serializer, model_serializer
+
+from gwproto import Message
+from gwproto.encoding import EnvelopeEncoder, PydanticCoreJSONBackend
+from gwproto.messages import PingMessage, StartupEvent
+from gwproto.named_types import PowerWatts
+from tests.dummy_decoders.child.codec import ChildMQTTCodec
+from tests.dummy_decoders.parent.codec import ParentMQTTCodec
+from tests.test_decoders import child_to_parent_messages, parent_to_child_messages
+
+
+class CountingJSONBackend(PydanticCoreJSONBackend):
+    dumps_calls: int = 0
+    loads_calls: int = 0
+
+    def dumps(self, obj: Any) -> bytes:
+        self.dumps_calls += 1
+        return super().dumps(obj)
+
+    def loads(self, data: bytes | str) -> Any:
+        self.loads_calls += 1
+        return super().loads(data)
+
+
+def test_envelope_encoder_matches_model_dump_json() -> None:
+    encoder = EnvelopeEncoder()
+    messages: list[Message[Any]] = [
+        case.src_message
+        for case in child_to_parent_messages() + parent_to_child_messages()
+    ]
+    messages.extend(
+        [
+            Message(Src="a.b", Dst="c", MessageType="x", Payload={"y": [1, "é"]}),
+            Message(Src='a"MessageId":""', Payload=StartupEvent(), AckRequired=True),
+            Message[PowerWatts](Src="a", Payload=PowerWatts(Watts=1)),
+            PingMessage(Src="a", Dst="b"),
+        ]
+    )
+    for message in messages:
+        assert encoder.encode(message) == message.model_dump_json().encode()
+        assert encoder.encode(message) == message.model_dump_json().encode()
+
+
+class SerializedPayload(BaseModel):
+    Watts: int
+    TypeName: Literal["serialized.payload"] = "serialized.payload"
+
+    @model_serializer
+    def serialize(self) -> dict[str, Any]:
+        return {"W": self.Watts, "TypeName": self.TypeName}
+
+
+class AliasedPayload(BaseModel):
+    Watts: int = Field(serialization_alias="W")
+    TypeName: Literal["aliased.payload"] = "aliased.payload"
+
+
+class SerializedMessage(Message[PowerWatts]):
+    @field_serializer("Payload")
+    def serialize_payload(self, payload: PowerWatts) -> dict[str, Any]:  # noqa: PLR6301
+        return {"W": payload.Watts}
+
+
+def test_envelope_encoder_custom_serialization() -> None:
+    encoder = EnvelopeEncoder()
+    messages: list[Message[Any]] = [
+        SerializedMessage.build("a", "", PowerWatts(Watts=1)),
+        Message[SerializedPayload](Src="a", Payload=SerializedPayload(Watts=1)),
+        Message[AliasedPayload](Src="a", Payload=AliasedPayload(Watts=1)),
+    ]
+    for message in messages:
+        assert not encoder.spliceable(message)
+        assert encoder.encode(message) == message.model_dump_json().encode()
+    assert encoder.spliceable(Message[PowerWatts](Src="a", Payload=PowerWatts(Watts=1)))
+
+
+def test_envelope_encoder_header_cache() -> None:
+    encoder = EnvelopeEncoder()
+    for watts in range(3):
+        encoder.encode(Message.build("a", "b", PowerWatts(Watts=watts)))
+    for _ in range(2):
+        encoder.encode(Message.build("a", "b", StartupEvent()))
+    assert len(encoder.header_parts) == 2
+    assert encoder.header_parts.hits == 3
+    assert encoder.header_parts.misses == 2
+
+
+def test_codec_json_backend() -> None:
+    backend = CountingJSONBackend()
+    child_codec = ChildMQTTCodec()
+    parent_codec = ParentMQTTCodec(json_backend=backend)
+    message: Message[Any] = Message(
+        Src="child", Dst="parent", MessageType="foo", Payload={"x": 1}
+    )
+    encoded = parent_codec.encode(message)
+    assert json.loads(encoded) == message.model_dump()
+    assert backend.dumps_calls == 1
+    message = Message.build("child", "parent", PowerWatts(Watts=1))
+    decoded = parent_codec.decode(message.mqtt_topic(), child_codec.encode(message))
+    assert decoded.Payload == message.Payload
+    assert backend.loads_calls == 1
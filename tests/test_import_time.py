@@ -0,0 +1,104 @@
+"""Import-time regression checks.
+
+These use importtime-output-wrapper to run 'python -X importtime' in a fresh
+interpreter, so they measure a cold import regardless of what the test
+session has already imported.
+"""
+
+from typing import Any
+
+import pytest
+
+importtime_output_wrapper = pytest.importorskip("importtime_output_wrapper")
+
+# Modules which must only be imported when something from them is used.
+LAZY_MODULE_PREFIXES = (
+    "gwproto.data_classes",
+    "gwproto.decoders",
+    "gwproto.default_decoders",
+    "gwproto.messages",
+    "gwproto.named_types.",
+)
+
+
+def cold_import(command: str) -> tuple[set[str], dict[str, int]]:
+    """Run command in a fresh interpreter. Return the names in sys.modules
+    afterwards, and {module name: cumulative import time in microseconds} as
+    reported by -X importtime.
+
+    Modules loaded through importlib (as the lazy __getattr__ hooks do) appear
+    in the first but not the second."""
+    stdout, raw_output = importtime_output_wrapper.get_import_time(
+        f"{command}; import sys; print(*sys.modules)", module_only=False
+    )
+    import_times: dict[str, int] = {}
+    pending: list[Any] = importtime_output_wrapper.parse_import_time(raw_output)
+    while pending:
+        imported = pending.pop()
+        import_times[imported.name] = imported.t_cumulative_us
+        pending.extend(imported.nested_imports)
+    return set(stdout.split()), import_times
+
+
+def test_import_gwproto_is_lazy() -> None:
+    modules, import_times = cold_import(
+        "import gwproto; gwproto.Message; gwproto.MQTTTopic"
+    )
+    assert "gwproto" in import_times
+    assert not [
+        module_name
+        for module_name in modules
+        if module_name.startswith(LAZY_MODULE_PREFIXES)
+    ]
+
+
+def test_import_named_type_is_lazy() -> None:
+    modules, _ = cold_import("from gwproto.named_types import PowerWatts")
+    assert "gwproto.named_types.power_watts" in modules
+    assert "gwproto.named_types.report" not in modules
+    assert "gwproto.default_decoders" not in modules
+
+
+def test_lazy_attributes() -> None:
+    import gwproto  # noqa: PLC0415
+    import gwproto.named_types  # noqa: PLC0415
+    from gwproto.data_classes.hardware_layout import (  # noqa: PLC0415
+        HardwareLayout,
+    )
+    from gwproto.default_decoders import get_default_cac_decoder  # noqa: PLC0415
+    from gwproto.named_types.report import Report  # noqa: PLC0415
+
+    assert gwproto.HardwareLayout is HardwareLayout
+    assert gwproto.default_cac_decoder is get_default_cac_decoder()
+    assert gwproto.named_types.Report is Report
+    assert "Report" in dir(gwproto.named_types)
+    assert set(gwproto.__all__) <= set(dir(gwproto))
+    with pytest.raises(AttributeError):
+        _ = gwproto.NotAType
+    with pytest.raises(AttributeError):
+        _ = gwproto.named_types.NotAType
+
+
+def test_lazy_submodules() -> None:
+    # Subpackages that a bare "import gwproto" used to import eagerly are
+    # still reachable as attributes.
+    submodules = [
+        "data_classes",
+        "decoders",
+        "default_decoders",
+        "enums",
+        "messages",
+        "named_types",
+        "property_format",
+        "type_helpers",
+    ]
+    modules, _ = cold_import(
+        "import gwproto; "
+        + "; ".join(
+            f"assert gwproto.{name}.__name__ == 'gwproto.{name}'" for name in submodules
+        )
+        + "; assert set(dir(gwproto)) >= set("
+        + repr(submodules)
+        + ")"
+    )
+    assert {f"gwproto.{name}" for name in submodules} <= modules
@@ -201,3 +201,56 @@ def test_errors() -> None:
     # Bad payload
     with pytest.raises(ValidationError):
         Message[list[int]](Src="foo", MessageType="bar", Payload=1)
+
+
+def test_build() -> None:
+    src = "foo"
+    dst = "bar"
+    p = PayloadProvidesMore(Src=src, MessageId="bla", x=1)
+
+    # Validated payload: same result as regular construction, payload not copied
+    m: Message[Any] = Message.build(src, dst, p)
+    m_validated: Message[Any] = Message(Src=src, Dst=dst, Payload=p)
+    assert m == m_validated
+    assert m.model_dump_json() == m_validated.model_dump_json()
+    assert m.Payload is p
+    assert m.Header.MessageType == p.TypeName
+    assert m.Header.MessageId == "bla"
+
+    # Explicit header values win over payload values
+    m = Message.build(
+        src, dst, p, message_type="other", message_id="x", ack_required=True
+    )
+    assert m.Header.MessageType == "other"
+    assert m.Header.MessageId == "x"
+    assert m.Header.AckRequired is True
+
+    # Payload of the wrong type for a parametrized Message is validated
+    m2 = Message[PayloadProvides].build(
+        src, dst, PayloadProvides(Src=src, x=1).model_dump()
+    )
+    assert type(m2.Payload) is PayloadProvides
+    with pytest.raises(ValidationError):
+        Message[PayloadProvides].build(src, dst, NaivePayload(x=1))  # type: ignore[arg-type]
+
+    # Non-model payloads are validated and header fields inferred as usual
+    m3: Message[Any] = Message.build(src, dst, p.model_dump())
+    assert m3.Header == Message(Src=src, Dst=dst, Payload=p).Header
+    with pytest.raises(ValidationError):
+        Message.build(src, dst, {"x": 1})
+
+    # The message type is inferred from the same payload fields as in
+    # regular construction. Without one, build() raises as Message() does.
+    class AliasedPayload(BaseModel):
+        type_alias: str = "my.p"
+        x: int
+
+    aliased = AliasedPayload(x=1)
+    m4: Message[Any] = Message.build(src, dst, aliased)
+    assert m4.Payload is aliased
+    assert m4.Header.MessageType == "my.p"
+    assert m4.Header == Message(Src=src, Dst=dst, Payload=aliased).Header
+    with pytest.raises(ValidationError):
+        Message.build(src, dst, NaivePayload(x=1))
+    with pytest.raises(ValidationError):
+        Message(Src=src, Dst=dst, Payload=NaivePayload(x=1))
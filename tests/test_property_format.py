@@ -0,0 +1,120 @@
+import uuid
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from gwproto.named_types import SyncedReadings
+from gwproto.property_format import (
+    VALIDATED_STRINGS,
+    is_handle_name,
+    is_left_right_dot,
+    is_market_name,
+    is_spaceheat_name,
+    is_spaceheat_name_list,
+    is_uuid4_str,
+    is_uuid4_str_list,
+)
+
+
+def test_name_validators() -> None:
+    assert is_spaceheat_name("hp-odu-pwr") == "hp-odu-pwr"
+    assert is_left_right_dot("d1.isone.ver.keene") == "d1.isone.ver.keene"
+    assert is_handle_name("h.pico-cycler.relay1") == "h.pico-cycler.relay1"
+    # Names the regex fast paths do not cover are still checked word by word.
+    assert is_spaceheat_name("café-1") == "café-1"
+    assert is_handle_name("a..b") == "a..b"
+    for validator, name, message in [
+        (is_spaceheat_name, "1hp", "Most significant word"),
+        (is_spaceheat_name, "hp--odu", "must be alphanumeric"),
+        (is_spaceheat_name, "hp-ODU", "must be lowercase"),
+        (is_left_right_dot, "d1.is-one", "must be alphanumeric. Got 'is-one'"),
+        (is_left_right_dot, "D1.isone", "alias must be lowercase"),
+        (is_handle_name, "h.pico_cycler", "must be alphanumeric or hyphen"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validator(name)
+
+
+def test_name_list_validators() -> None:
+    names = ["hp-ewt", "hp-lwt", "café-1"]
+    assert is_spaceheat_name_list(names) is names
+    assert is_spaceheat_name_list(()) == []
+    assert is_spaceheat_name_list(name for name in names) == names
+    for not_a_list in ["hp-ewt", {"hp": 1}, 3]:
+        assert is_spaceheat_name_list(not_a_list) is not_a_list
+    with pytest.raises(ValueError, match="<hp_lwt>: Fails SpaceheatName format"):
+        is_spaceheat_name_list(["hp-ewt", "hp_lwt"])
+    with pytest.raises(ValueError, match="Failed to seperate"):
+        is_spaceheat_name_list(["hp-ewt", 1])
+    # An item containing a newline is not taken for two names.
+    with pytest.raises(ValueError, match="must be alphanumeric"):
+        is_spaceheat_name_list(["hp-odu\nhp-idu"])
+
+    d: dict[str, Any] = {
+        "ScadaReadTimeUnixMs": 1656587343297,
+        "ChannelNameList": ["hp-ewt", "hp-lwt"],
+        "ValueList": [32755, 38870],
+    }
+    assert SyncedReadings.model_validate(d).ChannelNameList == ["hp-ewt", "hp-lwt"]
+    for channel_names in [
+        ["hp-ewt", "HP-LWT"],
+        ["hp-odu\nhp-idu", "hp-lwt"],
+        "hp-ewt",
+        [1],
+    ]:
+        with pytest.raises(ValidationError):
+            SyncedReadings.model_validate({**d, "ChannelNameList": channel_names})
+
+
+def test_validated_string_cache() -> None:
+    assert not VALIDATED_STRINGS.enabled
+    VALIDATED_STRINGS.enable(maxsize=2)
+    try:
+        strings = VALIDATED_STRINGS.strings
+        assert strings is not None
+        # Build equal but distinct string objects, as decoding would.
+        prefix = "hp-"
+        name = prefix + "odu"
+        assert is_spaceheat_name(name) is name
+        copy = prefix + "odu"
+        assert copy is not name
+        assert is_spaceheat_name(copy) is name
+        assert (strings.hits, strings.misses) == (1, 1)
+        # Entries are per validator.
+        assert is_left_right_dot("hp") == "hp"
+        assert is_market_name("e.rt60gate5.d1.isone") == "e.rt60gate5.d1.isone"
+        assert len(strings) == 2
+        assert ("is_spaceheat_name", name) not in strings
+        # Failures are not remembered.
+        for _ in range(2):
+            with pytest.raises(ValueError, match="must be lowercase"):
+                is_spaceheat_name("hp-ODU")
+        assert len(strings) == 2
+    finally:
+        VALIDATED_STRINGS.disable()
+    assert VALIDATED_STRINGS.strings is None
+
+
+def test_uuid4_str() -> None:
+    u = uuid.uuid4()
+    canonical = str(u)
+    assert is_uuid4_str(canonical) is canonical
+    # Non-canonical spellings are parsed and returned in canonical form.
+    for spelling in [u, canonical.upper(), u.hex, f"{{{canonical}}}", u.urn]:
+        assert is_uuid4_str(spelling) == canonical  # type: ignore[arg-type]
+    with pytest.raises(ValueError, match="not 4"):
+        is_uuid4_str(str(uuid.uuid1()))
+    with pytest.raises(ValueError, match="Invalid UUID4"):
+        is_uuid4_str(canonical[:-1])
+
+    ids = [str(uuid.uuid4()) for _ in range(3)]
+    assert is_uuid4_str_list(ids) is ids
+    assert is_uuid4_str_list([*ids, canonical.upper()]) == [*ids, canonical]
+    with pytest.raises(ValueError, match="not 4"):
+        is_uuid4_str_list([*ids, str(uuid.uuid1())])
+    # Two ids in one item are not taken for two items.
+    with pytest.raises(ValueError, match="Invalid UUID4"):
+        is_uuid4_str_list([f"{ids[0]}\n{ids[1]}"])
+    with pytest.raises(ValueError, match="Invalid UUID4"):
+        is_uuid4_str_list([ids[0], 17])
@@ -0,0 +1,167 @@
+from typing import Any
+
+import pytest
+
+from gwproto.named_types import FsmFullReport, Report, SingleReading, SyncedReadings
+from gwproto.report_builder import ReportBuilder
+
+SCADA_ALIAS = "dwtest.isone.ct.newhaven.orange1.ta.scada"
+INSTANCE_ID = "0384ef21-648b-4455-b917-58a1172d7fc1"
+TA_ALIAS = "dwtest.isone.ct.newhaven.orange1.ta"
+REPORT_ID = "4dab57dd-8b4e-4ea4-90a3-d63df9eeb061"
+FSM_REPORT = {
+    "FromName": "admin",
+    "TriggerId": "12da4269-63c3-44f4-ab65-3ee5e29329fe",
+    "AtomicList": [
+        {
+            "MachineHandle": "h.admin.store-charge-discharge.relay3",
+            "StateEnum": "relay.closed.or.open",
+            "ReportType": "Action",
+            "ActionType": "RelayPinSet",
+            "Action": 0,
+            "UnixTimeMs": 1710158001624,
+            "TriggerId": "12da4269-63c3-44f4-ab65-3ee5e29329fe",
+            "TypeName": "fsm.atomic.report",
+            "Version": "000",
+        },
+    ],
+    "TypeName": "fsm.full.report",
+    "Version": "000",
+}
+
+
+def test_report_builder() -> None:
+    builder = ReportBuilder(
+        SCADA_ALIAS,
+        INSTANCE_ID,
+        TA_ALIAS,
+        1656945300,
+        300,
+        channel_names=("dist-pump-pwr", "unused"),
+    )
+    builder.add_single_reading(
+        SingleReading(
+            ChannelName="hp-odu-pwr", Value=26, ScadaReadTimeUnixMs=1708518800235
+        )
+    )
+    builder.add_synced_readings(
+        SyncedReadings(
+            ChannelNameList=["hp-odu-pwr", "dist-pump-pwr"],
+            ValueList=[96, 14],
+            ScadaReadTimeUnixMs=1708518808236,
+        )
+    )
+    builder.add_reading("hp-odu-pwr", -196, 1708518809232)
+    builder.add_machine_state(
+        "relay3", "relay.closed.or.open", "RelayOpen", 1708518800100
+    )
+    builder.add_machine_state(
+        "relay3", "relay.closed.or.open", "RelayClosed", 1708518801100
+    )
+    builder.add_fsm_report(FsmFullReport.model_validate(FSM_REPORT))
+    assert len(builder) == 4
+
+    expected: dict[str, Any] = {
+        "FromGNodeAlias": SCADA_ALIAS,
+        "FromGNodeInstanceId": INSTANCE_ID,
+        "AboutGNodeAlias": TA_ALIAS,
+        "SlotStartUnixS": 1656945300,
+        "SlotDurationS": 300,
+        "ChannelReadingList": [
+            {
+                "ChannelName": "dist-pump-pwr",
+                "ValueList": [14],
+                "ScadaReadTimeUnixMsList": [1708518808236],
+                "TypeName": "channel.readings",
+                "Version": "002",
+            },
+            {
+                "ChannelName": "hp-odu-pwr",
+                "ValueList": [26, 96, -196],
+                "ScadaReadTimeUnixMsList": [
+                    1708518800235,
+                    1708518808236,
+                    1708518809232,
+                ],
+                "TypeName": "channel.readings",
+                "Version": "002",
+            },
+        ],
+        "StateList": [
+            {
+                "MachineHandle": "relay3",
+                "StateEnum": "relay.closed.or.open",
+                "StateList": ["RelayOpen", "RelayClosed"],
+                "UnixMsList": [1708518800100, 1708518801100],
+                "TypeName": "machine.states",
+                "Version": "000",
+            }
+        ],
+        "FsmReportList": [FSM_REPORT],
+        "MessageCreatedMs": 1656945600044,
+        "Id": REPORT_ID,
+        "TypeName": "report",
+        "Version": "002",
+    }
+    report = builder.build(message_created_ms=1656945600044, report_id=REPORT_ID)
+    assert report == Report.model_validate(expected)
+    assert report.model_dump(exclude_none=True) == expected
+
+    # A new slot keeps channel order but none of the previous data.
+    builder.start_slot(1656945600)
+    assert len(builder) == 0
+    builder.add_reading("hp-odu-pwr", 1, 1708518900000)
+    builder.add_reading("dist-pump-pwr", 2, 1708518900000)
+    report = builder.build()
+    assert report.SlotStartUnixS == 1656945600
+    assert [r.ChannelName for r in report.ChannelReadingList] == [
+        "dist-pump-pwr",
+        "hp-odu-pwr",
+    ]
+    assert report.StateList == []
+    assert report.FsmReportList == []
+    assert Report.model_validate(report.model_dump()) == report
+
+
+def test_report_builder_validation() -> None:
+    with pytest.raises(ValueError, match="SlotDurationS"):
+        ReportBuilder(SCADA_ALIAS, INSTANCE_ID, TA_ALIAS, 1656945300, 0)
+    with pytest.raises(ValueError, match="UTCSeconds"):
+        ReportBuilder(SCADA_ALIAS, INSTANCE_ID, TA_ALIAS, 1656945300000, 300)
+    builder = ReportBuilder(SCADA_ALIAS, INSTANCE_ID, TA_ALIAS, 1656945300, 300)
+    with pytest.raises(ValueError, match="Fails SpaceheatName format"):
+        builder.add_reading("hp_odu_pwr", 1, 1708518800235)
+    with pytest.raises(ValueError, match="must be an integer"):
+        builder.add_reading("hp-odu-pwr", True, 1708518800235)
+    with pytest.raises(ValueError, match="not UTCMilliseconds"):
+        builder.add_reading("hp-odu-pwr", 1, 1708518800)
+    with pytest.raises(ValueError, match="same length"):
+        builder.add_synced_readings(
+            SyncedReadings(
+                ChannelNameList=["hp-odu-pwr"],
+                ValueList=[1, 2],
+                ScadaReadTimeUnixMs=1708518800235,
+            )
+        )
+    with pytest.raises(ValueError, match="fit in 64 bits"):
+        builder.add_reading("too-big", 2**63, 1708518800235)
+    with pytest.raises(ValueError, match="fit in 64 bits"):
+        builder.add_single_reading(
+            SingleReading(
+                ChannelName="too-big", Value=2**70, ScadaReadTimeUnixMs=1708518800235
+            )
+        )
+    with pytest.raises(ValueError, match="fit in 64 bits"):
+        builder.add_synced_readings(
+            SyncedReadings(
+                ChannelNameList=["hp-odu-pwr", "too-small"],
+                ValueList=[1, -(2**63) - 1],
+                ScadaReadTimeUnixMs=1708518800235,
+            )
+        )
+    # Rejected readings leave no trace in the builder.
+    assert len(builder) == 0
+    assert builder.build().ChannelReadingList == []
+    builder.add_reading("hp-odu-pwr", 2**63 - 1, 1708518800235)
+    builder.add_reading("hp-odu-pwr", -(2**63), 1708518800235)
+    assert builder.build().ChannelReadingList[0].ValueList == [2**63 - 1, -(2**63)]
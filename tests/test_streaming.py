@@ -0,0 +1,85 @@
+import json
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from gwproto import Message
+from gwproto.binary import BINARY_ENVELOPE_TYPE
+from gwproto.named_types import ChannelReadings, PowerWatts, Report
+from gwproto.streaming import find_json_value, json_array_items
+from tests.dummy_decoders import CHILD, PARENT
+from tests.dummy_decoders.child.codec import ChildMQTTCodec
+from tests.dummy_decoders.parent.codec import ParentMQTTCodec
+from tests.test_decoders import child_to_parent_payload_dicts
+
+
+def test_find_json_value() -> None:
+    data = b' { "a" : [1, {"]": "}\\""}], "b\\u0022" :{"c":[ ]} , "d": -1.5e3 } '
+    for path, expected in [
+        ((), json.loads(data)),
+        (("a",), [1, {"]": '}"'}]),
+        (('b"', "c"), []),
+        (("d",), -1500.0),
+    ]:
+        span = find_json_value(data, path)
+        assert span is not None
+        assert json.loads(data[span[0] : span[1]]) == expected
+    for path in [("x",), ("a", "b"), ("d", "e")]:
+        assert find_json_value(data, path) is None
+    for malformed in [b"", b'{"a": [1, 2}', b'{"a" 1}', b'{"a": "1}']:
+        assert find_json_value(malformed, ("a",)) is None
+    span = find_json_value(data, ("a",))
+    assert span is not None
+    items, end = json_array_items(data, span[0])
+    assert end == span[1]
+    assert [data[start:end] for start, end in items] == [b"1", b'{"]": "}\\""}']
+    with pytest.raises(ValueError):
+        json_array_items(b"[1 2]", 0)
+
+
+def test_decode_streaming() -> None:
+    child_codec = ChildMQTTCodec()
+    parent_codec = ParentMQTTCodec(binary=True)
+    report_event_payload = child_to_parent_payload_dicts()["report"]["Payload"]
+    report = Report.model_validate(report_event_payload["Report"])
+    assert report.ChannelReadingList
+    for payload in [report_event_payload, report]:
+        message: Message[Any] = Message(Src=CHILD, Dst=PARENT, Payload=payload)
+        json_payload = child_codec.encode(message)
+        for topic, encoded in [
+            (message.mqtt_topic(), json_payload),
+            (
+                message.mqtt_topic(envelope_type=BINARY_ENVELOPE_TYPE),
+                ChildMQTTCodec(binary=True).encode_binary(message),
+            ),
+        ]:
+            expected = parent_codec.decode(message.mqtt_topic(), json_payload)
+            streamed = parent_codec.decode_streaming(topic, encoded)
+            streamed_report = getattr(
+                streamed.message.Payload, "Report", streamed.message.Payload
+            )
+            assert streamed_report.ChannelReadingList == []
+            streamed_report.ChannelReadingList = list(streamed.channel_readings)
+            assert streamed.message == expected
+
+    message = Message(Src=CHILD, Dst=PARENT, Payload=PowerWatts(Watts=1))
+    streamed = parent_codec.decode_streaming(
+        message.mqtt_topic(), child_codec.encode(message)
+    )
+    assert streamed.message.Payload == PowerWatts(Watts=1)
+    assert list(streamed.channel_readings) == []
+
+
+def test_decode_streaming_validates_each_channel() -> None:
+    report_event_payload = child_to_parent_payload_dicts()["report"]["Payload"]
+    channel_readings = report_event_payload["Report"]["ChannelReadingList"]
+    channel_readings[1]["ChannelName"] = "Not a SpaceheatName"
+    message: Message[Any] = Message(Src=CHILD, Dst=PARENT, Payload=report_event_payload)
+    streamed = ParentMQTTCodec().decode_streaming(
+        message.mqtt_topic(), ChildMQTTCodec().encode(message)
+    )
+    readings = streamed.channel_readings
+    assert next(readings) == ChannelReadings.model_validate(channel_readings[0])
+    with pytest.raises(ValidationError):
+        next(readings)
@@ -1,6 +1,9 @@
+import dataclasses
+
 import pytest
 
-from gwproto import DecodedMQTTTopic, MQTTTopic
+from gwproto import DecodedMQTTTopic, MQTTTopic, TopicRouter
+from gwproto.utils import LRUCache
 
 
 def test_mqtt_topic_encode() -> None:
@@ -131,3 +134,71 @@ def test_mqtt_topic_decode() -> None:
     assert decoded.dst == ""
     assert decoded.message_type == ""
     assert decoded.remainder == ["", ""]
+
+
+def test_mqtt_topic_decode_cached() -> None:
+    MQTTTopic.decode_cache.clear()
+    topic = "Envelope-1/Src-2/to/Dst-3/MsgType/Extra"
+    decoded = MQTTTopic.decode_cached(topic)
+    assert decoded == MQTTTopic.decode(topic)
+    assert MQTTTopic.decode_cache.misses == 1
+    assert MQTTTopic.decode_cached(topic) is decoded
+    assert MQTTTopic.decode_cache.hits == 1
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        decoded.src = "foo"  # type: ignore[misc]
+    with pytest.raises(ValueError):
+        MQTTTopic.decode_cached("")
+
+
+def test_lru_cache() -> None:
+    cache: LRUCache[str, int] = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+    disabled: LRUCache[str, int] = LRUCache(0)
+    disabled.put("a", 1)
+    assert disabled.get("a") is None
+    assert len(disabled) == 0
+    with pytest.raises(ValueError):
+        LRUCache(-1)
+
+
+def test_topic_router() -> None:
+    router: TopicRouter[str] = TopicRouter()
+    router.add(MQTTTopic.encode_subscription("gw", "a.b", "s"), "a.b")
+    router.add(MQTTTopic.encode_subscription("gw", "c.d", "s"), "c.d")
+    router.add("gw/+/to/s/power-watts", "power")
+    router.add("gw/+/to/s/power-watts", "power-2")
+    router.add("#", "all")
+    router.add("gw/a-b/to/s", "exact")
+    assert len(router) == 6
+
+    assert router.match("gw/a-b/to/s/power-watts") == ["all", "a.b", "power", "power-2"]
+    assert router.match("gw/c-d/to/s/report-event/x") == ["all", "c.d"]
+    # '#' matches the parent level too
+    assert router.match("gw/a-b/to/s") == ["all", "exact", "a.b"]
+    assert router.match("gw/a-b/to/t") == ["all"]
+    # wildcards in the first level do not match '$' topics
+    assert router.match("$SYS/x") == []
+
+    # handlers registered under several matching patterns are returned once
+    router.add("gw/a-b/#", "a.b")
+    assert router.match("gw/a-b/to/s/x") == ["all", "a.b"]
+
+    assert router.remove("gw/+/to/s/power-watts", "power")
+    assert not router.remove("gw/+/to/s/power-watts", "power")
+    assert not router.remove("gw/+/to/x", "power")
+    assert router.match("gw/a-b/to/s/power-watts") == ["all", "a.b", "power-2"]
+    assert router.remove("gw/+/to/s/power-watts", "power-2")
+    assert router.remove("#", "all")
+    assert router.match("gw/e-f/to/s/power-watts") == []
+    assert len(router) == 4
+
+    for bad_pattern in ["", "gw/#/x", "gw/a#", "gw/a+/b"]:
+        with pytest.raises(ValueError):
+            router.add(bad_pattern, "bad")